@@ -76,6 +76,8 @@ class ImportPage extends BaseController {
 			const resultContent = document.getElementById('ateso-import-result-content');
 
 			let jsonData = null;
+			let isDelta = false;
+			let part = null;
 			const CHUNK_SIZE = 100;
 
 			fileInput.addEventListener('change', function(e) {
@@ -93,7 +95,18 @@ class ImportPage extends BaseController {
 						}
 
 						const stats = jsonData.metadata?.stats || {};
+						isDelta = !!jsonData.metadata?.delta;
+						part = jsonData.metadata?.part || null;
 						let html = '<table class="widefat striped"><tbody>';
+						if (part) {
+							html += '<tr><th>Part</th><td>' + part.index + (part.index > 1 ? ' (added to the entries already imported from earlier parts)' : ' (existing data is cleared first)') + '</td></tr>';
+						}
+						if (isDelta) {
+							html += '<tr><th>Delta import</th><td>Only changed entries are replaced; existing data is kept.</td></tr>';
+							html += '<tr><th>Added</th><td>' + (jsonData.added || []).length + '</td></tr>';
+							html += '<tr><th>Changed</th><td>' + (jsonData.changed || []).length + '</td></tr>';
+							html += '<tr><th>Removed</th><td>' + (jsonData.removed || []).length + '</td></tr>';
+						}
 						html += '<tr><th>Total entries</th><td>' + jsonData.entries.length + '</td></tr>';
 						if (stats.total_definitions) html += '<tr><th>Total definitions</th><td>' + stats.total_definitions + '</td></tr>';
 						if (stats.total_examples) html += '<tr><th>Total examples</th><td>' + stats.total_examples + '</td></tr>';
@@ -125,6 +138,8 @@ class ImportPage extends BaseController {
 
 			cancelBtn.addEventListener('click', function() {
 				jsonData = null;
+				isDelta = false;
+				part = null;
 				fileInput.value = '';
 				previewSection.style.display = 'none';
 				uploadSection.style.display = '';
@@ -141,19 +156,40 @@ class ImportPage extends BaseController {
 				let imported = 0;
 				let errors = 0;
 
-				// First: truncate existing data.
-				statusText.textContent = 'Clearing existing data...';
-				try {
-					const truncRes = await doAjax('ateso_dict_import_chunk', {
-						action_type: 'truncate'
-					});
-					if (!truncRes.success) {
-						statusText.textContent = 'Error clearing data: ' + (truncRes.data?.message || 'Unknown');
+				if (isDelta) {
+					// First: delete removed entries. Changed ones are updated in place below, keeping their IDs.
+					const slugs = jsonData.removed || [];
+					for (let i = 0; i < slugs.length; i += CHUNK_SIZE) {
+						statusText.textContent = 'Removing outdated entries ' + (i + 1) + ' to ' + Math.min(i + CHUNK_SIZE, slugs.length) + ' of ' + slugs.length + '...';
+						try {
+							const delRes = await doAjax('ateso_dict_import_chunk', {
+								action_type: 'delete',
+								slugs: JSON.stringify(slugs.slice(i, i + CHUNK_SIZE))
+							});
+							if (!delRes.success) {
+								statusText.textContent = 'Error removing entries: ' + (delRes.data?.message || 'Unknown');
+								return;
+							}
+						} catch (err) {
+							statusText.textContent = 'Error removing entries: ' + err.message;
+							return;
+						}
+					}
+				} else if (!part || part.index === 1) {
+					// First: truncate existing data. Later parts of a split export add to the earlier parts.
+					statusText.textContent = 'Clearing existing data...';
+					try {
+						const truncRes = await doAjax('ateso_dict_import_chunk', {
+							action_type: 'truncate'
+						});
+						if (!truncRes.success) {
+							statusText.textContent = 'Error clearing data: ' + (truncRes.data?.message || 'Unknown');
+							return;
+						}
+					} catch (err) {
+						statusText.textContent = 'Error clearing data: ' + err.message;
 						return;
 					}
-				} catch (err) {
-					statusText.textContent = 'Error clearing data: ' + err.message;
-					return;
 				}
 
 				// Import chunks.
@@ -166,6 +202,7 @@ class ImportPage extends BaseController {
 					try {
 						const res = await doAjax('ateso_dict_import_chunk', {
 							action_type: 'import',
+							replace: isDelta ? 1 : 0,
 							entries: JSON.stringify(chunk)
 						});
 						if (res.success) {
@@ -239,6 +276,19 @@ class ImportPage extends BaseController {
 			wp_send_json_success( array( 'message' => 'Tables truncated' ) );
 		}
 
+		if ( 'delete' === $action_type ) {
+			$slugs = json_decode( stripslashes( $_POST['slugs'] ?? '[]' ), true );
+
+			if ( ! is_array( $slugs ) ) {
+				wp_send_json_error( array( 'message' => 'Invalid slugs data' ) );
+			}
+
+			$term_repo = new TermRepository();
+			$deleted   = $term_repo->delete_by_slugs( array_map( 'sanitize_title', $slugs ) );
+
+			wp_send_json_success( array( 'deleted' => $deleted ) );
+		}
+
 		if ( 'import' !== $action_type ) {
 			wp_send_json_error( array( 'message' => 'Invalid action type' ) );
 		}
@@ -254,13 +304,15 @@ class ImportPage extends BaseController {
 		$ex_repo   = new ExampleRepository();
 		$rel_repo  = new RelationRepository();
 
+		// Delta imports update terms that already exist in place, so relations pointing at them stay linked.
+		$replace = ! empty( $_POST['replace'] );
+
 		$imported = 0;
 		$errors   = 0;
 
 		foreach ( $raw_entries as $entry ) {
 			try {
-				// Insert the term.
-				$term_id = $term_repo->insert( array(
+				$term = array(
 					'word'           => sanitize_text_field( $entry['word'] ?? '' ),
 					'slug'           => sanitize_title( $entry['slug'] ?? $entry['word'] ?? '' ),
 					'homonym_number' => isset( $entry['homonym_number'] ) ? absint( $entry['homonym_number'] ) : null,
@@ -275,7 +327,22 @@ class ImportPage extends BaseController {
 						? sanitize_text_field( implode( ', ', $entry['usage_labels'] ) )
 						: null,
 					'sort_order'     => 0,
-				) );
+				);
+
+				$existing = $replace ? $term_repo->find_by_slug( $term['slug'] ) : null;
+
+				if ( $existing ) {
+					// Update the term and replace its definitions, examples and relations.
+					$term_id = $term_repo->update( $existing->id, $term ) ? (int) $existing->id : 0;
+					if ( $term_id ) {
+						$def_repo->delete_by_term_id( $term_id );
+						$ex_repo->delete_by_term_id( $term_id );
+						$rel_repo->delete_by_term_id( $term_id );
+					}
+				} else {
+					// Insert the term.
+					$term_id = $term_repo->insert( $term );
+				}
 
 				if ( ! $term_id ) {
 					++$errors;
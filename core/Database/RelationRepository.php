@@ -86,13 +86,21 @@ class RelationRepository {
 
 	/**
 	 * Resolve relations by matching related_word to existing terms.
-	 * Call this after a full import to populate related_term_id.
+	 * Call this after a full or delta import to populate related_term_id.
 	 */
 	public function resolve_relations() {
 		global $wpdb;
 		$rel_table  = Schema::relations_table();
 		$term_table = Schema::terms_table();
 
+		// Unlink relations whose target was deleted (e.g. replaced by a delta import).
+		$wpdb->query(
+			"UPDATE {$rel_table} r
+			LEFT JOIN {$term_table} t ON r.related_term_id = t.id
+			SET r.related_term_id = NULL
+			WHERE r.related_term_id IS NOT NULL AND t.id IS NULL"
+		);
+
 		// Match related_word to term word (take first match if multiple homonyms).
 		$sql = "UPDATE {$rel_table} r
 			INNER JOIN (
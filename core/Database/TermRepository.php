@@ -246,6 +246,36 @@ class TermRepository {
 		return false !== $result;
 	}
 
+	/**
+	 * Delete every term with one of the given slugs, with all related data.
+	 * Used by delta imports to drop removed entries.
+	 *
+	 * @param string[] $slugs Term slugs.
+	 * @return int Number of terms deleted.
+	 */
+	public function delete_by_slugs( $slugs ) {
+		global $wpdb;
+		$table = Schema::terms_table();
+
+		if ( empty( $slugs ) ) {
+			return 0;
+		}
+
+		$placeholders = implode( ', ', array_fill( 0, count( $slugs ), '%s' ) );
+
+		// phpcs:ignore WordPress.DB.PreparedSQL.NotPrepared
+		$ids = $wpdb->get_col( $wpdb->prepare( "SELECT id FROM {$table} WHERE slug IN ({$placeholders})", $slugs ) );
+
+		$deleted = 0;
+		foreach ( $ids as $id ) {
+			if ( $this->delete( $id ) ) {
+				++$deleted;
+			}
+		}
+
+		return $deleted;
+	}
+
 	/**
 	 * Get random terms for "related words" section.
 	 */
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Autocomplete Trie
+A packed prefix trie over headwords, homonym-numbered slugs (akai-2) and
+plural forms, where every node carries the top-k completions below it, so a
+keystroke is answered by walking the typed prefix instead of a
+LIKE 'q%' round trip. Small enough to ship to the browser or the app, and
+read on the server with AutocompleteTrie.
+
+Completions are ranked by a priority score: 1 per definition and example,
+plus 2 per cp. reference pointing at the entry, with headwords ahead of
+slugs ahead of plurals, then shorter and alphabetically first texts. Their
+rank is their position in the `targets` array, so a node's top-k is a
+short ascending list of integers, holding the best completion of each of
+the k best entries below it (akai, not also akai-1 and akais).
+
+Nodes are radix-compressed: runs of single-child nodes become one edge
+label. Merging identical subtrees as a DAWG does would gain nothing, since
+the top-k lists make every subtree distinct. A node is
+    [[target, ...], label, child, label, child, ...]
+with the root at `root`; a target is "slug" when the completion text is the
+slug itself, else ["text", "slug"].
+"""
+
+import re
+import json
+from datetime import datetime, timezone
+
+from cross_refs import CrossRefResolver
+
+
+AUTOCOMPLETE_VERSION = 1
+
+DEFAULT_TOP_K = 8
+
+# Order of key kinds among equally scored completions
+KEY_KINDS = ('headword', 'slug', 'plural')
+
+# One plural form as written: letters, apostrophes, hyphens, inner spaces
+PLURAL_FORM_RE = re.compile(r"[^\W\d_](?:[^\W\d_]|['\- ])*[^\W\d_]|[^\W\d_]")
+
+# First words of plural fields that are notes, not forms (noun F, of abala)
+PLURAL_NOTE_WORDS = frozenset(('noun', 'of', 'pl', 'plural', 'see'))
+
+
+def plural_forms(plural):
+    """The forms listed in a plural field, lowercased; notes and glosses are dropped."""
+    forms = []
+    for part in (plural or '').lower().split(','):
+        part = part.strip()
+        if PLURAL_FORM_RE.fullmatch(part) and part.split()[0] not in PLURAL_NOTE_WORDS:
+            forms.append(part)
+    return forms
+
+
+class AutocompleteBuilder:
+    """
+    Collects the keys of each output entry as it passes. Call add() in
+    output order, after slugs are final; as_dict() ranks and packs them.
+    """
+
+    def __init__(self, top_k=DEFAULT_TOP_K):
+        self.top_k = top_k
+        self.resolver = CrossRefResolver()
+        self.entries = []
+        self.refs = []
+
+    def add(self, entry):
+        """Register an Entry and its cp. references."""
+        self.resolver.add(entry.word, entry.slug, entry.homonym_number, entry.plural)
+        score = 1 + len(entry.definitions) + len(entry.examples)
+        self.entries.append((entry.word, entry.slug, entry.plural, score))
+        for d in entry.definitions:
+            self.refs.extend(d.cp_refs)
+
+    def targets(self):
+        """
+        (text, slug) completions in rank order, and {key: [rank, ...]} of
+        the typed keys that reach them.
+        """
+        cited = {}
+        for ref in self.refs:
+            target, _ = self.resolver.resolve(ref)
+            if target is not None:
+                cited[target] = cited.get(target, 0) + 1
+
+        ranking = {}
+        keys = {}
+        for word, slug, plural, score in self.entries:
+            score += 2 * cited.get(slug, 0)
+            candidates = [('headword', word.lower(), word)]
+            if slug != word.lower():
+                candidates.append(('slug', slug, slug))
+            candidates.extend(('plural', form, form) for form in plural_forms(plural))
+            for kind, key, text in candidates:
+                target = (text, slug)
+                order = (-score, KEY_KINDS.index(kind), len(text), text, slug)
+                if target not in ranking or order < ranking[target]:
+                    ranking[target] = order
+                keys.setdefault(key, set()).add(target)
+
+        ranked = sorted(ranking, key=ranking.get)
+        rank = {target: i for i, target in enumerate(ranked)}
+        return ranked, {key: sorted(rank[t] for t in targets) for key, targets in keys.items()}
+
+    def as_dict(self):
+        """The autocomplete document: ranked targets and packed nodes."""
+        ranked, keys = self.targets()
+
+        # Character trie: [children {char: node}, ranks ending here]
+        root = [{}, []]
+        for key, ranks in keys.items():
+            node = root
+            for char in key:
+                node = node[0].setdefault(char, [{}, []])
+            node[1].extend(ranks)
+
+        slugs = [slug for _, slug in ranked]
+        nodes = []
+        top_k = self.top_k
+
+        def pack(node):
+            """Index of a packed node and its top-k ranks, children first."""
+            edges = []
+            best = set(node[1])
+            for char in sorted(node[0]):
+                label = char
+                child = node[0][char]
+                while len(child[0]) == 1 and not child[1]:
+                    (char, child), = child[0].items()
+                    label += char
+                index, top = pack(child)
+                edges.append((label, index))
+                best.update(top)
+            top = []
+            seen = set()
+            for rank in sorted(best):
+                if slugs[rank] not in seen and len(top) < top_k:
+                    seen.add(slugs[rank])
+                    top.append(rank)
+            nodes.append([top] + [part for edge in edges for part in edge])
+            return len(nodes) - 1, top
+
+        root_index, _ = pack(root)
+        return {
+            'version': AUTOCOMPLETE_VERSION,
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'top_k': top_k,
+            'keys': len(keys),
+            'root': root_index,
+            'targets': [slug if text == slug else [text, slug] for text, slug in ranked],
+            'nodes': nodes,
+        }
+
+
+def write_autocomplete(builder, path):
+    """Write the autocomplete document compactly. Returns it."""
+    document = builder.as_dict()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(document, ensure_ascii=False, separators=(',', ':')))
+    return document
+
+
+class AutocompleteTrie:
+    """Prefix completion over an autocomplete document."""
+
+    def __init__(self, document):
+        self.top_k = document['top_k']
+        self.targets = [
+            {'text': t, 'slug': t} if isinstance(t, str) else {'text': t[0], 'slug': t[1]}
+            for t in document['targets']
+        ]
+        # Node -> (top ranks, {first char of edge label: (label, child)})
+        self.nodes = [
+            (node[0], {label[0]: (label, child) for label, child in zip(node[1::2], node[2::2])})
+            for node in document['nodes']
+        ]
+        self.root = document['root']
+
+    @classmethod
+    def load(cls, path):
+        """Read an .autocomplete.json file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def complete(self, prefix, limit=None):
+        """Up to `limit` (at most top_k) best completions of a prefix, as {text, slug} dicts."""
+        rest = prefix.lower()
+        top, edges = self.nodes[self.root]
+        while rest:
+            edge = edges.get(rest[0])
+            if edge is None:
+                return []
+            label, child = edge
+            if rest.startswith(label):
+                rest = rest[len(label):]
+            elif not label.startswith(rest):
+                return []
+            else:
+                rest = ''
+            top, edges = self.nodes[child]
+        return [self.targets[i] for i in top[:limit]]
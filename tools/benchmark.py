@@ -0,0 +1,1093 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Converter Benchmarks
+Standalone timing and memory runs for tools/convert_dictionary.py, the
+shared parser and its output backends on the real source file and on
+synthetic corpora built by scaling it up.
+"""
+
+import os
+import re
+import gc
+import sys
+import json
+import time
+import math
+import random
+import sqlite3
+import argparse
+import subprocess
+import platform
+import tempfile
+import tracemalloc
+import gzip
+import importlib
+import collections
+import contextlib
+from datetime import datetime, timezone
+
+import convert_dictionary as cd
+import dictionary_parser as dp
+import cross_refs
+from dictionary_index import DictionaryIndex
+from binary_dictionary import BinaryDictionary
+from sqlite_export import fts_query, TABLES as SQLITE_TABLES
+from wxr_export import WxrWriter
+from autocomplete import AutocompleteBuilder, AutocompleteTrie, DEFAULT_TOP_K
+
+
+# Default paths are resolved against this directory, not the working directory
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(TOOLS_DIR), 'ateso_dict.txt')
+
+# Headword at the start of an entry line, split so a tag can go before the homonym number
+SYNTHETIC_HEADWORD_RE = re.compile(r'^(-?[a-zA-Z][a-zA-Z\'-]*)(\d*\s)')
+
+
+def synthetic_tag(copy_index):
+    """Alphabetic tag that keeps headwords unique across synthetic copies."""
+    tag = ''
+    n = copy_index
+    while n:
+        n, rem = divmod(n - 1, 26)
+        tag = chr(ord('a') + rem) + tag
+    return 'q' + tag
+
+
+def make_synthetic_corpus(source, factor, dest):
+    """
+    Write `factor` copies of the source dictionary to `dest`.
+    Headwords in every copy after the first get a unique alphabetic tag, so the
+    corpus has the same shape as the original without mass slug collisions.
+    """
+    with open(source, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    with open(dest, 'w', encoding='utf-8') as out:
+        for copy_index in range(factor):
+            if copy_index == 0:
+                out.writelines(lines)
+                continue
+            tag = synthetic_tag(copy_index)
+            for line in lines:
+                stripped = line.lstrip()
+                if dp.SECTION_HEADER_RE.match(stripped.strip()):
+                    out.write(line)
+                    continue
+                if dp.ENTRY_START_RE.match(stripped):
+                    line = SYNTHETIC_HEADWORD_RE.sub(
+                        lambda m: m.group(1) + tag + m.group(2), stripped, count=1
+                    )
+                out.write(line)
+    return dest
+
+
+def time_parse(raw_entries, jobs):
+    """Parse every raw entry with the given job count. Returns (seconds, results)."""
+    start = time.perf_counter()
+    results = [entry for _, _, entry in cd.iter_parse_results(raw_entries, jobs)]
+    return time.perf_counter() - start, results
+
+
+def bench_parallel(args):
+    """Compare single-process and --jobs parsing on a scaled synthetic corpus."""
+    jobs = args.jobs or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = make_synthetic_corpus(
+            args.source, args.scale, os.path.join(tmp, 'corpus.txt')
+        )
+        raw_entries = dp.aggregate_entries(corpus)
+
+    print(f'Synthetic corpus: {args.scale}x {args.source}, {len(raw_entries)} raw entries')
+
+    serial_time, serial_results = time_parse(raw_entries, 1)
+    print(f'  jobs=1: {serial_time:.2f}s ({len(raw_entries) / serial_time:,.0f} entries/sec)')
+
+    parallel_time, parallel_results = time_parse(raw_entries, jobs)
+    print(f'  jobs={jobs}: {parallel_time:.2f}s ({len(raw_entries) / parallel_time:,.0f} entries/sec)')
+
+    if parallel_results != serial_results:
+        print('ERROR: parallel output differs from single-process output')
+        return 1
+
+    print(f'Speedup: {serial_time / parallel_time:.2f}x (output identical, order preserved)')
+    return 0
+
+
+def measure(func, repeat, memory):
+    """
+    Run func() `repeat` times and keep the fastest wall time. With `memory`,
+    one extra run under tracemalloc records the peak allocation.
+    func() returns the number of items it processed.
+    """
+    best = None
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    result = {
+        'seconds': round(best, 6),
+        'items': items,
+        'items_per_sec': round(items / best, 1) if best else None,
+    }
+    if memory:
+        tracemalloc.start()
+        func()
+        result['peak_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return result
+
+
+def bench_corpus(corpus, tmp, repeat, memory):
+    """Time every converter stage on one corpus. Returns {stage: result}."""
+    raw_entries = dp.aggregate_entries(corpus)
+    texts = [raw_text for raw_text, _ in raw_entries]
+
+    failed = []
+    parsed = list(cd.iter_parsed_entries(raw_entries, failed))
+    json_path = os.path.join(tmp, 'out.json')
+    wxr_path = os.path.join(tmp, 'out.xml')
+
+    def run_aggregate():
+        return len(dp.aggregate_entries(corpus))
+
+    def run_parse():
+        return sum(1 for _ in cd.iter_parsed_entries(raw_entries, []))
+
+    def run_examples():
+        for text in texts:
+            dp.extract_examples_from_text(text, '')
+        return len(texts)
+
+    def run_cross_refs():
+        for text in texts:
+            dp.extract_cross_refs(text)
+        return len(texts)
+
+    # Slug keys of resolve_slug_collisions(), built outside the timed region;
+    # plan_slugs() leaves them untouched, so every repeat sees the collisions
+    slug_keys = [(i, e.word, e.homonym_number) for i, e in enumerate(parsed)]
+
+    def run_slugs():
+        dp.plan_slugs(slug_keys)
+        return len(slug_keys)
+
+    def run_stats():
+        entry_stats = cd.EntryStats()
+        for e in parsed:
+            entry_stats.add(e)
+        entry_stats.as_dict(len(failed))
+        return len(parsed)
+
+    def run_json():
+        cd.write_json_document(json_path, cd.build_metadata({}), (cd.serialize_entry(e) for e in parsed))
+        return len(parsed)
+
+    def run_wxr():
+        writer = WxrWriter(wxr_path)
+        for e in parsed:
+            writer.add(e)
+        writer.close()
+        return len(parsed)
+
+    stages = [
+        ('aggregate_entries', run_aggregate),
+        ('parse_entry', run_parse),
+        ('extract_examples_from_text', run_examples),
+        ('extract_cross_refs', run_cross_refs),
+        ('slug_collisions', run_slugs),
+        ('stats', run_stats),
+        ('json_serialization', run_json),
+        ('wxr_serialization', run_wxr),
+    ]
+
+    results = {}
+    for name, func in stages:
+        results[name] = measure(func, repeat, memory)
+        r = results[name]
+        line = f'  {name:28s} {r["seconds"]:9.3f}s  {r["items_per_sec"] or 0:>12,.0f} items/sec'
+        if 'peak_kb' in r:
+            line += f'  peak {r["peak_kb"]:,} KB'
+        print(line)
+    return len(raw_entries), results
+
+
+def find_regressions(results, baseline, threshold):
+    """List stages that are more than `threshold` (a fraction) slower than the baseline."""
+    regressions = []
+    for corpus, data in results['corpora'].items():
+        base_corpus = baseline.get('corpora', {}).get(corpus)
+        if not base_corpus:
+            continue
+        for stage, r in data['stages'].items():
+            base = base_corpus['stages'].get(stage)
+            if not base or not base['seconds']:
+                continue
+            ratio = r['seconds'] / base['seconds']
+            if ratio > 1 + threshold:
+                regressions.append((corpus, stage, base['seconds'], r['seconds'], ratio))
+    return regressions
+
+
+def bench_stages(args):
+    """Per-stage benchmark of parsing and every output format with optional regression check."""
+    scales = [int(x) for x in args.scales.split(',') if x.strip()]
+    results = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'source': args.source,
+        'corpora': {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            if scale == 1:
+                corpus = args.source
+            else:
+                corpus = make_synthetic_corpus(
+                    args.source, scale, os.path.join(tmp, f'corpus-{scale}x.txt')
+                )
+            print(f'Corpus {scale}x:')
+            # Larger corpora take long enough that one timed run is representative
+            repeat = args.repeat if scale == 1 else 1
+            count, stages = bench_corpus(corpus, tmp, repeat, not args.no_memory)
+            results['corpora'][f'{scale}x'] = {'raw_entries': count, 'stages': stages}
+            if corpus != args.source:
+                os.remove(corpus)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {args.output}')
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.threshold)
+    if not regressions:
+        print(f'No stage slower than baseline by more than {args.threshold:.0%}')
+        return 0
+
+    print(f'Regressions over {args.threshold:.0%}:')
+    for corpus, stage, before, after, ratio in regressions:
+        print(f'  {corpus} {stage}: {before:.3f}s -> {after:.3f}s ({ratio:.2f}x)')
+    return 1
+
+
+def retained_kb(build):
+    """Memory in KB still allocated by the object build() returns, via tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return current // 1024
+
+
+def as_dicts(raw_entries):
+    """Parse into the dict-per-entry shape parse_entry used to return."""
+    entries = []
+    for raw_text, line_num in raw_entries:
+        entry = dp.parse_entry(raw_text, line_num)
+        if entry is not None:
+            data = entry.to_dict()
+            data['_line'] = entry.line
+            entries.append(data)
+    return entries
+
+
+def as_entries(raw_entries):
+    """Parse into Entry objects."""
+    entries = []
+    for raw_text, line_num in raw_entries:
+        entry = dp.parse_entry(raw_text, line_num)
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+def bench_memory(args):
+    """Memory held by parsed entries as __slots__ Entry objects vs plain dicts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.source
+        if args.scale > 1:
+            corpus = make_synthetic_corpus(args.source, args.scale, os.path.join(tmp, 'corpus.txt'))
+        raw_entries = dp.aggregate_entries(corpus)
+
+    # Warm the annotation cache so it is not counted against either shape
+    as_entries(raw_entries[:1000])
+
+    print(f'Corpus {args.scale}x: {len(raw_entries)} raw entries')
+    dict_kb = retained_kb(lambda: as_dicts(raw_entries))
+    entry_kb = retained_kb(lambda: as_entries(raw_entries))
+    print(f'  dicts   {dict_kb:>10,} KB  ({dict_kb * 1024 / len(raw_entries):,.0f} bytes/entry)')
+    print(f'  Entry   {entry_kb:>10,} KB  ({entry_kb * 1024 / len(raw_entries):,.0f} bytes/entry)')
+    print(f'Reduction: {1 - entry_kb / dict_kb:.0%}')
+    return 0
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def make_queries(index, count, seed):
+    """
+    `count` seeded random (kind, method, args, kwargs) DictionaryIndex
+    queries drawn from `index`: exact lookups, headword prefixes, English
+    reverse lookups, short and long searches, filtered searches, and fuzzy
+    lookups of misspelt headwords.
+    """
+    rng = random.Random(seed)
+    entries = index.entries
+    english = sorted(index.tokens)
+    letters = sorted(index.by_letter)
+    pos_values = sorted(index.by_pos)
+
+    def word():
+        return rng.choice(entries).word
+
+    def typo():
+        """A headword with a doubled vowel, a dropped character or a substitution."""
+        chars = list(word().lower())
+        i = rng.randrange(len(chars))
+        edit = rng.randrange(3)
+        if edit == 0 and chars[i] in 'aeiou':
+            chars.insert(i, chars[i])
+        elif edit == 1 and len(chars) > 3:
+            del chars[i]
+        else:
+            chars[i] = rng.choice('aeikmnorstu')
+        return ''.join(chars)
+
+    makers = {
+        'lookup': lambda: ('lookup', (word(),), {}),
+        'prefix': lambda: ('prefix', (word()[:rng.randint(1, 4)],), {}),
+        'fuzzy': lambda: ('fuzzy', (typo(),), {}),
+        'reverse': lambda: ('reverse', (rng.choice(english),), {}),
+        'search_short': lambda: ('search', (rng.choice(english)[:rng.randint(2, 3)],), {}),
+        'search_long': lambda: ('search', (rng.choice(english),), {}),
+        'search_filtered': lambda: ('search', (word()[:2],),
+                                    {'letter': rng.choice(letters), 'pos': rng.choice(pos_values)}),
+    }
+    kinds = sorted(makers)
+    return [(kind,) + makers[kind]() for kind in (rng.choice(kinds) for _ in range(count))]
+
+
+def brute_force_mismatch(index, method, args, result):
+    """Check a lookup or prefix result against a scan of every entry. Returns a description or None."""
+    text = args[0].lower()
+    if method == 'lookup':
+        expected = sorted((e for e in index.entries if e.word.lower() == text),
+                          key=lambda e: e.homonym_number or 0)
+        if sorted(result, key=lambda e: e.homonym_number or 0) != expected:
+            return f'lookup {args[0]!r}'
+    elif method == 'prefix':
+        matches = sum(1 for e in index.entries if e.word.lower().startswith(text))
+        if len(result) != min(matches, 20) or not all(e.word.lower().startswith(text) for e in result):
+            return f'prefix {args[0]!r}'
+    return None
+
+
+def bench_queries(args):
+    """
+    Query latency of DictionaryIndex: p50/p99 per query kind over seeded
+    random queries on converter output loaded with its .index.json and
+    .morphology.json. Every result is checked against an index rebuilt in
+    memory from the same entries, and lookups and prefixes against a scan.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        output = args.output
+        if not output:
+            output = os.path.join(tmp, 'out.json')
+            with contextlib.redirect_stdout(None):
+                cd.main([args.source, output, '--index', '--morphology'])
+        start = time.perf_counter()
+        index = DictionaryIndex.load(output)
+        print(f'Loaded {output} in {time.perf_counter() - start:.3f}s')
+    start = time.perf_counter()
+    rebuilt = DictionaryIndex(index.entries)
+    print(f'Indexed {len(index.entries)} entries in memory in {time.perf_counter() - start:.3f}s')
+
+    # Build the lazily created fuzzy index outside the timings
+    index.fuzzy('')
+
+    timings = {}
+    mismatches = []
+    for kind, method, query_args, kwargs in make_queries(index, args.count, args.seed):
+        query = getattr(index, method)
+        start = time.perf_counter()
+        result = query(*query_args, **kwargs)
+        timings.setdefault(kind, []).append(time.perf_counter() - start)
+        if getattr(rebuilt, method)(*query_args, **kwargs) != result:
+            mismatches.append(f'{method} {query_args[0]!r} {kwargs or ""} differs from the in-memory index')
+        mismatch = brute_force_mismatch(index, method, query_args, result)
+        if mismatch:
+            mismatches.append(mismatch)
+    timings['all'] = [t for values in timings.values() for t in values]
+
+    print(f'{args.count:,} queries (seed {args.seed}):')
+    print(f'  {"kind":16s} {"count":>7s} {"p50":>10s} {"p99":>10s} {"max":>10s}')
+    for kind, values in sorted(timings.items(), key=lambda item: item[0] == 'all'):
+        values.sort()
+        print(f'  {kind:16s} {len(values):>7,} '
+              f'{percentile(values, 0.5) * 1000:8.3f}ms '
+              f'{percentile(values, 0.99) * 1000:8.3f}ms '
+              f'{values[-1] * 1000:8.3f}ms')
+    print(f'Checked against the in-memory index and a scan: {len(mismatches)} mismatches')
+    for mismatch in mismatches[:10]:
+        print(f'  {mismatch}')
+    return 1 if mismatches else 0
+
+
+# Lookup processes timed by `binary`: start-up to the first entry, printed in ms
+COLD_JSON_LOOKUP = """
+import json, sys, time
+start = time.perf_counter()
+with open(sys.argv[1], encoding='utf-8') as f:
+    entries = json.load(f)['entries']
+entry = next(e for e in entries if e['slug'] == sys.argv[2])
+print((time.perf_counter() - start) * 1000)
+"""
+
+COLD_BINARY_LOOKUP = """
+import sys, time
+start = time.perf_counter()
+from binary_dictionary import BinaryDictionary
+entry = BinaryDictionary(sys.argv[1]).get(sys.argv[2])
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def round_trip_mismatches(json_entries, binary):
+    """Differences between the binary export and the JSON output it was written with."""
+    mismatches = []
+    if len(binary) != len(json_entries):
+        mismatches.append(f'count {len(binary)} != {len(json_entries)}')
+    slugs = [binary.slug_bytes(i) for i in range(len(binary))]
+    if slugs != sorted(slugs):
+        mismatches.append('record table not sorted by slug')
+    for position in range(len(binary)):
+        expected = json_entries[binary.ordinal(position)]
+        if binary.entry_at(position) != expected:
+            mismatches.append(f'entry {expected["slug"]}')
+        with binary.headword(position) as headword:
+            if bytes(headword).decode('utf-8') != expected['word']:
+                mismatches.append(f'headword {expected["slug"]}')
+    # Slug lookups return the first entry in output order with that slug
+    first = {}
+    for e in json_entries:
+        first.setdefault(e['slug'], e)
+    mismatches.extend(f'get {slug}' for slug, e in first.items() if binary.get(slug) != e)
+    return mismatches
+
+
+def cold_start_ms(script, path, slug, repeat):
+    """Median time a fresh process takes from start-up to one looked-up entry."""
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', script, path, slug],
+            capture_output=True, text=True, check=True, cwd=TOOLS_DIR,
+        )
+        times.append(float(result.stdout))
+    times.sort()
+    return times[len(times) // 2]
+
+
+def bench_binary(args):
+    """Round-trip check of the .bin export against the JSON, and cold-start lookup time."""
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'out.json')
+        bin_path = cd.sidecar_path(json_path, '.bin')
+        with contextlib.redirect_stdout(None):
+            cd.main([args.source, json_path, '--binary'])
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            json_entries = json.load(f)['entries']
+        with BinaryDictionary(bin_path) as binary:
+            mismatches = round_trip_mismatches(json_entries, binary)
+        print(f'Round trip: {len(json_entries)} entries, {len(mismatches)} mismatches')
+        for mismatch in mismatches[:10]:
+            print(f'  {mismatch}')
+
+        print(f'  JSON   {os.path.getsize(json_path):>12,} bytes')
+        print(f'  binary {os.path.getsize(bin_path):>12,} bytes')
+
+        slug = json_entries[len(json_entries) // 2]['slug']
+        json_ms = cold_start_ms(COLD_JSON_LOOKUP, json_path, slug, args.repeat)
+        binary_ms = cold_start_ms(COLD_BINARY_LOOKUP, bin_path, slug, args.repeat)
+        print(f'Cold start to first lookup (median of {args.repeat}):')
+        print(f'  json.load     {json_ms:9.2f}ms')
+        print(f'  mmap binary   {binary_ms:9.2f}ms')
+    return 1 if mismatches else 0
+
+
+# The long-query path of SearchQuery::execute() in SQLite: headword prefix or
+# definition substring (LIKE) vs headword prefix or FTS5 match, same CASE order
+LIKE_SEARCH_SQL = """
+    SELECT t.id FROM dict_terms t LEFT JOIN dict_definitions d ON d.term_id = t.id
+    WHERE t.parent_id IS NULL AND (t.word LIKE :prefix OR d.definition_text LIKE :infix)
+    GROUP BY t.id
+    ORDER BY CASE WHEN t.word = :q THEN 0 WHEN t.word LIKE :prefix THEN 1 ELSE 2 END, t.word
+    LIMIT 20
+"""
+
+LIKE_MATCH_SQL = """
+    SELECT DISTINCT t.id FROM dict_terms t LEFT JOIN dict_definitions d ON d.term_id = t.id
+    WHERE t.parent_id IS NULL AND (t.word LIKE :prefix OR d.definition_text LIKE :infix)
+"""
+
+LIKE_COUNT_SQL = f'SELECT COUNT(*) FROM ({LIKE_MATCH_SQL})'
+
+FTS_SEARCH_SQL = """
+    WITH hits AS (
+        SELECT d.term_id AS id, f.rank AS rank FROM dict_definitions_fts f
+        JOIN dict_definitions d ON d.id = f.rowid WHERE dict_definitions_fts MATCH :match
+        UNION ALL
+        SELECT id, NULL FROM dict_terms WHERE word LIKE :prefix
+    )
+    SELECT t.id FROM (SELECT id, MIN(rank) AS rank FROM hits GROUP BY id) h
+    JOIN dict_terms t ON t.id = h.id
+    WHERE t.parent_id IS NULL
+    ORDER BY CASE WHEN t.word = :q THEN 0 WHEN t.word LIKE :prefix THEN 1 ELSE 2 END,
+             h.rank, t.word
+    LIMIT 20
+"""
+
+FTS_MATCH_SQL = """
+    SELECT t.id FROM (
+        SELECT d.term_id AS id FROM dict_definitions_fts f
+        JOIN dict_definitions d ON d.id = f.rowid WHERE dict_definitions_fts MATCH :match
+        UNION
+        SELECT id FROM dict_terms WHERE word LIKE :prefix
+    ) h JOIN dict_terms t ON t.id = h.id
+    WHERE t.parent_id IS NULL
+"""
+
+FTS_COUNT_SQL = f'SELECT COUNT(*) FROM ({FTS_MATCH_SQL})'
+
+
+def search_params(q):
+    """Named parameters of the search statements for one query."""
+    return {'q': q, 'prefix': q + '%', 'infix': '%' + q + '%', 'match': fts_query(q)}
+
+
+def fts_mismatch(db, q, params, from_definitions):
+    """Why the FTS5 matches of a query are wrong, or None if they are consistent with LIKE."""
+    fts_ids = {term_id for (term_id,) in db.execute(FTS_MATCH_SQL, params)}
+    if from_definitions and not fts_ids:
+        return f'{q!r}: definition word has no FTS5 match'
+    # Only a plain word is one FTS5 token; '-di-' matches the word 'di'
+    if not q.isalpha():
+        return None
+    missing = fts_ids - {term_id for (term_id,) in db.execute(LIKE_MATCH_SQL, params)}
+    if missing:
+        return f'{q!r}: {len(missing)} FTS5 matches not found by LIKE'
+    return None
+
+
+def bench_sqlite(args):
+    """
+    Long-query search on the .sqlite export: FTS5 vs the LIKE path. Every
+    FTS5 match of a plain word must also be a LIKE match, and a word taken
+    from a definition must have at least one FTS5 match.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'out.json')
+        with contextlib.redirect_stdout(None):
+            cd.main([args.source, json_path, '--sqlite'])
+        db = sqlite3.connect(cd.sidecar_path(json_path, '.sqlite'))
+
+        words = [w for (w,) in db.execute(
+            'SELECT DISTINCT word FROM dict_terms WHERE length(word) >= 4 ORDER BY word')]
+        english = sorted({
+            token for (text,) in db.execute('SELECT definition_text FROM dict_definitions')
+            for token in text.lower().split() if len(token) >= 4 and token.isalpha()
+        })
+        rng = random.Random(args.seed)
+        queries = []
+        for _ in range(args.count):
+            from_definitions = rng.random() < 0.8
+            queries.append((rng.choice(english if from_definitions else words), from_definitions))
+
+        paths = (
+            ('LIKE', LIKE_SEARCH_SQL, LIKE_COUNT_SQL),
+            ('FTS5', FTS_SEARCH_SQL, FTS_COUNT_SQL),
+        )
+        print(f'{args.count:,} long queries (seed {args.seed}), results page + count:')
+        for name, search_sql, count_sql in paths:
+            timings = []
+            total = 0
+            for q, _ in queries:
+                params = search_params(q)
+                start = time.perf_counter()
+                db.execute(search_sql, params).fetchall()
+                total += db.execute(count_sql, params).fetchone()[0]
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(f'  {name}  p50 {percentile(timings, 0.5) * 1000:8.3f}ms  '
+                  f'p99 {percentile(timings, 0.99) * 1000:8.3f}ms  '
+                  f'{total / len(queries):8.1f} matches/query')
+
+        mismatches = [m for m in (fts_mismatch(db, q, search_params(q), from_definitions)
+                                  for q, from_definitions in queries) if m]
+        db.close()
+    print(f'FTS5 vs LIKE: {len(queries):,} queries, {len(mismatches)} mismatches')
+    for mismatch in mismatches[:10]:
+        print(f'  {mismatch}')
+    return 1 if mismatches else 0
+
+
+def iter_sql_statements(path):
+    """Complete statements of a SQL script, one at a time."""
+    lines = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not lines and line.startswith('--'):
+                continue
+            lines.append(line)
+            if line.rstrip().endswith(';') and sqlite3.complete_statement(''.join(lines)):
+                yield ''.join(lines)
+                lines = []
+
+
+def bench_sqldump(args):
+    """
+    Load the .sql dump into SQLite standing in for MySQL (its SET and
+    START TRANSACTION lines are MySQL-only) and compare every table with --sqlite.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'out.json')
+        with contextlib.redirect_stdout(None):
+            cd.main([args.source, json_path, '--sqlite', '--sql-dump', '--table-prefix', ''])
+        sql_path = cd.sidecar_path(json_path, '.sql')
+
+        db = sqlite3.connect(os.path.join(tmp, 'loaded.sqlite'), isolation_level=None)
+        for sql in SQLITE_TABLES:
+            db.execute(sql)
+        start = time.perf_counter()
+        statements = 0
+        db.execute('BEGIN')
+        for statement in iter_sql_statements(sql_path):
+            if statement.startswith(('DELETE', 'INSERT')):
+                db.execute(statement)
+                statements += statement.startswith('INSERT')
+        db.execute('COMMIT')
+        seconds = time.perf_counter() - start
+        print(f'Loaded {os.path.getsize(sql_path):,} bytes in {statements} INSERT statements: {seconds:.3f}s')
+
+        db.execute('ATTACH DATABASE ? AS export', (cd.sidecar_path(json_path, '.sqlite'),))
+        differences = 0
+        for table, columns in (
+            ('dict_terms', 'id, word, slug, homonym_number, plural, pos, pos_detail, gender, dialect, '
+                           'verb_stem, letter, usage_labels, parent_id, sort_order'),
+            ('dict_definitions', '*'),
+            ('dict_examples', '*'),
+            ('dict_relations', '*'),
+        ):
+            loaded = db.execute(f'SELECT {columns} FROM main.{table} ORDER BY id').fetchall()
+            exported = db.execute(f'SELECT {columns} FROM export.{table} ORDER BY id').fetchall()
+            same = loaded == exported
+            differences += not same
+            print(f'  {table:18s} {len(loaded):>7,} rows  {"same as --sqlite" if same else "DIFFERENT"}')
+        db.close()
+    return 1 if differences else 0
+
+
+def homonym_keys(count, group_size):
+    """
+    (key, word, homonym_number) for a synthetic corpus in which every
+    headword has `group_size` entries: unnumbered ones, repeated homonym
+    numbers and punctuation variants (w, w-, -w) all sharing slugs.
+    """
+    keys = []
+    for i in range(count):
+        group, member = divmod(i, group_size)
+        word = ('', '-', '')[member % 3] + f'w{group}' + ('', '', '-')[member % 3]
+        homonym_number = None if member % 4 == 0 else member % 5 or 1
+        keys.append((i, word, homonym_number))
+    return keys
+
+
+def bench_slugs(args):
+    """
+    Time plan_slugs on homonym-heavy corpora of growing size and check that
+    every slug comes out unique, with a homonym number matching its suffix,
+    and the time per entry stays flat.
+    """
+    sizes = [int(s) for s in args.sizes.split(',')]
+    per_entry = []
+    failures = 0
+    for size in sizes:
+        keys = homonym_keys(size, args.group_size)
+        start = time.perf_counter()
+        changes, collisions = dp.plan_slugs(keys)
+        seconds = time.perf_counter() - start
+        slugs = [changes[key][1] if key in changes else dp.generate_slug(word, number)
+                 for key, word, number in keys]
+        unique = len(set(slugs)) == len(slugs)
+        consistent = all(dp.generate_slug(word, changes[key][0]) == changes[key][1]
+                         for key, word, _ in keys if key in changes)
+        failures += not unique or not consistent
+        per_entry.append(seconds / size)
+        print(f'{size:>9,} entries  {collisions:>8,} collisions  {len(changes):>8,} changed  '
+              f'{seconds:.3f}s  {seconds / size * 1e6:.2f}us/entry  {"unique" if unique else "DUPLICATES"}'
+              f'{"" if consistent else "  HOMONYM NUMBER MISMATCH"}')
+    growth = per_entry[-1] / per_entry[0]
+    linear = growth <= args.max_growth
+    print(f'Time per entry grew {growth:.2f}x from {sizes[0]:,} to {sizes[-1]:,} entries: '
+          f'{"linear" if linear else "SUPERLINEAR"}')
+    return 1 if failures or not linear else 0
+
+
+def brute_force_completions(ranked, keys, prefix, top_k):
+    """Top-k ranks for a prefix by scanning every key: the best completion of each of the best entries."""
+    top = []
+    seen = set()
+    for rank in sorted({r for key, ranks in keys.items() if key.startswith(prefix) for r in ranks}):
+        if ranked[rank][1] not in seen and len(top) < top_k:
+            seen.add(ranked[rank][1])
+            top.append(rank)
+    return top
+
+
+def bench_autocomplete(args):
+    """
+    Build time, size and lookup latency of the autocomplete trie, checked
+    against a scan over every key, with the headword bisect of
+    DictionaryIndex.prefix() as the latency baseline.
+    """
+    failed = []
+    entries = list(cd.iter_parsed_entries(dp.aggregate_entries(args.source), failed))
+    dp.resolve_slug_collisions(entries)
+
+    builds = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        builder = AutocompleteBuilder(args.top_k)
+        for entry in entries:
+            builder.add(entry)
+        document = builder.as_dict()
+        builds.append(time.perf_counter() - start)
+    data = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    print(f'Built {document["keys"]:,} keys, {len(document["targets"]):,} completions, '
+          f'{len(document["nodes"]):,} nodes in {min(builds):.3f}s (best of {args.repeat})')
+    print(f'  JSON   {len(data):>10,} bytes')
+    print(f'  gzip   {len(gzip.compress(data, 9)):>10,} bytes')
+
+    start = time.perf_counter()
+    trie = AutocompleteTrie(json.loads(data))
+    print(f'Loaded in {(time.perf_counter() - start) * 1000:.1f}ms')
+
+    ranked, keys = builder.targets()
+    rank = {target: i for i, target in enumerate(ranked)}
+    rng = random.Random(args.seed)
+    words = sorted(keys)
+    prefixes = [w[:rng.randint(1, min(len(w), 4))] for w in (rng.choice(words) for _ in range(args.count))]
+
+    mismatches = 0
+    for prefix in prefixes[:args.check]:
+        got = [rank[(c['text'], c['slug'])] for c in trie.complete(prefix)]
+        mismatches += got != brute_force_completions(ranked, keys, prefix, args.top_k)
+    print(f'Checked {min(args.check, len(prefixes)):,} prefixes against a full scan: {mismatches} mismatches')
+
+    index = DictionaryIndex(entries)
+    print(f'{len(prefixes):,} prefixes of 1-4 characters (seed {args.seed}):')
+    for name, lookup in (('trie', lambda p: trie.complete(p)),
+                         ('bisect', lambda p: index.prefix(p, limit=args.top_k))):
+        timings = []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            lookup(prefix)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f'  {name:8s} p50 {percentile(timings, 0.5) * 1e6:7.1f}us  '
+              f'p99 {percentile(timings, 0.99) * 1e6:7.1f}us  max {timings[-1] * 1e6:8.1f}us')
+    return 1 if mismatches else 0
+
+
+# Modules whose module-level NAME_RE patterns the regex audit covers
+REGEX_MODULES = ('dictionary_parser', 'cross_refs', 'search_index', 'fuzzy_index', 'autocomplete', 'wxr_export')
+
+# Patterns the code only applies at the start of a string, with the method
+# it uses; every other pattern is scanned through the whole input
+ANCHORED_PATTERNS = {
+    'dictionary_parser.SECTION_HEADER_RE': 'match',
+    'dictionary_parser.ENTRY_START_RE': 'match',
+    'dictionary_parser.HEADWORD_RE': 'match',
+    'dictionary_parser.LIST_ITEM_RE': 'match',
+    'dictionary_parser.ORDINAL_RE': 'match',
+    'autocomplete.PLURAL_FORM_RE': 'fullmatch',
+}
+
+# Adversarial inputs: each unit repeated to length, and each head followed by
+# one long run of a filler and a tail, so quantifiers that overlap, runs that
+# fail on their last character and openers that never close get the most
+# room to backtrack
+ADVERSARIAL_UNITS = (
+    'a', ' ', '1', 'a ', "a'", '-a', '(', '( ', '(a', '(plural ', '(plural a', '(noun ',
+    '(verb ', 'cp. ', 'cp. a', 'a: ', 'ko-a ', '%(a', 'aa1', 'a a1', 'a 1',
+)
+ADVERSARIAL_HEADS = ('', 'a', '-', '(', '(plural', '(plural a', '(noun', 'cp.', 'a:', '%(')
+ADVERSARIAL_FILLERS = ('a', ' ', '1', 'a ', ' (', "a'")
+ADVERSARIAL_TAILS = ('', '!')
+
+# Characters of the random fuzz inputs
+FUZZ_ALPHABET = "aeikou AEK19 '-().,;:%s"
+
+# Tokens joined into the random strings of the equivalence fuzz
+FUZZ_TOKENS = ('a', 'ko', 'akai', 'E', '1', '12', ' ', '  ', '\t', '(', ')', '(plural', '(noun F)',
+               'plural', 'noun', 'cp.', ',', ';', ':', '.', '-', "'")
+
+# Below this, timings are noise and their growth is not judged
+MIN_TIMED_SECONDS = 0.002
+
+# The patterns the regex audit found superlinear, as they were before their
+# linear replacements; the equivalence fuzz checks the replacements against them
+REFERENCE_PARENTHETICAL_RE = re.compile(r'\s*\(.*?\)\s*')
+REFERENCE_HOMONYM_REF_RE = re.compile(r'^(.+?)\s?(\d+)$')
+REFERENCE_PLURAL_RE = re.compile(r'\(plural\s+([^)]+)\)')
+
+
+def audited_patterns():
+    """(module.NAME, compiled pattern) of every NAME_RE global of REGEX_MODULES."""
+    patterns = []
+    for module_name in REGEX_MODULES:
+        module = importlib.import_module(module_name)
+        for name, value in sorted(vars(module).items()):
+            if name.endswith('_RE') and isinstance(value, re.Pattern):
+                patterns.append((f'{module_name}.{name}', value))
+    return patterns
+
+
+def adversarial_inputs(size, seed, fuzz):
+    """(label, text) of every adversarial input family at one length."""
+    for unit in ADVERSARIAL_UNITS:
+        yield f'{unit!r}*', (unit * (size // len(unit) + 1))[:size]
+    for head in ADVERSARIAL_HEADS:
+        for filler in ADVERSARIAL_FILLERS:
+            run = (filler * (size // len(filler) + 1))[:size - len(head)]
+            for tail in ADVERSARIAL_TAILS:
+                yield f'{head!r}+{filler!r}*+{tail!r}', head + run + tail
+    for i in range(fuzz):
+        rng = random.Random(f'{seed}:{i}')
+        yield f'fuzz#{i}', ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(size))
+
+
+def best_seconds(func, repeat):
+    """Best wall time of `repeat` calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def growth_exponent(sizes, seconds):
+    """k of time ~ length^k between the smallest and largest size, or None when too fast to judge."""
+    if seconds[-1] < MIN_TIMED_SECONDS or seconds[0] <= 0:
+        return None
+    return math.log(seconds[-1] / seconds[0]) / math.log(sizes[-1] / sizes[0])
+
+
+def pattern_runner(pattern, method, text):
+    """A call that applies a pattern to a text the way the code does."""
+    if method == 'scan':
+        return lambda: collections.deque(pattern.finditer(text), maxlen=0)
+    return lambda: getattr(pattern, method)(text)
+
+
+def worst_growth(run, sizes, inputs, repeat):
+    """(exponent, seconds at the largest size, label) of the fastest-growing input family."""
+    timings = {}
+    for size in sizes:
+        for label, text in inputs(size):
+            timings.setdefault(label, []).append(best_seconds(run(text), repeat))
+    worst = (None, 0.0, '')
+    for label, seconds in timings.items():
+        exponent = growth_exponent(sizes, seconds)
+        if exponent is not None and (worst[0] is None or exponent > worst[0]):
+            worst = (exponent, seconds[-1], label)
+        elif worst[0] is None and seconds[-1] > worst[1]:
+            worst = (None, seconds[-1], label)
+    return worst
+
+
+def print_growth(name, worst, max_exponent):
+    """Print one audit line. Returns whether the growth is superlinear."""
+    exponent, seconds, label = worst
+    superlinear = exponent is not None and exponent > max_exponent
+    shown = f'n^{exponent:.2f}' if exponent is not None else 'fast'
+    print(f'  {name:48s} {shown:>7s}  {seconds * 1000:9.2f}ms  '
+          f'{"SUPERLINEAR" if superlinear else "linear":11s}  {label}')
+    return superlinear
+
+
+def long_entries(raw_entries, size):
+    """(label, raw entry) of synthetic entries about `size` characters long."""
+    body = max((raw_text for raw_text, _ in raw_entries), key=len).split(' ', 1)[1]
+    yield 'longest entry body*', 'akai ' + (body * (size // len(body) + 1))[:size]
+    for unit in ('(plural a', '(plural ', '(noun ', 'cp. a', 'cp.  ', 'a: b. ', ' ', 'a1 ', 'ko-a ('):
+        yield f'{unit!r}*', 'akai (noun F) ' + (unit * (size // len(unit) + 1))[:size]
+    yield 'cp. +\' \'*', 'akai (noun F) cp. ' + ' ' * size + 'x'
+    yield 'cp. a+\'1\'*', 'akai (noun F) cp. a' + '1' * size + 'x'
+
+
+def equivalence_mismatches(count, seed):
+    """
+    Compare the linear replacements with the patterns they replaced on random
+    token strings. Returns {name: mismatches}.
+    """
+    rng = random.Random(seed)
+    mismatches = collections.Counter()
+    for _ in range(count):
+        text = ''.join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(1, 30)))
+
+        mismatches['drop_parentheticals'] += (
+            dp.drop_parentheticals(text) != REFERENCE_PARENTHETICAL_RE.sub('', text))
+
+        # Numbers too long to be homonym numbers are dropped on purpose
+        m = REFERENCE_HOMONYM_REF_RE.match(text)
+        numbered = m and len(m.group(2)) <= cross_refs.MAX_HOMONYM_DIGITS
+        expected = (m.group(1), int(m.group(2))) if numbered else None
+        mismatches['split_homonym'] += cross_refs.split_homonym(text) != expected
+
+        # Blank and overlong plural groups are dropped on purpose; compare the rest
+        expected = [(m.span(), m.group(1)) for m in REFERENCE_PLURAL_RE.finditer(text)]
+        if all(group.strip() and len(group) <= dp.MAX_PLURAL_LENGTH for _, group in expected):
+            got = [(m.span(), m.group(1)) for m in dp.PLURAL_RE.finditer(text)]
+            mismatches['PLURAL_RE'] += got != expected
+    return mismatches
+
+
+def bench_regex(args):
+    """
+    Worst-case audit of the compiled patterns: time every NAME_RE pattern on
+    adversarial, very long and random inputs of growing length and report
+    how its time grows, then do the same for parse_entry on long synthetic
+    entries, and fuzz the linear replacements of the patterns that were
+    superlinear against the originals.
+    """
+    sizes = [int(s) for s in args.sizes.split(',')]
+    print(f'Input lengths {", ".join(f"{s:,}" for s in sizes)}; worst input family per pattern '
+          f'(growth over {args.max_exponent} is superlinear):')
+    superlinear = 0
+    for name, pattern in audited_patterns():
+        method = ANCHORED_PATTERNS.get(name, 'scan')
+        worst = worst_growth(lambda text: pattern_runner(pattern, method, text), sizes,
+                             lambda size: adversarial_inputs(size, args.seed, args.fuzz), args.repeat)
+        superlinear += print_growth(f'{name} ({method})', worst, args.max_exponent)
+
+    print('Linear replacements of superlinear patterns:')
+    for name, func in (('dictionary_parser.drop_parentheticals', dp.drop_parentheticals),
+                       ('cross_refs.split_homonym', cross_refs.split_homonym)):
+        worst = worst_growth(lambda text: lambda: func(text), sizes,
+                             lambda size: adversarial_inputs(size, args.seed, args.fuzz), args.repeat)
+        superlinear += print_growth(name, worst, args.max_exponent)
+
+    raw_entries = list(dp.aggregate_entries(args.source))
+    print('parse_entry on long synthetic entries:')
+    worst = worst_growth(lambda text: lambda: dp.parse_entry(text), sizes,
+                         lambda size: long_entries(raw_entries, size), args.repeat)
+    superlinear += print_growth('dictionary_parser.parse_entry', worst, args.max_exponent)
+
+    mismatches = equivalence_mismatches(args.count, args.seed)
+    print(f'Equivalence fuzz over {args.count:,} random strings: '
+          + ', '.join(f'{name} {n} mismatches' for name, n in sorted(mismatches.items())))
+    return 1 if superlinear or any(mismatches.values()) else 0
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark the dictionary converter.')
+    parser.add_argument('--source', default=DEFAULT_SOURCE)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parallel = subparsers.add_parser('parallel', help='single-process vs --jobs parsing')
+    parallel.add_argument('--scale', type=int, default=50)
+    parallel.add_argument('--jobs', type=int, default=0, help='default: all CPUs')
+    parallel.set_defaults(func=bench_parallel)
+
+    memory = subparsers.add_parser('memory', help='memory held by parsed entries, Entry vs dict')
+    memory.add_argument('--scale', type=int, default=10)
+    memory.set_defaults(func=bench_memory)
+
+    stages = subparsers.add_parser('stages', help='per-stage timings of both converters')
+    stages.add_argument('--scales', default='1,10,100', help='corpus sizes, comma separated')
+    stages.add_argument('--repeat', type=int, default=3, help='timed runs on the real file')
+    stages.add_argument('--no-memory', action='store_true', help='skip tracemalloc peaks')
+    stages.add_argument('--output', default='benchmark-results.json')
+    stages.add_argument('--baseline', help='previous results to compare against')
+    stages.add_argument(
+        '--threshold', type=float, default=0.25,
+        help='allowed slowdown vs baseline as a fraction (default: 0.25)',
+    )
+    stages.set_defaults(func=bench_stages)
+
+    queries = subparsers.add_parser('queries', help='DictionaryIndex query latency')
+    queries.add_argument('--count', type=int, default=10000)
+    queries.add_argument('--seed', type=int, default=1)
+    queries.add_argument('--output', help='existing converter output to load (default: parse --source)')
+    queries.set_defaults(func=bench_queries)
+
+    binary = subparsers.add_parser('binary', help='.bin export round trip and cold-start lookup')
+    binary.add_argument('--repeat', type=int, default=5)
+    binary.set_defaults(func=bench_binary)
+
+    sqlite = subparsers.add_parser('sqlite', help='FTS5 vs LIKE search on the .sqlite export')
+    sqlite.add_argument('--count', type=int, default=1000)
+    sqlite.add_argument('--seed', type=int, default=1)
+    sqlite.set_defaults(func=bench_sqlite)
+
+    sqldump = subparsers.add_parser('sqldump', help='load the .sql dump into SQLite and check it')
+    sqldump.set_defaults(func=bench_sqldump)
+
+    slugs = subparsers.add_parser('slugs', help='slug collision resolution on homonym-heavy corpora')
+    slugs.add_argument('--sizes', default='10000,100000,1000000', help='corpus sizes, comma separated')
+    slugs.add_argument('--group-size', type=int, default=12, help='entries per headword')
+    slugs.add_argument(
+        '--max-growth', type=float, default=2.0,
+        help='allowed growth of the time per entry from the smallest to the largest size',
+    )
+    slugs.set_defaults(func=bench_slugs)
+
+    autocomplete = subparsers.add_parser('autocomplete', help='autocomplete trie size, build time and latency')
+    autocomplete.add_argument('--top-k', type=int, default=DEFAULT_TOP_K)
+    autocomplete.add_argument('--count', type=int, default=10000)
+    autocomplete.add_argument('--check', type=int, default=2000, help='prefixes checked against a full scan')
+    autocomplete.add_argument('--repeat', type=int, default=3)
+    autocomplete.add_argument('--seed', type=int, default=1)
+    autocomplete.set_defaults(func=bench_autocomplete)
+
+    regex = subparsers.add_parser('regex', help='worst-case growth of the compiled patterns and parse_entry')
+    regex.add_argument('--sizes', default='1000,4000,16000', help='input lengths, comma separated')
+    regex.add_argument('--fuzz', type=int, default=4, help='random inputs per length')
+    regex.add_argument('--count', type=int, default=100000, help='random strings of the equivalence fuzz')
+    regex.add_argument('--repeat', type=int, default=3)
+    regex.add_argument('--seed', type=int, default=1)
+    regex.add_argument(
+        '--max-exponent', type=float, default=1.5,
+        help='largest growth exponent of time vs input length counted as linear',
+    )
+    regex.set_defaults(func=bench_regex)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the selected benchmark."""
+    args = parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
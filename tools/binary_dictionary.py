@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Binary Format
+Compact export of the converter output for processes that need a lookup
+without paying for a full JSON parse at start-up. The file is memory-mapped
+and entries are decoded one at a time.
+
+Layout (little-endian):
+    header   magic 'ATDB', version u16, reserved u16, entry count u32,
+             record table offset u32
+    heap     per entry, in output order: slug, headword and the entry as
+             compact JSON, all UTF-8, back to back
+    table    one fixed-width record per entry, sorted by slug: output
+             ordinal u32, heap offset u32, slug length u16, headword
+             length u16, JSON length u32
+
+The table comes last so the heap can be written while entries stream past;
+only the fixed-width records are held until the end.
+"""
+
+import json
+import mmap
+import struct
+
+
+MAGIC = b'ATDB'
+BINARY_VERSION = 1
+
+HEADER = struct.Struct('<4sHHII')
+RECORD = struct.Struct('<IIHHI')
+
+
+class BinaryWriter:
+    """Writes the binary format one Entry at a time. Call close() to finish the file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, BINARY_VERSION, 0, 0, 0))
+        self.offset = HEADER.size
+        self.records = []
+
+    def add(self, entry):
+        """Append an Entry to the heap. Slugs must be final."""
+        if entry.slug is None:
+            raise ValueError(f'{entry.word!r} has no slug')
+        slug = entry.slug.encode('utf-8')
+        word = entry.word.encode('utf-8')
+        body = json.dumps(entry.to_dict(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if len(slug) > 0xFFFF or len(word) > 0xFFFF:
+            raise ValueError(f'{entry.word!r}: slug or headword too long for the binary format')
+        self.records.append((slug, len(self.records), self.offset, len(slug), len(word), len(body)))
+        self.file.write(slug)
+        self.file.write(word)
+        self.file.write(body)
+        self.offset += len(slug) + len(word) + len(body)
+
+    def close(self):
+        """Write the sorted record table and the header. Returns the entry count."""
+        self.records.sort()
+        table_offset = self.offset
+        for _, ordinal, offset, slug_len, word_len, body_len in self.records:
+            self.file.write(RECORD.pack(ordinal, offset, slug_len, word_len, body_len))
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, BINARY_VERSION, 0, len(self.records), table_offset))
+        self.file.close()
+        return len(self.records)
+
+
+class BinaryDictionary:
+    """
+    Read-only view of a binary dictionary file. Positions are indexes into
+    the slug-sorted record table. Entries decode to the dicts of the JSON
+    output; headwords are zero-copy memoryview slices of the mapping, which
+    must be released before close().
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mm)
+        magic, version, _, self.count, self.table_offset = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{path}: not a binary dictionary file')
+        if version != BINARY_VERSION:
+            self.close()
+            raise ValueError(f'{path}: unsupported binary dictionary version {version}')
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Entries in slug order."""
+        for position in range(self.count):
+            yield self.entry_at(position)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmap and close the file."""
+        self.view.release()
+        self.mm.close()
+        self.file.close()
+
+    def record(self, position):
+        """(ordinal, offset, slug length, headword length, JSON length) at a position."""
+        return RECORD.unpack_from(self.mm, self.table_offset + position * RECORD.size)
+
+    def slug_bytes(self, position):
+        """UTF-8 slug at a position."""
+        _, offset, slug_len, _, _ = self.record(position)
+        return self.mm[offset:offset + slug_len]
+
+    def headword(self, position):
+        """UTF-8 headword at a position, as a memoryview into the mapping."""
+        _, offset, slug_len, word_len, _ = self.record(position)
+        start = offset + slug_len
+        return self.view[start:start + word_len]
+
+    def ordinal(self, position):
+        """Position of the entry at `position` in the converter output."""
+        return self.record(position)[0]
+
+    def entry_at(self, position):
+        """Decode the entry at a position."""
+        _, offset, slug_len, word_len, body_len = self.record(position)
+        start = offset + slug_len + word_len
+        return json.loads(self.mm[start:start + body_len])
+
+    def find(self, slug):
+        """
+        Position of `slug` by binary search over the table, or -1. Of
+        entries sharing a slug, the first in output order.
+        """
+        target = slug.encode('utf-8')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.slug_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self.slug_bytes(lo) == target:
+            return lo
+        return -1
+
+    def get(self, slug):
+        """The entry with this slug, or None."""
+        position = self.find(slug)
+        return self.entry_at(position) if position >= 0 else None
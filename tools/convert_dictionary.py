@@ -6,551 +6,437 @@ Handles: homonyms, sub-entries, inline examples, cross-references,
          all POS types, verb stems, dialect markers, usage labels.
 """
 
-import re
+import os
 import json
 import sys
+import time
+import signal
+import threading
+import sqlite3
+import hashlib
+import argparse
 from datetime import datetime, timezone
-from collections import Counter
-
-
-# --- Regex patterns ---
-
-# Section headers like -A-, -B-, etc.
-SECTION_HEADER_RE = re.compile(r'^-[A-Z]-\s*$')
-
-# Entry start: word (possibly with trailing digits for homonyms), followed by space
-# Handles regular words, hyphenated prefixes (-ce-, -bicil), and words with digits (abeit3)
-ENTRY_START_RE = re.compile(r'^-?[a-zA-Z][a-zA-Z\'-]*\d*\s')
-
-# Headword extraction: word + optional homonym number
-HEADWORD_RE = re.compile(r'^(-?[a-zA-Z][a-zA-Z\'-]*)(\d+)?\s')
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import dictionary_parser
+from dictionary_parser import (
+    Entry, iter_raw_entries, aggregate_entries, assign_slug, validate_entry,
+    resolve_slug_collisions, census_slugs, parse_size,
+)
+from profiling import (
+    StepProfiler, instrument_patterns, report_patterns,
+    instrument_functions, report_functions,
+)
+from output_files import sidecar_path, part_path, iter_ndjson_entries, iter_part_entries
+from search_index import SearchIndexBuilder, write_search_index
+from binary_dictionary import BinaryWriter
+from sqlite_export import SqliteExporter
+from sql_dump import SqlDumpWriter, DEFAULT_TABLE_PREFIX
+from cross_refs import RelationGraphBuilder, write_relations
+from wxr_export import WxrWriter
+from static_api import StaticApiWriter
+from autocomplete import AutocompleteBuilder, write_autocomplete, DEFAULT_TOP_K
+from morphology import MorphologyBuilder, write_morphology
+from facets import FacetBuilder, write_facets
+from word_of_the_day import (
+    WordOfTheDayBuilder, write_wotd, parse_date, DEFAULT_WOTD_DAYS, DEFAULT_WOTD_SEED,
+)
 
-# Plural form: (plural X) or (plural X Y)
-PLURAL_RE = re.compile(r'\(plural\s+([^)]+)\)')
 
-# Singular noun: (singular noun F/M)
-SINGULAR_NOUN_RE = re.compile(r'\(singular\s+noun\s+([FM]?)\)', re.IGNORECASE)
+# Number of raw entries sent to a worker process at a time in --jobs mode
+PARSE_CHUNK_SIZE = 500
 
-# Plural noun: (plural noun F/M)
-PLURAL_NOUN_RE = re.compile(r'\(plural\s+noun\s+([FM]?)\)', re.IGNORECASE)
+# Bytes kept free in each --split-bytes part for the metadata block
+PART_METADATA_RESERVE = 4096
 
-# Noun with gender: (noun F), (noun M), (noun neuter), (noun Dimin.), (noun neuter/Dimin.), (noun M/Dimin.)
-NOUN_RE = re.compile(
-    r'\(noun\s+(F|M|neuter|Dimin\.|neuter/Dimin\.|M/Dimin\.|F/Dimin\.)\)',
-    re.IGNORECASE
-)
+# Marker returned by ParseCache.get() when an entry has not been parsed before
+CACHE_MISS = object()
 
-# Collective noun
-COLLECTIVE_NOUN_RE = re.compile(r'\(collective\s+noun\s*([FM]?)\)', re.IGNORECASE)
+# Exit status when --entry-budget stopped any entry, so a build that left
+# entries out cannot pass for one with only the usual parse issues (1)
+EXIT_PARSE_TIMEOUT = 3
 
-# Verb types
-VERB_RE = re.compile(
-    r'\((transitive|intransitive|reflexive|causative|continuous|reciprocal)?\s*verb\)',
-    re.IGNORECASE
+# Functions of dictionary_parser timed individually by --profile
+PROFILED_FUNCTIONS = (
+    'parse_entry',
+    'extract_examples_from_text',
+    'extract_cross_refs',
 )
 
-# Other POS
-OTHER_POS_RE = re.compile(
-    r'\((adjective|adverb|preposition|conjunction|interjection|cardinal number|'
-    r'interrogation|personal pronoun|demonstrative|indefinite pronoun|'
-    r'prefix|suffix|infix|adjectival suffix|suffix, adjective|'
-    r'singular imperative|relative pronoun)\)',
-    re.IGNORECASE
-)
 
-# Dialect markers
-DIALECT_RE = re.compile(
-    r'\((Usuk|outside Usuk|Ateso Atororo|Serere)\)',
-    re.IGNORECASE
-)
+def iter_chunks(iterable, size):
+    """Yield successive lists of up to `size` items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
-# Usage labels
-USAGE_LABEL_RE = re.compile(
-    r'\((jocular|archaic|euphemism|disapprovingly|approvingly|figurative|'
-    r'literally|derogatory|biblical|formerly|an insult|Term of abuse)\)',
-    re.IGNORECASE
-)
 
-# Verb stem patterns: ko-a, ko-o, ki-a, ki-o (appearing after the headword)
-VERB_STEM_RE = re.compile(r'\b(ko-[ao]|ki-[ao])\b')
+class ParseTimeout(Exception):
+    """An entry that ran past its parse budget. Returned in place of its Entry."""
 
-# Cross-reference: cp. word1, word2; or cp. word1. Handle end of string too.
-CP_REF_RE = re.compile(r'cp\.\s+([^.;]+?)(?:\.|;|$)')
-
-# Example pattern: ateso_phrase: english_translation
-# Examples typically have an Ateso phrase followed by colon and English
-# We look for patterns like "word phrase: translation" within definition text
-EXAMPLE_RE = re.compile(
-    r'([a-zA-Z][a-zA-Z\s\'-]+?)\s*:\s*([^;:.]+(?:\([^)]*\))?[^;:.]*)',
-)
 
+class ParseBudget:
+    """
+    Stops parse_entry() on entries that take longer than `seconds`. One
+    SIGALRM interval timer covers the whole run instead of one timer per
+    entry: it ticks every half budget and interrupts the entry being parsed
+    once that entry is over budget, so an entry is stopped within 1.5 times
+    the budget. Without a budget, SIGALRM timers or the main thread, entries
+    are parsed unbounded.
+    """
 
-def normalize_gender(raw):
-    """Normalize gender string to F, M, or N/A."""
-    if not raw:
-        return None
-    raw = raw.strip().upper()
-    if raw == 'F':
-        return 'F'
-    if raw == 'M':
-        return 'M'
-    if raw in ('NEUTER', 'N/A', 'DIMIN.', 'NEUTER/DIMIN.', 'M/DIMIN.', 'F/DIMIN.'):
-        return 'N/A'
-    return None
-
-
-def normalize_pos(raw):
-    """Normalize part of speech to a standard category."""
-    raw_lower = raw.strip().lower()
-    if 'noun' in raw_lower:
-        return 'noun'
-    # Check adverb BEFORE verb since 'adverb' contains 'verb'
-    if 'adverb' in raw_lower:
-        return 'adverb'
-    if 'verb' in raw_lower:
-        return 'verb'
-    if 'adjective' in raw_lower or 'adjectival' in raw_lower:
-        return 'adjective'
-    if 'preposition' in raw_lower:
-        return 'preposition'
-    if 'conjunction' in raw_lower:
-        return 'conjunction'
-    if 'interjection' in raw_lower:
-        return 'interjection'
-    if 'cardinal number' in raw_lower:
-        return 'cardinal number'
-    if 'pronoun' in raw_lower:
-        return 'pronoun'
-    if 'prefix' in raw_lower or 'suffix' in raw_lower or 'infix' in raw_lower:
-        return 'affix'
-    if 'interrogation' in raw_lower:
-        return 'interrogation'
-    if 'imperative' in raw_lower:
-        return 'other'
-    return 'other'
-
-
-def extract_examples_from_text(text, headword):
+    def __init__(self, seconds=None):
+        enforceable = hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+        self.seconds = seconds if enforceable else None
+        self.started = None
+        self.previous = None
+
+    def __enter__(self):
+        if self.seconds:
+            self.previous = signal.signal(signal.SIGALRM, self.alarm)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds / 2, self.seconds / 2)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.seconds:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self.previous)
+
+    def alarm(self, signum, frame):
+        """SIGALRM handler: interrupt the entry being parsed if it is over budget."""
+        if self.started is not None and time.perf_counter() - self.started > self.seconds:
+            self.started = None
+            raise ParseTimeout()
+
+    def parse(self, raw_text, line_num):
+        """parse_entry(), or a ParseTimeout if the entry ran past the budget."""
+        if not self.seconds:
+            return dictionary_parser.parse_entry(raw_text, line_num)
+        entry = None
+        self.started = time.perf_counter()
+        try:
+            try:
+                entry = dictionary_parser.parse_entry(raw_text, line_num)
+            finally:
+                # Disarm first: an alarm from here on leaves the entry alone
+                self.started = None
+        except ParseTimeout as timeout:
+            # An alarm that lands after parse_entry() returned is late; the
+            # entry made its budget
+            if entry is None:
+                return timeout
+        return entry
+
+
+def parse_chunk(chunk, budget=None):
+    """Parse a list of (raw_text, line_number) tuples. Runs in worker processes."""
+    with ParseBudget(budget) as parser:
+        return [parser.parse(raw_text, line_num) for raw_text, line_num in chunk]
+
+
+class ParseCache:
     """
-    Extract inline examples from definition text.
-    Examples are typically: ateso_phrase: english_translation
-    Returns (cleaned_text, examples_list).
+    Persistent on-disk cache of parse_entry results, keyed by a hash of each
+    aggregated raw entry. Also remembers the slug hashes of the last imported
+    build so the next run can report which entries were added, changed or
+    removed since. The latest build only becomes that baseline once it is
+    acknowledged with --ack-delta, so deltas stay cumulative until then.
+    The cache is dropped whenever this converter's source changes, and
+    prune() drops the entries a finished run no longer looked up.
     """
-    examples = []
-
-    # Strategy: look for patterns where a known Ateso phrase (often starting with
-    # headword or a conjugated form) is followed by a colon and English translation.
-    # Common patterns:
-    #   headword phrase: english meaning
-    #   conjugated_form phrase: translation
-    # We need to be careful not to match parts of speech annotations or
-    # definition structures that use colons.
-
-    # Split by periods to find potential example sentences
-    # An example sentence typically contains a colon separating Ateso from English
-    parts = text.split('. ')
-    cleaned_parts = []
-
-    for part in parts:
-        part = part.strip()
-        if not part:
-            continue
 
-        # Check if this part looks like an example (contains : with Ateso words on left)
-        colon_idx = part.find(':')
-        if colon_idx > 0 and colon_idx < len(part) - 1:
-            left = part[:colon_idx].strip()
-            right = part[colon_idx + 1:].strip()
-
-            # Heuristic: the left side should contain at least 2 words and
-            # not be a pure metadata marker. It should look like an Ateso phrase.
-            left_words = left.split()
-
-            # Skip if left side is a single known metadata word
-            skip_markers = {
-                'cp', 'plural', 'noun', 'verb', 'adjective', 'adverb',
-                'literally', 'figurative', 'i.e', 'e.g', 'i.e.',
-                'Conjugation', 'Imperative', '1st', '2nd', '3rd',
-                'a)', 'b)', 'c)', 'd)', 'e)', 'f)',
-            }
-
-            is_example = (
-                len(left_words) >= 2
-                and left_words[0].lower() not in skip_markers
-                and not left.startswith('(')
-                and not re.match(r'^[a-f]\)', left)
-                and not re.match(r'^\d+(st|nd|rd|th)', left)
-                # The right side should look like English (contains spaces, common words)
-                and len(right.split()) >= 1
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.pending = []
+        # Keys looked up or stored by this run, not yet written to the seen table
+        self.seen = []
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('CREATE TEMP TABLE seen (hash TEXT PRIMARY KEY)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS parsed (hash TEXT PRIMARY KEY, entry TEXT)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS build_slugs (slug TEXT PRIMARY KEY, hash TEXT)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS pending_slugs (slug TEXT PRIMARY KEY, hash TEXT)')
+
+        fingerprint = parser_fingerprint()
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'parser'").fetchone()
+        if row is None or row[0] != fingerprint:
+            self.conn.execute('DELETE FROM parsed')
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('parser', ?)", (fingerprint,)
             )
 
-            if is_example:
-                # Clean up the example
-                ateso = left.strip().rstrip(',').strip()
-                english = right.strip().rstrip('.').strip()
-                if ateso and english:
-                    examples.append({
-                        'ateso': ateso,
-                        'english': english
-                    })
-                continue
-
-        cleaned_parts.append(part)
-
-    cleaned_text = '. '.join(cleaned_parts)
-    if cleaned_text and not cleaned_text.endswith('.'):
-        cleaned_text += '.'
-
-    return cleaned_text, examples
-
-
-def extract_cross_refs(text):
-    """Extract cross-references from text. Returns (cleaned_text, refs_list)."""
-    refs = []
-
-    def collect_ref(match):
-        ref_text = match.group(1).strip()
-        # Split by comma or semicolon for multiple refs
-        for ref in re.split(r'[,;]', ref_text):
-            ref = ref.strip()
-            if ref:
-                # Clean: remove trailing periods, parentheses content
-                ref = re.sub(r'\s*\(.*?\)\s*', '', ref).strip().rstrip('.')
-                if ref and len(ref) < 100:  # sanity check
-                    refs.append(ref)
-        return ''
-
-    cleaned = CP_REF_RE.sub(collect_ref, text)
-    return cleaned.strip(), refs
-
-
-def parse_entry(raw_text, line_number=0):
+    @staticmethod
+    def key(raw_text):
+        """Content hash of an aggregated raw entry."""
+        return hashlib.sha1(raw_text.encode('utf-8')).hexdigest()
+
+    def get(self, key, line_num):
+        """Return the cached Entry for a key (with its line refreshed) or CACHE_MISS."""
+        row = self.conn.execute('SELECT entry FROM parsed WHERE hash = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return CACHE_MISS
+        self.hits += 1
+        self.mark_seen(key)
+        data = json.loads(row[0])
+        return Entry.from_dict(data, line_num) if data is not None else None
+
+    def put(self, key, entry):
+        """Store a freshly parsed entry (or None for an unparseable one)."""
+        data = entry.to_dict() if entry is not None else None
+        self.pending.append((key, json.dumps(data, ensure_ascii=False)))
+        self.mark_seen(key)
+        if len(self.pending) >= PARSE_CHUNK_SIZE:
+            self.flush()
+
+    def mark_seen(self, key):
+        """Remember that this run used a key, so prune() keeps its entry."""
+        self.seen.append((key,))
+        if len(self.seen) >= PARSE_CHUNK_SIZE:
+            self.conn.executemany('INSERT OR IGNORE INTO seen (hash) VALUES (?)', self.seen)
+            self.seen = []
+
+    def flush(self):
+        """Write pending entries to disk."""
+        if self.pending:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO parsed (hash, entry) VALUES (?, ?)', self.pending
+            )
+            self.pending = []
+        if self.seen:
+            self.conn.executemany('INSERT OR IGNORE INTO seen (hash) VALUES (?)', self.seen)
+            self.seen = []
+        self.conn.commit()
+
+    def prune(self):
+        """
+        Drop the cached entries this run did not look up, such as the old
+        versions of edited entries. Only call it once every raw entry of
+        the source has been looked up. Returns the number dropped.
+        """
+        self.flush()
+        dropped = self.conn.execute('DELETE FROM parsed WHERE hash NOT IN (SELECT hash FROM seen)').rowcount
+        self.conn.commit()
+        return dropped
+
+    def previous_slugs(self):
+        """Slug -> content hash map of the last acknowledged build."""
+        return dict(self.conn.execute('SELECT slug, hash FROM build_slugs'))
+
+    def save_slugs(self, slug_hashes):
+        """Record the slug -> content hash map of this build, pending acknowledgement."""
+        self.conn.execute('DELETE FROM pending_slugs')
+        self.conn.executemany(
+            'INSERT INTO pending_slugs (slug, hash) VALUES (?, ?)', slug_hashes.items()
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('pending', '1')"
+        )
+        self.conn.commit()
+
+    def acknowledge(self):
+        """
+        Make the latest build the baseline for the next delta, once its output
+        has been imported. Returns the number of slugs recorded, or None if
+        no build is waiting to be acknowledged.
+        """
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'pending'").fetchone()
+        if row is None:
+            return None
+        self.conn.execute('DELETE FROM build_slugs')
+        self.conn.execute('INSERT INTO build_slugs SELECT slug, hash FROM pending_slugs')
+        self.conn.execute('DELETE FROM pending_slugs')
+        self.conn.execute("DELETE FROM meta WHERE key = 'pending'")
+        self.conn.commit()
+        return self.conn.execute('SELECT COUNT(*) FROM build_slugs').fetchone()[0]
+
+    def close(self):
+        """Flush and close the cache database."""
+        self.flush()
+        self.conn.close()
+
+
+def parser_fingerprint():
+    """Hash of the parser's source, so cached results never outlive a parser change."""
+    with open(os.path.abspath(dictionary_parser.__file__), 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def lookup_chunk(chunk, cache):
+    """Look a chunk up in the cache. Returns (keys, results) with CACHE_MISS holes."""
+    if cache is None:
+        return None, [CACHE_MISS] * len(chunk)
+    keys = [cache.key(raw_text) for raw_text, _ in chunk]
+    results = [cache.get(key, line_num) for key, (_, line_num) in zip(keys, chunk)]
+    return keys, results
+
+
+def fill_chunk(chunk, keys, results, parsed, cache):
     """
-    Parse a single dictionary entry and extract all structured fields.
-    Returns a dict or None if parsing fails.
+    Fill the CACHE_MISS holes of a chunk from freshly parsed entries, in
+    order. Timed-out entries are not cached, so the next build retries them.
     """
-    text = raw_text.strip()
-    if not text:
-        return None
-
-    entry = {
-        'word': '',
-        'homonym_number': None,
-        'plural': None,
-        'pos': '',
-        'pos_detail': None,
-        'gender': None,
-        'dialect': None,
-        'verb_stem': None,
-        'usage_labels': [],
-        'letter': '',
-        'definitions': [],
-        'examples': [],
-        'sub_entries': [],
-        '_line': line_number,
-    }
-
-    # --- Extract headword and homonym number ---
-    hw_match = HEADWORD_RE.match(text)
-    if not hw_match:
-        return None
-
-    entry['word'] = hw_match.group(1).strip()
-    if hw_match.group(2):
-        entry['homonym_number'] = int(hw_match.group(2))
-
-    # Derive letter (first alphabetic character, uppercase)
-    first_alpha = ''
-    for ch in entry['word']:
-        if ch.isalpha():
-            first_alpha = ch.upper()
-            break
-    entry['letter'] = first_alpha if first_alpha else ''
-
-    # Remove headword + homonym from working text
-    working = text[hw_match.end():].strip()
-
-    # --- Extract plural form ---
-    plural_match = PLURAL_RE.search(working)
-    if plural_match:
-        entry['plural'] = plural_match.group(1).strip()
-        working = working[:plural_match.start()] + working[plural_match.end():]
-        working = working.strip()
-
-    # --- Extract part of speech ---
-    pos_found = False
-
-    # Check noun patterns (most specific first)
-    for pattern, pos_label in [
-        (SINGULAR_NOUN_RE, 'singular noun'),
-        (PLURAL_NOUN_RE, 'plural noun'),
-        (COLLECTIVE_NOUN_RE, 'collective noun'),
-        (NOUN_RE, 'noun'),
-    ]:
-        m = pattern.search(working)
-        if m:
-            gender_raw = m.group(1) if m.lastindex and m.group(1) else None
-            entry['pos'] = 'noun'
-            entry['pos_detail'] = pos_label
-            entry['gender'] = normalize_gender(gender_raw)
-            working = working[:m.start()] + working[m.end():]
-            working = working.strip()
-            pos_found = True
-            break
-
-    if not pos_found:
-        # Check verb patterns
-        verb_match = VERB_RE.search(working)
-        if verb_match:
-            verb_type = verb_match.group(1) or ''
-            entry['pos'] = 'verb'
-            entry['pos_detail'] = (verb_type.lower() + ' verb').strip() if verb_type else 'verb'
-            working = working[:verb_match.start()] + working[verb_match.end():]
-            working = working.strip()
-            pos_found = True
-
-            # Check for a second verb type in the same entry
-            verb_match2 = VERB_RE.search(working)
-            if verb_match2:
-                verb_type2 = verb_match2.group(1) or ''
-                if verb_type2:
-                    entry['pos_detail'] += ' / ' + verb_type2.lower() + ' verb'
-                working = working[:verb_match2.start()] + working[verb_match2.end():]
-                working = working.strip()
-
-    if not pos_found:
-        # Check other POS
-        other_match = OTHER_POS_RE.search(working)
-        if other_match:
-            raw_pos = other_match.group(1).strip()
-            entry['pos'] = normalize_pos(raw_pos)
-            entry['pos_detail'] = raw_pos.lower()
-            working = working[:other_match.start()] + working[other_match.end():]
-            working = working.strip()
-            pos_found = True
-
-    # --- Extract dialect ---
-    dialect_match = DIALECT_RE.search(working)
-    if dialect_match:
-        entry['dialect'] = dialect_match.group(1).strip()
-        working = working[:dialect_match.start()] + working[dialect_match.end():]
-        working = working.strip()
-
-    # --- Extract usage labels ---
-    for label_match in USAGE_LABEL_RE.finditer(working):
-        entry['usage_labels'].append(label_match.group(1).strip().lower())
-    working = USAGE_LABEL_RE.sub('', working).strip()
-
-    # --- Extract verb stem ---
-    stem_match = VERB_STEM_RE.search(text[:80])  # Only check near the start
-    if stem_match:
-        entry['verb_stem'] = stem_match.group(1)
-        # Remove verb stem from working text (only first occurrence near start)
-        stem_pos = working.find(stem_match.group(1))
-        if stem_pos != -1 and stem_pos < 30:
-            working = working[:stem_pos] + working[stem_pos + len(stem_match.group(1)):]
-            working = working.strip()
-
-    # --- Extract cross-references ---
-    working, cp_refs_global = extract_cross_refs(working)
-
-    # --- Extract examples ---
-    working, examples = extract_examples_from_text(working, entry['word'])
-    entry['examples'] = examples
-
-    # --- Clean up and extract definitions ---
-    # Remove leftover empty parentheses and extra whitespace
-    working = re.sub(r'\(\s*\)', '', working)
-    working = re.sub(r'\s{2,}', ' ', working).strip()
-    # Remove leading/trailing punctuation artifacts
-    working = working.strip('; .')
-    working = working.strip()
-
-    if working:
-        # Split by semicolons for multiple definitions
-        raw_defs = [d.strip() for d in working.split(';') if d.strip()]
-
-        for i, d in enumerate(raw_defs):
-            # Check each definition for its own cp refs
-            d_clean, d_refs = extract_cross_refs(d)
-            d_clean = d_clean.strip().rstrip('.').strip()
-
-            if not d_clean:
-                continue
-
-            def_obj = {
-                'text': d_clean,
-                'cp_refs': d_refs if d_refs else []
-            }
-            entry['definitions'].append(def_obj)
-
-        # Attach global cp_refs to the last definition (or first if only one)
-        if cp_refs_global and entry['definitions']:
-            entry['definitions'][-1]['cp_refs'].extend(cp_refs_global)
-        elif cp_refs_global and not entry['definitions']:
-            # No definitions but has cp_refs - create a placeholder
-            entry['definitions'].append({
-                'text': '',
-                'cp_refs': cp_refs_global
-            })
-
-    # Deduplicate cp_refs
-    for d in entry['definitions']:
-        d['cp_refs'] = list(dict.fromkeys(d['cp_refs']))
+    parsed = iter(parsed)
+    for i, (raw_text, line_num) in enumerate(chunk):
+        entry = results[i]
+        if entry is CACHE_MISS:
+            entry = next(parsed)
+            if cache is not None and not isinstance(entry, ParseTimeout):
+                cache.put(keys[i], entry)
+        yield raw_text, line_num, entry
 
-    return entry
 
-
-def aggregate_entries(filepath):
+def iter_parse_results(raw_entries, jobs=1, chunk_size=PARSE_CHUNK_SIZE, cache=None, budget=None):
     """
-    Read the dictionary file and aggregate multi-line entries.
-    Returns a list of (raw_text, line_number) tuples.
+    Run parse_entry over raw entries, optionally in a pool of `jobs` processes.
+    Yields (raw_text, line_number, entry_or_None) in source order, with a
+    ParseTimeout for entries that ran past `budget` seconds. Only a
+    bounded number of chunks is in flight at once, so streaming stays flat.
+    With a ParseCache, only entries whose raw text changed are parsed.
     """
-    entries = []
-    current_entry = ''
-    current_line = 0
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            stripped = line.strip()
-
-            # Skip blank lines and section headers
-            if not stripped or SECTION_HEADER_RE.match(stripped):
-                if current_entry:
-                    entries.append((current_entry.strip(), current_line))
-                    current_entry = ''
+    if jobs <= 1:
+        with ParseBudget(budget) as parser:
+            for raw_text, line_num in raw_entries:
+                if cache is None:
+                    yield raw_text, line_num, parser.parse(raw_text, line_num)
+                    continue
+                key = cache.key(raw_text)
+                entry = cache.get(key, line_num)
+                if entry is CACHE_MISS:
+                    entry = parser.parse(raw_text, line_num)
+                    if not isinstance(entry, ParseTimeout):
+                        cache.put(key, entry)
+                yield raw_text, line_num, entry
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for chunk in iter_chunks(raw_entries, chunk_size):
+            keys, results = lookup_chunk(chunk, cache)
+            misses = [raw for raw, res in zip(chunk, results) if res is CACHE_MISS]
+            future = pool.submit(parse_chunk, misses, budget) if misses else None
+            pending.append((chunk, keys, results, future))
+            if len(pending) < jobs * 2:
                 continue
+            done_chunk, keys, results, future = pending.popleft()
+            parsed = future.result() if future else ()
+            yield from fill_chunk(done_chunk, keys, results, parsed, cache)
 
-            # Does this line look like a new entry start?
-            if ENTRY_START_RE.match(stripped):
-                # Save the previous entry if any
-                if current_entry:
-                    entries.append((current_entry.strip(), current_line))
-                current_entry = stripped
-                current_line = line_num
-            else:
-                # Continuation line
-                if current_entry:
-                    current_entry += ' ' + stripped
-                else:
-                    # Orphan continuation line — start as new entry
-                    current_entry = stripped
-                    current_line = line_num
-
-    # Don't forget the last entry
-    if current_entry:
-        entries.append((current_entry.strip(), current_line))
-
-    return entries
-
-
-def generate_slug(word, homonym_number):
-    """Generate a URL-safe slug from a word and optional homonym number."""
-    # Replace non-alphanumeric with hyphens
-    slug = re.sub(r'[^a-z0-9]+', '-', word.lower())
-    slug = slug.strip('-')
-    if homonym_number:
-        slug += f'-{homonym_number}'
-    return slug
-
-
-def validate_entry(entry):
-    """Validate a parsed entry for completeness. Returns list of issues."""
-    issues = []
-    if not entry['word']:
-        issues.append('Missing word')
-    if not entry['letter']:
-        issues.append('Missing letter')
-    if not entry['pos'] and not entry['definitions']:
-        issues.append('No POS and no definitions')
-    return issues
-
-
-def main():
-    """Main conversion function."""
-    input_file = '../ateso_dict.txt'
-    output_file = '../ateso-dictionary-data.json'
-
-    # Allow command-line override
-    if len(sys.argv) > 1:
-        input_file = sys.argv[1]
-    if len(sys.argv) > 2:
-        output_file = sys.argv[2]
+        while pending:
+            done_chunk, keys, results, future = pending.popleft()
+            parsed = future.result() if future else ()
+            yield from fill_chunk(done_chunk, keys, results, parsed, cache)
 
-    print(f'Reading {input_file}...')
 
-    # Step 1: Aggregate multi-line entries
-    raw_entries = aggregate_entries(input_file)
-    print(f'Aggregated {len(raw_entries)} raw entries')
+def iter_parsed_entries(raw_entries, failed, slug_changes=None, jobs=1, cache=None, budget=None):
+    """
+    Parse, slug and validate raw entries lazily.
+    Problems are appended to `failed`. Entries whose line is in `slug_changes`
+    (line -> (homonym_number, slug), from census_slugs) take that slug.
+    With jobs > 1, parsing is spread over a process pool; order is preserved.
+    Entries that take longer than `budget` seconds to parse are reported in
+    `failed` and left out.
+    """
+    for raw_text, line_num, entry in iter_parse_results(raw_entries, jobs, cache=cache, budget=budget):
+        if isinstance(entry, ParseTimeout):
+            failed.append({
+                'line': line_num,
+                'text': raw_text[:120],
+                'issues': [f'Parse exceeded the {budget:g}s entry budget ({len(raw_text):,} characters)'],
+                'timed_out': True,
+            })
+            continue
 
-    # Step 2: Parse each entry
-    parsed = []
-    failed = []
-    for raw_text, line_num in raw_entries:
-        entry = parse_entry(raw_text, line_num)
-        if entry:
-            # Generate slug
-            entry['slug'] = generate_slug(entry['word'], entry['homonym_number'])
-            # Validate
-            issues = validate_entry(entry)
-            if issues:
-                failed.append({
-                    'line': line_num,
-                    'text': raw_text[:120],
-                    'issues': issues
-                })
-            parsed.append(entry)
-        else:
+        if not entry:
             failed.append({
                 'line': line_num,
                 'text': raw_text[:120],
                 'issues': ['Failed to parse headword']
             })
+            continue
 
-    print(f'Successfully parsed {len(parsed)} entries')
-    if failed:
-        print(f'Entries with issues: {len(failed)}')
+        # Generate slug
+        assign_slug(entry, slug_changes)
 
-    # Step 3: Detect slug collisions and resolve
-    slug_counts = Counter(e['slug'] for e in parsed)
-    collisions = {s: c for s, c in slug_counts.items() if c > 1}
-    if collisions:
-        print(f'Slug collisions detected: {len(collisions)}')
-        # For collisions without homonym numbers, assign them
-        for slug, count in collisions.items():
-            matching = [e for e in parsed if e['slug'] == slug]
-            # Only auto-fix if none have homonym numbers
-            if all(e['homonym_number'] is None for e in matching):
-                for i, e in enumerate(matching, 1):
-                    e['homonym_number'] = i
-                    e['slug'] = generate_slug(e['word'], i)
+        # Validate
+        issues = validate_entry(entry)
+        if issues:
+            failed.append({
+                'line': line_num,
+                'text': raw_text[:120],
+                'issues': issues
+            })
+        yield entry
+
+
+class EntryStats:
+    """Accumulates output statistics one entry at a time."""
+
+    def __init__(self):
+        self.total_entries = 0
+        self.total_definitions = 0
+        self.total_examples = 0
+        self.entries_with_definitions = 0
+        self.entries_with_examples = 0
+        self.entries_with_cross_refs = 0
+        self.pos_counts = Counter()
+        self.letter_counts = Counter()
+        self.dialect_counts = Counter()
+
+    def add(self, entry):
+        """Count a single parsed entry."""
+        self.total_entries += 1
+        self.total_definitions += len(entry.definitions)
+        self.total_examples += len(entry.examples)
+        if entry.definitions:
+            self.entries_with_definitions += 1
+        if entry.examples:
+            self.entries_with_examples += 1
+        if any(d.cp_refs for d in entry.definitions):
+            self.entries_with_cross_refs += 1
+        self.pos_counts[entry.pos] += 1
+        self.letter_counts[entry.letter] += 1
+        if entry.dialect:
+            self.dialect_counts[entry.dialect] += 1
+
+    def as_dict(self, entries_with_issues):
+        """Return the stats block written to metadata.stats."""
+        return {
+            'total_entries': self.total_entries,
+            'total_definitions': self.total_definitions,
+            'total_examples': self.total_examples,
+            'entries_with_definitions': self.entries_with_definitions,
+            'entries_with_examples': self.entries_with_examples,
+            'entries_with_cross_refs': self.entries_with_cross_refs,
+            'entries_with_issues': entries_with_issues,
+            'by_pos': dict(self.pos_counts.most_common()),
+            'by_letter': dict(sorted(self.letter_counts.items())),
+            'by_dialect': dict(self.dialect_counts.most_common()),
+        }
+
+
+def exit_status(failed):
+    """
+    Exit status of a conversion: 0 when clean, 1 with parse issues, and
+    EXIT_PARSE_TIMEOUT, with a count on stderr, when entries were left out
+    for running past --entry-budget.
+    """
+    timeouts = sum(1 for f in failed if f.get('timed_out'))
+    if timeouts:
+        print(f'{timeouts} entries ran past the --entry-budget and were left out', file=sys.stderr)
+        return EXIT_PARSE_TIMEOUT
+    return 1 if failed else 0
 
-    # Step 4: Generate statistics
-    pos_counts = Counter(e['pos'] for e in parsed)
-    letter_counts = Counter(e['letter'] for e in parsed)
-    dialect_counts = Counter(e['dialect'] for e in parsed if e['dialect'])
-    entries_with_examples = sum(1 for e in parsed if e['examples'])
-    entries_with_defs = sum(1 for e in parsed if e['definitions'])
-    entries_with_cp = sum(
-        1 for e in parsed
-        if any(d['cp_refs'] for d in e['definitions'])
-    )
-    total_definitions = sum(len(e['definitions']) for e in parsed)
-    total_examples = sum(len(e['examples']) for e in parsed)
-
-    stats = {
-        'total_entries': len(parsed),
-        'total_definitions': total_definitions,
-        'total_examples': total_examples,
-        'entries_with_definitions': entries_with_defs,
-        'entries_with_examples': entries_with_examples,
-        'entries_with_cross_refs': entries_with_cp,
-        'entries_with_issues': len(failed),
-        'by_pos': dict(pos_counts.most_common()),
-        'by_letter': dict(sorted(letter_counts.items())),
-        'by_dialect': dict(dialect_counts.most_common()),
-    }
 
+def print_stats(stats, failed):
+    """Print the statistics summary and the first entries with issues."""
     print('\n--- Statistics ---')
     print(f'Total entries: {stats["total_entries"]}')
     print(f'Total definitions: {stats["total_definitions"]}')
@@ -559,13 +445,13 @@ def main():
     print(f'Entries with examples: {stats["entries_with_examples"]}')
     print(f'Entries with cross-refs: {stats["entries_with_cross_refs"]}')
     print(f'\nBy POS:')
-    for pos, count in pos_counts.most_common():
+    for pos, count in stats['by_pos'].items():
         print(f'  {pos or "(none)"}: {count}')
     print(f'\nBy letter:')
-    for letter, count in sorted(letter_counts.items()):
+    for letter, count in stats['by_letter'].items():
         print(f'  {letter}: {count}')
     print(f'\nBy dialect:')
-    for dialect, count in dialect_counts.most_common():
+    for dialect, count in stats['by_dialect'].items():
         print(f'  {dialect}: {count}')
 
     if failed:
@@ -574,29 +460,736 @@ def main():
             print(f'  Line {f_entry["line"]}: {f_entry["issues"]}')
             print(f'    Text: {f_entry["text"]}')
 
-    # Step 5: Build output
-    # Remove internal _line field before output
-    for e in parsed:
-        e.pop('_line', None)
 
+def build_metadata(stats):
+    """Build the metadata block shared by the JSON and NDJSON outputs."""
+    return {
+        'source': 'ateso_dict.txt',
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'stats': stats,
+    }
+
+
+def serialize_entry(entry):
+    """
+    An Entry as it appears in the JSON output: indent=2 at the depth of the
+    entries array.
+    """
+    return '    ' + json.dumps(entry.to_dict(), ensure_ascii=False, indent=2).replace('\n', '\n    ')
+
+
+def iter_parts(entries, max_entries=None, max_bytes=None):
+    """
+    Group entries into parts of at most `max_entries` entries and roughly
+    `max_bytes` bytes. Yields lists of (entry, serialized text). An entry
+    larger than `max_bytes` on its own still gets a part.
+    """
+    budget = max_bytes - PART_METADATA_RESERVE if max_bytes else None
+    part = []
+    size = 0
+    for entry in entries:
+        text = serialize_entry(entry)
+        length = len(text.encode('utf-8')) + 2 if budget else 0
+        if part and ((max_entries and len(part) >= max_entries)
+                     or (budget and size + length > budget)):
+            yield part
+            part = []
+            size = 0
+        part.append((entry, text))
+        size += length
+    if part:
+        yield part
+
+
+def write_json_document(path, metadata, texts):
+    """
+    Write {"metadata": ..., "entries": [...]} from already serialized entries.
+    The layout matches json.dump(..., indent=2), but entries are written one
+    at a time instead of being converted to dicts all at once.
+    Returns the file size.
+    """
+    meta = json.dumps(metadata, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n  "metadata": ')
+        f.write(meta)
+        f.write(',\n  "entries": [')
+        separator = '\n'
+        for text in texts:
+            f.write(separator)
+            f.write(text)
+            separator = ',\n'
+        f.write('\n  ]\n}' if separator != '\n' else ']\n}')
+    return os.path.getsize(path)
+
+
+def write_json_parts(entries, output_file, failed, max_entries=None, max_bytes=None):
+    """
+    Write the output as numbered part files plus a manifest listing them.
+    Every part carries metadata.stats for its own entries and metadata.part
+    with its index; `failed` is read as entries arrive so it may still be
+    growing (streaming mode). Returns the EntryStats of all entries written.
+    """
+    total_stats = EntryStats()
+    manifest_parts = []
+    issue_lines = set()
+    seen_failures = 0
+
+    for index, part in enumerate(iter_parts(entries, max_entries, max_bytes), 1):
+        # Entries in this part have all been validated by now; only the
+        # failures added since the previous part are new
+        issue_lines.update(f['line'] for f in failed[seen_failures:])
+        seen_failures = len(failed)
+        part_stats = EntryStats()
+        with_issues = 0
+        for entry, _ in part:
+            part_stats.add(entry)
+            total_stats.add(entry)
+            with_issues += entry.line in issue_lines
+
+        metadata = build_metadata(part_stats.as_dict(with_issues))
+        metadata['part'] = {'index': index, 'entries': len(part)}
+        path = part_path(output_file, index)
+        size = write_json_document(path, metadata, (text for _, text in part))
+        manifest_parts.append({
+            'index': index,
+            'file': os.path.basename(path),
+            'entries': len(part),
+            'bytes': size,
+            'first_slug': part[0][0].slug,
+            'last_slug': part[-1][0].slug,
+        })
+        print(f'  {path}: {len(part)} entries, {size:,} bytes')
+
+    manifest_file = sidecar_path(output_file, '.manifest.json')
+    manifest = {
+        'metadata': build_metadata(total_stats.as_dict(len(failed))),
+        'split': {'max_entries': max_entries, 'max_bytes': max_bytes},
+        'parts': manifest_parts,
+    }
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f'Wrote {len(manifest_parts)} parts, manifest {manifest_file}')
+    return total_stats
+
+
+def save_search_index(builder, output_file):
+    """Write the search index next to the output, e.g. data.json -> data.index.json."""
+    index_file = sidecar_path(output_file, '.index.json')
+    index = write_search_index(builder, index_file)
+    print(f'Search index: {len(index["headwords"])} headwords, {len(index["tokens"])} '
+          f'definition tokens, {len(index["trigrams"])} trigrams -> {index_file} '
+          f'({os.path.getsize(index_file):,} bytes)')
+
+
+def save_relations(builder, output_file):
+    """Write the relation graph next to the output, e.g. data.json -> data.relations.json."""
+    relations_file = sidecar_path(output_file, '.relations.json')
+    stats = write_relations(builder, relations_file)['stats']
+    by_match = ', '.join(f'{count} by {kind}' for kind, count in stats['by_match'].items())
+    print(f'Cross-references: {stats["resolved"]} of {stats["references"]} resolved ({by_match}), '
+          f'{stats["unresolved"]} unresolved -> {relations_file}')
+
+
+def save_facets(builder, output_file):
+    """Write the facet tables next to the output, e.g. data.json -> data.facets.json."""
+    facets_file = sidecar_path(output_file, '.facets.json')
+    facets = write_facets(builder, facets_file)
+    print(f'Facets: {len(facets["letters"])} letters, {len(facets["pos"])} parts of speech, '
+          f'{len(facets["dialects"])} dialects -> {facets_file}')
+
+
+def save_wotd(builder, output_file, wotd):
+    """Write the Word of the Day schedule next to the output, e.g. data.json -> data.wotd.json."""
+    wotd_file = sidecar_path(output_file, '.wotd.json')
+    schedule = write_wotd(builder, wotd_file, wotd['days'], wotd['start'])
+    print(f'Word of the Day: {schedule["days"]} days from {schedule["start"]} out of '
+          f'{schedule["eligible_entries"]} eligible entries -> {wotd_file}')
+    return schedule
+
+
+def save_autocomplete(builder, output_file):
+    """Write the autocomplete trie next to the output, e.g. data.json -> data.autocomplete.json."""
+    autocomplete_file = sidecar_path(output_file, '.autocomplete.json')
+    trie = write_autocomplete(builder, autocomplete_file)
+    print(f'Autocomplete: {trie["keys"]} keys, {len(trie["targets"])} completions, '
+          f'{len(trie["nodes"])} nodes, top {trie["top_k"]} -> {autocomplete_file} '
+          f'({os.path.getsize(autocomplete_file):,} bytes)')
+
+
+def save_morphology(builder, output_file):
+    """Write the morphology index next to the output, e.g. data.json -> data.morphology.json."""
+    morphology_file = sidecar_path(output_file, '.morphology.json')
+    morphology = write_morphology(builder, morphology_file)
+    by_kind = ', '.join(f'{count} {kind}' for kind, count in morphology['by_kind'].items())
+    print(f'Morphology: {len(morphology["forms"])} forms ({by_kind}) -> {morphology_file} '
+          f'({os.path.getsize(morphology_file):,} bytes)')
+
+
+def save_binary(writer):
+    """Finish the binary export started with a BinaryWriter."""
+    count = writer.close()
+    print(f'Binary dictionary: {count} entries -> {writer.path} '
+          f'({os.path.getsize(writer.path):,} bytes)')
+
+
+def save_sqlite(exporter):
+    """Finish the SQLite export started with a SqliteExporter."""
+    counts = exporter.close()
+    print(f'SQLite database: {counts["dict_terms"]} terms, {counts["dict_definitions"]} definitions, '
+          f'{counts["dict_examples"]} examples, {counts["dict_relations"]} relations '
+          f'({counts["resolved_relations"]} resolved) -> {exporter.path} '
+          f'({os.path.getsize(exporter.path):,} bytes)')
+
+
+def save_sql_dump(writer):
+    """Finish the SQL dump started with a SqlDumpWriter."""
+    counts = writer.close()
+    print(f'SQL dump: {", ".join(f"{rows} {table}" for table, rows in counts.items())} '
+          f'-> {writer.path} ({os.path.getsize(writer.path):,} bytes)')
+
+
+def save_wxr(writer):
+    """Finish the WXR export started with a WxrWriter."""
+    parts = writer.close()
+    total = sum(part['entries'] for part in parts)
+    print(f'WXR import: {total} posts -> {writer.path} ({os.path.getsize(writer.path):,} bytes)')
+
+
+def save_static_api(writer, schedule=None):
+    """Finish the static API started with a StaticApiWriter, with the Word of the Day schedule if any."""
+    manifest = writer.close(schedule)
+    print(f'Static API: {manifest["words"]} words, {manifest["letters"]} letters, '
+          f'{manifest["autocomplete_shards"]} autocomplete shards, {manifest["word_of_the_day_days"]} '
+          f'days -> {writer.path} ({manifest["files"]} files, {manifest["bytes"]:,} bytes, '
+          f'{manifest["compressed_files"]} {"/".join(manifest["encodings"])} variants)')
+
+
+class Sidecars:
+    """
+    The optional outputs written next to the converted file, each built by
+    its own builder fed one entry at a time; only the ones asked for are
+    created. `sql_prefix` is the table prefix of a SQL dump, `wotd` is
+    {'days': N, 'seed': S, 'start': date}, `static_api` is {'directory': DIR,
+    'site_url': URL} and `autocomplete` the completions kept per prefix.
+    """
+
+    def __init__(self, output_file, *, index=False, relations=False, facets=False, wotd=None,
+                 autocomplete=None, morphology=False, binary=False, sqlite=False, sql_prefix=None,
+                 wxr=False, static_api=None):
+        self.output_file = output_file
+        self.wotd = wotd
+        self.schedule = None
+        # (profiler step, builder, save) of every output asked for, in save order
+        self.steps = []
+        if index:
+            self.steps.append(('Write search index', SearchIndexBuilder(), self.save_search_index))
+        if relations:
+            self.steps.append(('Resolve cross-references', RelationGraphBuilder(), self.save_relations))
+        if facets:
+            self.steps.append(('Write facets', FacetBuilder(), self.save_facets))
+        if wotd:
+            self.steps.append(('Schedule Word of the Day', WordOfTheDayBuilder(wotd['seed']), self.save_wotd))
+        if autocomplete:
+            self.steps.append(('Write autocomplete trie', AutocompleteBuilder(autocomplete),
+                               self.save_autocomplete))
+        if morphology:
+            self.steps.append(('Write morphology index', MorphologyBuilder(), self.save_morphology))
+        if binary:
+            self.steps.append(('Write binary table', BinaryWriter(sidecar_path(output_file, '.bin')),
+                               save_binary))
+        if sqlite:
+            self.steps.append(('Index SQLite database', SqliteExporter(sidecar_path(output_file, '.sqlite')),
+                               save_sqlite))
+        if sql_prefix is not None:
+            self.steps.append(('Write SQL dump', SqlDumpWriter(sidecar_path(output_file, '.sql'), sql_prefix),
+                               save_sql_dump))
+        if wxr:
+            self.steps.append(('Write WXR', WxrWriter(sidecar_path(output_file, '.xml')), save_wxr))
+        if static_api:
+            self.steps.append(('Write static API', StaticApiWriter(**static_api), self.save_static_api))
+
+    def add(self, entry):
+        """Feed one final entry to every builder."""
+        for _, builder, _ in self.steps:
+            builder.add(entry)
+
+    def iter_added(self, entries):
+        """Pass entries through unchanged, feeding each to every builder."""
+        for entry in entries:
+            self.add(entry)
+            yield entry
+
+    def save(self, profiler, number):
+        """Write every output, timed as profiler steps `number`, `number`a, `number`b, ..."""
+        for i, (name, builder, save) in enumerate(self.steps):
+            suffix = chr(ord('a') + i - 1) if i else ''
+            with profiler.step(f'{number}{suffix}. {name}'):
+                save(builder)
+
+    def save_search_index(self, builder):
+        save_search_index(builder, self.output_file)
+
+    def save_relations(self, builder):
+        save_relations(builder, self.output_file)
+
+    def save_facets(self, builder):
+        save_facets(builder, self.output_file)
+
+    def save_wotd(self, builder):
+        # The static API, saved later, serves this schedule
+        self.schedule = save_wotd(builder, self.output_file, self.wotd)
+
+    def save_autocomplete(self, builder):
+        save_autocomplete(builder, self.output_file)
+
+    def save_morphology(self, builder):
+        save_morphology(builder, self.output_file)
+
+    def save_static_api(self, writer):
+        save_static_api(writer, self.schedule)
+
+
+def output_entry_hash(entry):
+    """Content hash of an output entry."""
+    encoded = json.dumps(entry, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def compute_delta(previous, current):
+    """Compare two slug -> hash maps. Returns added, changed and removed slugs."""
+    return {
+        'added': [s for s in current if s not in previous],
+        'changed': [s for s, h in current.items() if s in previous and previous[s] != h],
+        'removed': [s for s in previous if s not in current],
+    }
+
+
+def write_build_delta(cache, iter_entries, output_file):
+    """
+    Diff this build against the last acknowledged one recorded in the cache
+    and write an importable delta file holding the added and changed entries
+    plus the removed slugs. `iter_entries` is called twice and must return the
+    output entries each time.
+    """
+    slug_hashes = {}
+    for e in iter_entries():
+        # Unresolved duplicate slugs hash as one unit
+        slug_hashes[e['slug']] = slug_hashes.get(e['slug'], '') + output_entry_hash(e)
+
+    delta = compute_delta(cache.previous_slugs(), slug_hashes)
+    wanted = set(delta['added']) | set(delta['changed'])
+
+    delta_file = sidecar_path(output_file, '.delta.json')
     output = {
         'metadata': {
             'source': 'ateso_dict.txt',
             'generated_at': datetime.now(timezone.utc).isoformat(),
-            'stats': stats,
+            'delta': {k: len(v) for k, v in delta.items()},
         },
-        'entries': parsed,
+        'added': delta['added'],
+        'changed': delta['changed'],
+        'removed': delta['removed'],
+        'entries': [e for e in iter_entries() if e['slug'] in wanted],
     }
-
-    # Step 6: Write JSON
-    print(f'\nWriting {output_file}...')
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with open(delta_file, 'w', encoding='utf-8') as f:
         json.dump(output, f, ensure_ascii=False, indent=2)
 
-    print(f'Done! Generated {output_file}')
-    print(f'File contains {len(parsed)} entries')
+    cache.save_slugs(slug_hashes)
+
+    print(f'Cache: {cache.hits} entries reused, {cache.misses} parsed')
+    print(f'Delta: {len(delta["added"])} added, {len(delta["changed"])} changed, '
+          f'{len(delta["removed"])} removed -> {delta_file}')
+    print('Delta: run again with --ack-delta once this build has been imported')
+
+
+def run_stream(input_file, output_file, *, jobs=1, cache=None, profiler=None, split=None,
+               sidecars=None, entry_budget=None):
+    """
+    Streaming conversion: entries flow from the source file to NDJSON one at
+    a time, so memory stays flat regardless of source size; only the
+    `sidecars` asked for keep per-entry state until the end.
+
+    A cheap headword-only census pass runs first so that slug collisions can
+    be resolved without holding parsed entries. The output has one entry per
+    line, followed by a final {"metadata": ...} line carrying the stats.
+    With `split` ({'max_entries': N, 'max_bytes': N}), entries go to JSON part
+    files and a manifest instead, one part in memory at a time. Entries that
+    take longer than `entry_budget` seconds to parse are reported as failed
+    instead of holding up the stream.
+    """
+    profiler = profiler or StepProfiler(enabled=False)
+    print(f'Reading {input_file} (streaming)...')
+
+    with profiler.step('1. Census slugs'):
+        slug_changes, collisions = census_slugs(iter_raw_entries(input_file))
+        if collisions:
+            print(f'Slug collisions detected: {collisions}')
+
+    failed = []
+    stats = EntryStats()
+    entries = iter_parsed_entries(iter_raw_entries(input_file), failed, slug_changes, jobs, cache,
+                                  entry_budget)
+    if sidecars:
+        entries = sidecars.iter_added(entries)
+
+    if split:
+        print(f'Writing parts of {output_file}...')
+        with profiler.step('2. Aggregate, parse, count, write parts'):
+            stats = write_json_parts(entries, output_file, failed, **split)
+            stats_dict = stats.as_dict(len(failed))
+    else:
+        print(f'Writing {output_file}...')
+        with profiler.step('2. Aggregate, parse, count, write'):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    stats.add(entry)
+                    f.write(json.dumps(entry.to_dict(), ensure_ascii=False))
+                    f.write('\n')
+
+                stats_dict = stats.as_dict(len(failed))
+                f.write(json.dumps({'metadata': build_metadata(stats_dict)}, ensure_ascii=False))
+                f.write('\n')
+
+    print(f'Successfully parsed {stats.total_entries} entries')
+    if failed:
+        print(f'Entries with issues: {len(failed)}')
+    print_stats(stats_dict, failed)
+
+    print(f'\nDone! Generated {output_file}')
+    print(f'File contains {stats.total_entries} entries')
+
+    if sidecars:
+        sidecars.save(profiler, 3)
+
+    if cache:
+        def written():
+            """The entries just written, read back from the output."""
+            if split:
+                return iter_part_entries(output_file)
+            return iter_ndjson_entries(output_file)
+
+        with profiler.step('4. Write delta'):
+            write_build_delta(cache, written, output_file)
+
+    return exit_status(failed)
+
+
+def run_batch(input_file, output_file, *, jobs=1, cache=None, profiler=None, split=None,
+              sidecars=None, entry_budget=None):
+    """
+    Batch conversion: parse everything, then write one JSON document, or
+    JSON part files plus a manifest when `split` is given, and the
+    `sidecars` asked for. Entries that take longer than `entry_budget`
+    seconds to parse are reported as failed.
+    """
+    profiler = profiler or StepProfiler(enabled=False)
+
+    print(f'Reading {input_file}...')
+
+    # Step 1: Aggregate multi-line entries
+    with profiler.step('1. Aggregate entries'):
+        raw_entries = aggregate_entries(input_file)
+    print(f'Aggregated {len(raw_entries)} raw entries')
+
+    # Step 2: Parse each entry
+    failed = []
+    with profiler.step('2. Parse entries'):
+        parsed = list(iter_parsed_entries(raw_entries, failed, jobs=jobs, cache=cache, budget=entry_budget))
+
+    print(f'Successfully parsed {len(parsed)} entries')
+    if failed:
+        print(f'Entries with issues: {len(failed)}')
+
+    # Step 3: Detect slug collisions and resolve
+    with profiler.step('3. Resolve slug collisions'):
+        collisions = resolve_slug_collisions(parsed)
+    if collisions:
+        print(f'Slug collisions detected: {collisions}')
+
+    # Step 4: Generate statistics
+    with profiler.step('4. Generate statistics'):
+        entry_stats = EntryStats()
+        for e in parsed:
+            entry_stats.add(e)
+        stats = entry_stats.as_dict(len(failed))
+
+    print_stats(stats, failed)
+
+    if split:
+        # Step 5: Write JSON parts and manifest
+        print(f'\nWriting parts of {output_file}...')
+        with profiler.step('5. Write JSON parts'):
+            write_json_parts(parsed, output_file, failed, **split)
+        print(f'Done! Split {len(parsed)} entries')
+    else:
+        # Step 5: Build output
+        with profiler.step('5. Build output'):
+            metadata = build_metadata(stats)
+
+        # Step 6: Write JSON
+        print(f'\nWriting {output_file}...')
+        with profiler.step('6. Write JSON'):
+            write_json_document(output_file, metadata, (serialize_entry(e) for e in parsed))
+
+        print(f'Done! Generated {output_file}')
+        print(f'File contains {len(parsed)} entries')
+
+    # Step 7: Feed every sidecar in one pass, then write them
+    if sidecars:
+        with profiler.step('7. Build sidecars'):
+            for e in parsed:
+                sidecars.add(e)
+        sidecars.save(profiler, 8)
+
+    if cache:
+        def written():
+            """The entries just written, as output dicts."""
+            return (e.to_dict() for e in parsed)
+
+        with profiler.step('9. Write delta'):
+            write_build_delta(cache, written, output_file)
+
+    return exit_status(failed)
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Convert ateso_dict.txt into JSON for WordPress import.'
+    )
+    parser.add_argument('input_file', nargs='?', default='../ateso_dict.txt')
+    parser.add_argument('output_file', nargs='?', default=None)
+    parser.add_argument(
+        '--stream', action='store_true',
+        help='stream entries to NDJSON one at a time with flat memory use',
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=1, metavar='N',
+        help='parse entries in N worker processes (default: 1)',
+    )
+    parser.add_argument(
+        '--cache', nargs='?', const='', default=None, metavar='PATH',
+        help='reuse parse results from an on-disk cache (default: next to the '
+             'output) and write a .delta.json of added, changed and removed slugs',
+    )
+    parser.add_argument(
+        '--ack-delta', action='store_true',
+        help='record the last --cache build as imported, so the next .delta.json '
+             'is relative to it, and exit (deltas are cumulative until then)',
+    )
+    split = parser.add_mutually_exclusive_group()
+    split.add_argument(
+        '--split-entries', type=int, metavar='N',
+        help='write JSON part files of at most N entries plus a .manifest.json '
+             'listing them, instead of one output file',
+    )
+    split.add_argument(
+        '--split-bytes', type=parse_size, metavar='SIZE',
+        help='like --split-entries, but cap each part at about SIZE bytes '
+             '(e.g. 512K, 2M)',
+    )
+    parser.add_argument(
+        '--entry-budget', type=float, default=0, metavar='SECONDS',
+        help='leave out entries that take longer than SECONDS to parse instead of '
+             f'waiting on them, and exit with status {EXIT_PARSE_TIMEOUT} if any was '
+             '(default: 0, no budget; needs SIGALRM)',
+    )
+    parser.add_argument(
+        '--index', action='store_true',
+        help='also write an .index.json search index next to the output '
+             '(see search_index.py)',
+    )
+    parser.add_argument(
+        '--relations', action='store_true',
+        help='also resolve cp. references into a .relations.json graph '
+             '(see cross_refs.py)',
+    )
+    parser.add_argument(
+        '--facets', action='store_true',
+        help='also write .facets.json letter, part-of-speech and dialect counts '
+             '(see facets.py)',
+    )
+    parser.add_argument(
+        '--wotd-days', type=int, default=0, metavar='N',
+        help=f'also schedule the Word of the Day for N days (e.g. {DEFAULT_WOTD_DAYS}) '
+             f'into .wotd.json (see word_of_the_day.py; default: 0, no schedule)',
+    )
+    parser.add_argument(
+        '--wotd-seed', default=DEFAULT_WOTD_SEED, metavar='SEED',
+        help=f'seed of the Word of the Day order (default: {DEFAULT_WOTD_SEED})',
+    )
+    parser.add_argument(
+        '--wotd-start', type=parse_date, default=None, metavar='YYYY-MM-DD',
+        help='first day of the Word of the Day schedule (default: today, UTC)',
+    )
+    parser.add_argument(
+        '--autocomplete', nargs='?', type=int, const=DEFAULT_TOP_K, default=None, metavar='K',
+        help=f'also write an .autocomplete.json prefix trie over headwords, slugs and '
+             f'plurals with the top K completions per node (default K: {DEFAULT_TOP_K}; '
+             f'see autocomplete.py)',
+    )
+    parser.add_argument(
+        '--morphology', action='store_true',
+        help='also write a .morphology.json index from plurals, verb stems and '
+             'prefixed forms to entry ordinals (see morphology.py)',
+    )
+    parser.add_argument(
+        '--binary', action='store_true',
+        help='also write a memory-mappable .bin export sorted by slug, for '
+             'fast-starting lookups (see binary_dictionary.py)',
+    )
+    parser.add_argument(
+        '--sqlite', action='store_true',
+        help='also write a .sqlite database with the plugin tables and FTS5 '
+             'full-text indexes (see sqlite_export.py)',
+    )
+    parser.add_argument(
+        '--sql-dump', action='store_true',
+        help='also write a .sql script that reloads the plugin tables with '
+             'multi-row INSERTs and precomputed ids (see sql_dump.py)',
+    )
+    parser.add_argument(
+        '--wxr', action='store_true',
+        help='also write a WordPress WXR .xml import from the same parse '
+             '(see wxr_export.py; generate-wordpress-import.py writes the same file)',
+    )
+    parser.add_argument(
+        '--static-api', metavar='DIR',
+        help='also pre-render the REST API responses (words, letter browse pages, '
+             'letters, Word of the Day, autocomplete shards) as static JSON with '
+             'gzip/brotli variants under DIR (see static_api.py)',
+    )
+    parser.add_argument(
+        '--site-url', default='', metavar='URL',
+        help='site address the url fields of --static-api responses start with '
+             '(default: site-relative /dictionary/<slug>/)',
+    )
+    parser.add_argument(
+        '--table-prefix', default=DEFAULT_TABLE_PREFIX, metavar='PREFIX',
+        help=f'WordPress table prefix used by --sql-dump (default: {DEFAULT_TABLE_PREFIX})',
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help='report wall time, CPU time and peak RSS per step, time per parsing '
+             'function, and hit counts and time per regex pattern (work done in '
+             '--jobs worker processes is not counted)',
+    )
+    parser.add_argument(
+        '--profile-out', metavar='FILE',
+        help='also dump a cProfile/pstats file of the whole run',
+    )
+    args = parser.parse_args(argv)
+    if args.split_entries is not None and args.split_entries < 1:
+        parser.error('--split-entries must be at least 1')
+    if args.autocomplete is not None and args.autocomplete < 1:
+        parser.error('--autocomplete must keep at least 1 completion')
+    if args.wotd_days < 0:
+        parser.error('--wotd-days must not be negative')
+    if args.entry_budget < 0:
+        parser.error('--entry-budget must not be negative')
+    if args.split_bytes is not None and args.split_bytes <= PART_METADATA_RESERVE:
+        parser.error(f'--split-bytes must be larger than {PART_METADATA_RESERVE} bytes')
+    if args.output_file is None:
+        if args.stream:
+            args.output_file = '../ateso-dictionary-data.ndjson'
+        else:
+            args.output_file = '../ateso-dictionary-data.json'
+    if args.cache == '':
+        args.cache = sidecar_path(args.output_file, '.cache.sqlite')
+    if args.ack_delta and args.cache is None:
+        parser.error('--ack-delta needs --cache')
+    return args
+
+
+def main(argv=None):
+    """Main conversion function."""
+    args = parse_args(argv)
+    input_file = args.input_file
+    output_file = args.output_file
+
+    if args.ack_delta:
+        cache = ParseCache(args.cache)
+        try:
+            acknowledged = cache.acknowledge()
+        finally:
+            cache.close()
+        if acknowledged is None:
+            print(f'No build to acknowledge in {args.cache}', file=sys.stderr)
+            return 1
+        print(f'Delta: baseline set to the last build ({acknowledged} slugs)')
+        return 0
+
+    profiler = StepProfiler(enabled=args.profile)
+    patterns = []
+    functions = []
+    if args.profile:
+        patterns = instrument_patterns(dictionary_parser)
+        functions = instrument_functions(dictionary_parser, PROFILED_FUNCTIONS)
+
+    profile = None
+    if args.profile_out:
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+
+    cache = ParseCache(args.cache) if args.cache else None
+
+    sql_prefix = args.table_prefix if args.sql_dump else None
+
+    split = None
+    if args.split_entries or args.split_bytes:
+        split = {'max_entries': args.split_entries, 'max_bytes': args.split_bytes}
+
+    wotd = None
+    if args.wotd_days:
+        wotd = {'days': args.wotd_days, 'seed': args.wotd_seed, 'start': args.wotd_start}
+
+    static_api = None
+    if args.static_api:
+        static_api = {'directory': args.static_api, 'site_url': args.site_url}
+
+    sidecars = Sidecars(
+        output_file,
+        index=args.index,
+        relations=args.relations,
+        facets=args.facets,
+        wotd=wotd,
+        autocomplete=args.autocomplete,
+        morphology=args.morphology,
+        binary=args.binary,
+        sqlite=args.sqlite,
+        sql_prefix=sql_prefix,
+        wxr=args.wxr,
+        static_api=static_api,
+    )
 
-    return 0 if not failed else 1
+    run = run_stream if args.stream else run_batch
+    try:
+        status = run(
+            input_file, output_file,
+            jobs=args.jobs,
+            cache=cache,
+            profiler=profiler,
+            split=split,
+            sidecars=sidecars,
+            entry_budget=args.entry_budget or None,
+        )
+        if cache:
+            dropped = cache.prune()
+            if dropped:
+                print(f'Cache: {dropped} stale entries dropped')
+        return status
+    finally:
+        if cache:
+            cache.close()
+        if profile:
+            profile.disable()
+            profile.dump_stats(args.profile_out)
+            print(f'cProfile stats written to {args.profile_out}')
+        if args.profile:
+            profiler.report()
+            report_functions(functions)
+            report_patterns(patterns)
 
 
 if __name__ == '__main__':
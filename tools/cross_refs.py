@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Cross-Reference Resolution
+Resolves the `cp.` references of definitions to entries at build time, with
+hash lookups instead of the plugin's post-import UPDATE ... JOIN, and writes
+the relation graph as slug-to-slug edges plus a report of the references
+that match nothing.
+
+A reference is tried, case-insensitively, as:
+    slug       akai-2
+    homonym    akai2, akai 2 (headword plus homonym number)
+    headword   akai (the first homonym in output order, as resolve_relations() picks)
+    plural     akais
+after dropping an inline gloss ("inac: sister" -> "inac").
+"""
+
+import json
+from collections import Counter
+from datetime import datetime, timezone
+
+
+RELATIONS_VERSION = 1
+
+# Longest homonym number of a reference; longer digit runs name no homonym
+MAX_HOMONYM_DIGITS = 4
+
+# Order in which a reference is matched, as reported per edge
+MATCH_KINDS = ('slug', 'homonym', 'headword', 'plural')
+
+
+def split_homonym(key):
+    """
+    (headword, homonym number) of a reference ending in a homonym number
+    (akai2, akai 2), or None. The headword keeps at least one character and
+    loses one space before the number. One backwards scan, where a lazy
+    regex retries the digit run from every position.
+    """
+    start = len(key)
+    while start > 1 and key[start - 1].isdecimal():
+        start -= 1
+    if start == len(key) or len(key) - start > MAX_HOMONYM_DIGITS:
+        return None
+    base = key[:start]
+    if len(base) > 1 and base[-1].isspace():
+        base = base[:-1]
+    return base, int(key[start:])
+
+
+class CrossRefResolver:
+    """Hash maps from slugs, headwords and plurals to the slug of the entry they name."""
+
+    def __init__(self):
+        self.slugs = {}
+        self.homonyms = {}
+        self.headwords = {}
+        self.plurals = {}
+
+    def add(self, word, slug, homonym_number=None, plural=None):
+        """Register an entry. The first entry registered under a key keeps it."""
+        word = word.lower()
+        self.slugs.setdefault(slug.lower(), slug)
+        self.headwords.setdefault(word, slug)
+        if homonym_number is not None:
+            self.homonyms.setdefault((word, homonym_number), slug)
+        if plural:
+            self.plurals.setdefault(plural.lower(), slug)
+
+    def resolve(self, ref):
+        """(target slug, match kind) for a reference, or (None, None)."""
+        key = ref.split(':', 1)[0].strip().lower()
+        if not key:
+            return None, None
+        if key in self.slugs:
+            return self.slugs[key], 'slug'
+        homonym = split_homonym(key)
+        if homonym:
+            target = self.homonyms.get(homonym)
+            if target:
+                return target, 'homonym'
+        if key in self.headwords:
+            return self.headwords[key], 'headword'
+        if key in self.plurals:
+            return self.plurals[key], 'plural'
+        return None, None
+
+
+class RelationGraphBuilder:
+    """
+    Collects the references of each output entry as it passes and resolves
+    them once every entry is known. Call add() in output order, after slugs
+    are final.
+    """
+
+    def __init__(self):
+        self.resolver = CrossRefResolver()
+        self.refs = []
+
+    def add(self, entry):
+        """Register an Entry and queue its references."""
+        self.resolver.add(entry.word, entry.slug, entry.homonym_number, entry.plural)
+        for d in entry.definitions:
+            for ref in d.cp_refs:
+                self.refs.append((entry.slug, ref, entry.line))
+
+    def as_dict(self):
+        """The relations document: edges, unresolved references and counts."""
+        edges = []
+        unresolved = []
+        matches = Counter()
+        for source, ref, line in self.refs:
+            target, kind = self.resolver.resolve(ref)
+            if target is None:
+                unresolved.append({'source': source, 'ref': ref, 'line': line})
+                continue
+            matches[kind] += 1
+            edges.append({'source': source, 'target': target, 'ref': ref, 'match': kind})
+        return {
+            'version': RELATIONS_VERSION,
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'stats': {
+                'references': len(self.refs),
+                'resolved': len(edges),
+                'unresolved': len(unresolved),
+                'by_match': {kind: matches[kind] for kind in MATCH_KINDS},
+            },
+            'edges': edges,
+            'unresolved': unresolved,
+        }
+
+
+def write_relations(builder, path):
+    """Write the relations document. Returns it."""
+    relations = builder.as_dict()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(relations, ensure_ascii=False, separators=(',', ':')))
+    return relations
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Query Engine
+In-process lookups over the converter output, without WordPress: headword
+prefix search, exact lookup with homonyms, English to Ateso reverse lookup
+and the combined search of core/Database/SearchQuery.php, with letter, POS
+and dialect filters, plus typo-tolerant headword matching and lookups by
+inflected form. Uses the prebuilt .index.json and .morphology.json when
+they list the same slugs in the same order as the output, otherwise builds
+the same indexes in memory.
+"""
+
+import os
+import math
+import json
+from bisect import bisect_left
+from collections import defaultdict
+
+from dictionary_parser import Entry
+from fuzzy_index import FuzzyIndex
+from morphology import MorphologyBuilder, MorphologyIndex, load_morphology
+from output_files import sidecar_path, iter_ndjson_entries, iter_part_entries
+from search_index import SearchIndexBuilder, load_search_index, delta_decode, tokenize, trigrams
+
+# Weight of a token found only in an example translation, relative to a definition
+EXAMPLE_TOKEN_WEIGHT = 0.5
+
+# SearchQuery switches from LIKE to FULLTEXT at this query length
+FULLTEXT_MIN_LENGTH = 4
+
+
+def load_entries(path):
+    """
+    Read converter output as Entry objects: a .json document, an .ndjson
+    stream, or the parts listed in a split build's .manifest.json.
+    """
+    if path.endswith('.manifest.json'):
+        output_file = path[:-len('.manifest.json')] + '.json'
+        return [Entry.from_dict(e) for e in iter_part_entries(output_file)]
+    if path.endswith('.ndjson'):
+        return [Entry.from_dict(e) for e in iter_ndjson_entries(path)]
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Entry.from_dict(e) for e in json.load(f)['entries']]
+
+
+def load_sidecar(load, path):
+    """A sidecar document read with `load`, or None if it is missing, unreadable or of another version."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return load(path)
+    except ValueError:
+        return None
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with `prefix`."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class DictionaryIndex:
+    """
+    Query engine over a list of Entry objects in output order (ordinal = list
+    position). `index` is a loaded search index and `morphology` a loaded
+    morphology document; each is used only if it lists the slugs of these
+    entries in this order, and rebuilt otherwise.
+    """
+
+    def __init__(self, entries, index=None, morphology=None):
+        self.entries = entries
+        slugs = [entry.slug for entry in entries]
+        if index is None or index.get('slugs') != slugs:
+            builder = SearchIndexBuilder()
+            for entry in entries:
+                builder.add(entry)
+            index = builder.as_dict()
+            for key in ('tokens', 'example_tokens', 'trigrams'):
+                index[key] = {k: delta_decode(v) for k, v in index[key].items()}
+
+        self.headwords = index['headwords']
+        self.headword_ordinals = index['headword_ordinals']
+        self.tokens = index['tokens']
+        self.example_tokens = index['example_tokens']
+        self.trigrams = index['trigrams']
+
+        self.words = [entry.word.lower() for entry in entries]
+        # Browse order of SearchQuery: word, then homonym number
+        self.browse_rank = [0] * len(entries)
+        for rank, ordinal in enumerate(self.headword_ordinals):
+            self.browse_rank[ordinal] = rank
+
+        self.by_letter = defaultdict(set)
+        self.by_pos = defaultdict(set)
+        self.by_dialect = defaultdict(set)
+        # Trigram postings miss definitions shorter than three characters
+        self.short_definitions = []
+        for ordinal, entry in enumerate(entries):
+            self.by_letter[entry.letter].add(ordinal)
+            self.by_pos[entry.pos].add(ordinal)
+            if entry.dialect:
+                self.by_dialect[entry.dialect.lower()].add(ordinal)
+            if any(len(d.text) < 3 for d in entry.definitions):
+                self.short_definitions.append(ordinal)
+        # Infix matches of one- and two-character queries, which scan every trigram
+        self.short_infix = {}
+        # Built on the first fuzzy lookup
+        self.fuzzy_index = None
+        # Built on the first inflected lookup unless loaded
+        self.morphology = None
+        if morphology is not None and morphology.get('slugs') == slugs:
+            self.morphology = MorphologyIndex(morphology)
+
+        self.idf = {
+            token: math.log(len(entries) / len(ordinals))
+            for token, ordinals in self.tokens.items()
+        }
+
+    @classmethod
+    def load(cls, path):
+        """Load converter output and its .index.json and .morphology.json sidecars when present."""
+        entries = load_entries(path)
+        output_file = path.replace('.manifest.json', '.json')
+        index_file = sidecar_path(output_file, '.index.json')
+        index = load_sidecar(load_search_index, index_file)
+        morphology = load_sidecar(load_morphology, sidecar_path(output_file, '.morphology.json'))
+        return cls(entries, index, morphology)
+
+    # --- Candidate sets ---
+
+    def prefix_ordinals(self, prefix):
+        """Ordinals of headwords starting with `prefix`, in browse order."""
+        prefix = prefix.lower()
+        if not prefix:
+            return list(self.headword_ordinals)
+        lo = bisect_left(self.headwords, prefix)
+        hi = bisect_left(self.headwords, prefix_upper_bound(prefix), lo)
+        return self.headword_ordinals[lo:hi]
+
+    def infix_ordinals(self, text):
+        """Ordinals with `text` anywhere in a definition (LIKE '%text%')."""
+        text = text.lower()
+        if len(text) >= 3:
+            grams = sorted(trigrams(text), key=lambda g: len(self.trigrams.get(g, ())))
+            candidates = set(self.trigrams.get(grams[0], ()))
+            for gram in grams[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(self.trigrams.get(gram, ()))
+            if len(text) == 3:
+                return candidates
+        else:
+            if text in self.short_infix:
+                return self.short_infix[text]
+            candidates = set(self.short_definitions)
+            for gram, ordinals in self.trigrams.items():
+                if text in gram:
+                    candidates.update(ordinals)
+        matches = {
+            o for o in candidates
+            if any(text in d.text.lower() for d in self.entries[o].definitions)
+        }
+        if len(text) < 3:
+            self.short_infix[text] = matches
+        return matches
+
+    def token_scores(self, text, examples=False):
+        """
+        Relevance of every entry sharing a token with `text`: the summed
+        inverse document frequency of the matching tokens, like FULLTEXT
+        natural language mode. With `examples`, example translations count
+        at EXAMPLE_TOKEN_WEIGHT.
+        """
+        scores = defaultdict(float)
+        for token in set(tokenize(text)):
+            idf = self.idf.get(token)
+            if idf is not None:
+                for o in self.tokens[token]:
+                    scores[o] += idf
+            if examples and token in self.example_tokens:
+                weight = (idf if idf is not None else math.log(len(self.entries))) * EXAMPLE_TOKEN_WEIGHT
+                for o in self.example_tokens[token]:
+                    scores[o] += weight
+        return scores
+
+    def filter(self, ordinals, letter='', pos='', dialect=''):
+        """
+        Keep the ordinals matching every given filter, as a list. A list keeps
+        its order; a set comes back unordered.
+        """
+        facets = []
+        if letter:
+            facets.append(self.by_letter.get(letter.upper(), set()))
+        if pos:
+            facets.append(self.by_pos.get(pos, set()))
+        if dialect:
+            facets.append(self.by_dialect.get(dialect.lower(), set()))
+        if not facets:
+            return list(ordinals)
+        keep = set.intersection(*sorted(facets, key=len))
+        if isinstance(ordinals, set):
+            return list(keep.intersection(ordinals))
+        return [o for o in ordinals if o in keep]
+
+    # --- Ranking ---
+
+    def headword_rank(self, ordinal, q):
+        """The CASE of SearchQuery: 0 exact word, 1 word prefix, 2 anything else."""
+        word = self.words[ordinal]
+        if word == q:
+            return 0
+        if word.startswith(q):
+            return 1
+        return 2
+
+    # --- Queries ---
+
+    def lookup(self, word, homonym_number=None):
+        """
+        Entries whose headword is `word` (case-insensitive), ordered by
+        homonym number, or only the given homonym.
+        """
+        word = word.lower()
+        matches = [o for o in self.prefix_ordinals(word) if self.words[o] == word]
+        entries = [self.entries[o] for o in matches]
+        if homonym_number is not None:
+            entries = [e for e in entries if e.homonym_number == homonym_number]
+        return entries
+
+    def prefix(self, prefix, limit=20, letter='', pos='', dialect=''):
+        """
+        Entries whose headword starts with `prefix` in headword order, which
+        already puts exact matches (the shortest such words) first.
+        """
+        ordinals = self.filter(self.prefix_ordinals(prefix), letter, pos, dialect)
+        return [self.entries[o] for o in ordinals[:limit]]
+
+    def fuzzy(self, word, max_distance=None, limit=20, letter='', pos='', dialect=''):
+        """
+        Entries whose headword or plural is within `max_distance` edits of
+        `word` (by default 0-2 depending on its length), after collapsing
+        doubled vowels and dropping apostrophes. Nearest first; at equal distance headwords before plurals, then by
+        headword. Each entry appears once.
+        """
+        if self.fuzzy_index is None:
+            self.fuzzy_index = FuzzyIndex()
+            for ordinal, entry in enumerate(self.entries):
+                self.fuzzy_index.add(entry.word, ordinal)
+                # Multi-word plurals are leftover annotations, not word forms
+                if entry.plural and ' ' not in entry.plural.strip():
+                    self.fuzzy_index.add(entry.plural, ordinal, is_plural=True)
+
+        best = {}
+        for distance, ordinal, is_plural in self.fuzzy_index.lookup(word, max_distance):
+            best.setdefault(ordinal, (distance, is_plural))
+        ordinals = self.filter(set(best), letter, pos, dialect)
+        ordinals.sort(key=lambda o: (best[o], self.browse_rank[o]))
+        return [self.entries[o] for o in ordinals[:limit]]
+
+    def inflected(self, form, limit=20, letter='', pos='', dialect=''):
+        """
+        Entries a surface form belongs to: the headword itself, a plural, a
+        verb stem or prefixed verb form, or a gender-prefix variant of a
+        noun. Best match first (see morphology.py); each entry appears once.
+        """
+        if self.morphology is None:
+            builder = MorphologyBuilder()
+            for entry in self.entries:
+                builder.add(entry)
+            self.morphology = MorphologyIndex(builder.as_dict())
+
+        ordinals = self.filter([o for o, _ in self.morphology.lookup(form)], letter, pos, dialect)
+        return [self.entries[o] for o in ordinals[:limit]]
+
+    def reverse(self, english, limit=20, letter='', pos='', dialect=''):
+        """
+        English to Ateso: entries whose definitions or example translations
+        share words with `english`. Ranked like SearchQuery's CASE, applied to
+        the definitions: 0 a definition equals the query, 1 one starts with
+        it, 2 anything else; then by relevance and headword.
+        """
+        q = english.strip().lower()
+        scores = self.token_scores(q, examples=True)
+        ordinals = self.filter(set(scores), letter, pos, dialect)
+
+        def rank(o):
+            texts = [d.text.lower() for d in self.entries[o].definitions]
+            if q in texts:
+                return 0
+            if any(t.startswith(q) for t in texts):
+                return 1
+            return 2
+
+        ordinals.sort(key=lambda o: (rank(o), -scores[o], self.browse_rank[o]))
+        return [self.entries[o] for o in ordinals[:limit]]
+
+    def search(self, q='', letter='', pos='', dialect='', page=1, per_page=20):
+        """
+        The lookup of SearchQuery::execute(). Short queries match a headword
+        prefix or a definition substring; longer ones a headword prefix or
+        definition words. Ordered by the CASE (exact, prefix, other), then
+        relevance for longer queries, then headword. Without a query, browse
+        in headword order. Returns {'results', 'total', 'pages', 'suggestions'},
+        where a query without results gets fuzzy headword suggestions.
+        """
+        q = q.strip().lower()
+        if not q:
+            ordinals = self.filter(self.headword_ordinals, letter, pos, dialect)
+        elif len(q) < FULLTEXT_MIN_LENGTH:
+            matches = set(self.prefix_ordinals(q)) | self.infix_ordinals(q)
+            ordinals = self.filter(matches, letter, pos, dialect)
+            ordinals.sort(key=lambda o: (self.headword_rank(o, q), self.browse_rank[o]))
+        else:
+            scores = self.token_scores(q)
+            matches = set(self.prefix_ordinals(q)) | set(scores)
+            ordinals = self.filter(matches, letter, pos, dialect)
+            ordinals.sort(key=lambda o: (
+                self.headword_rank(o, q), -scores.get(o, 0.0), self.browse_rank[o]
+            ))
+
+        total = len(ordinals)
+        offset = (page - 1) * per_page
+        return {
+            'results': [self.entries[o] for o in ordinals[offset:offset + per_page]],
+            'total': total,
+            'pages': math.ceil(total / per_page),
+            'suggestions': self.fuzzy(q, letter=letter, pos=pos, dialect=dialect) if q and not total else [],
+        }
@@ -0,0 +1,766 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Parser
+The one parser of ateso_dict.txt, shared by convert_dictionary.py and
+generate-wordpress-import.py: the compiled pattern set, the Entry classes,
+aggregation of multi-line raw entries, parse_entry(), slug assignment and
+the size argument type of both scripts' --split-bytes.
+Output formats (JSON, WXR, SQLite, ...) are backends that take the Entry
+objects produced here, so one parse pass feeds all of them.
+"""
+
+import re
+import sys
+import argparse
+from collections import Counter, defaultdict
+
+
+# --- Regex patterns ---
+
+# Section headers like -A-, -B-, etc.
+SECTION_HEADER_RE = re.compile(r'^-[A-Z]-\s*$')
+
+# Entry start: word (possibly with trailing digits for homonyms), followed by space
+# Handles regular words, hyphenated prefixes (-ce-, -bicil), and words with digits (abeit3)
+ENTRY_START_RE = re.compile(r'^-?[a-zA-Z][a-zA-Z\'-]*\d*\s')
+
+# Headword extraction: word + optional homonym number
+HEADWORD_RE = re.compile(r'^(-?[a-zA-Z][a-zA-Z\'-]*)(\d+)?\s')
+
+# Longest plural content taken as one annotation. Bounding it keeps each
+# unclosed "(plural" from scanning to the end of the entry.
+MAX_PLURAL_LENGTH = 200
+
+# Plural form: (plural X) or (plural X Y). The content starts at its first
+# non-blank character, so the spaces before it are only matched one way.
+PLURAL_RE = re.compile(
+    r'\(plural\s+(?P<plural>[^\s)][^)]{0,%d})\)' % (MAX_PLURAL_LENGTH - 1)
+)
+
+# Singular noun: (singular noun F/M)
+SINGULAR_NOUN_RE = re.compile(r'\(singular\s+noun\s+([FM]?)\)', re.IGNORECASE)
+
+# Plural noun: (plural noun F/M)
+PLURAL_NOUN_RE = re.compile(r'\(plural\s+noun\s+([FM]?)\)', re.IGNORECASE)
+
+# Noun with gender: (noun F), (noun M), (noun neuter), (noun Dimin.), (noun neuter/Dimin.), (noun M/Dimin.)
+NOUN_RE = re.compile(
+    r'\(noun\s+(F|M|neuter|Dimin\.|neuter/Dimin\.|M/Dimin\.|F/Dimin\.)\)',
+    re.IGNORECASE
+)
+
+# Collective noun
+COLLECTIVE_NOUN_RE = re.compile(r'\(collective\s+noun\s*([FM]?)\)', re.IGNORECASE)
+
+# Verb types
+VERB_RE = re.compile(
+    r'\((transitive|intransitive|reflexive|causative|continuous|reciprocal)?\s*verb\)',
+    re.IGNORECASE
+)
+
+# Other POS
+OTHER_POS_RE = re.compile(
+    r'\((adjective|adverb|preposition|conjunction|interjection|cardinal number|'
+    r'interrogation|personal pronoun|demonstrative|indefinite pronoun|'
+    r'prefix|suffix|infix|adjectival suffix|suffix, adjective|'
+    r'singular imperative|relative pronoun)\)',
+    re.IGNORECASE
+)
+
+# Dialect markers
+DIALECT_RE = re.compile(
+    r'\((Usuk|outside Usuk|Ateso Atororo|Serere)\)',
+    re.IGNORECASE
+)
+
+# Usage labels
+USAGE_LABEL_RE = re.compile(
+    r'\((jocular|archaic|euphemism|disapprovingly|approvingly|figurative|'
+    r'literally|derogatory|biblical|formerly|an insult|Term of abuse)\)',
+    re.IGNORECASE
+)
+
+# Noun patterns, most specific first, with the pos_detail each one produces
+NOUN_PATTERNS = (
+    ('singular noun', SINGULAR_NOUN_RE),
+    ('plural noun', PLURAL_NOUN_RE),
+    ('collective noun', COLLECTIVE_NOUN_RE),
+    ('noun', NOUN_RE),
+)
+
+# Verb stem patterns: ko-a, ko-o, ki-a, ki-o (appearing after the headword)
+VERB_STEM_RE = re.compile(r'\b(ko-[ao]|ki-[ao])\b')
+
+# Cross-reference: cp. word1, word2; or cp. word1. Handle end of string too.
+CP_REF_RE = re.compile(r'cp\.\s+([^.;]+?)(?:\.|;|$)')
+
+# Markers at the start of the left side of a colon that is not an example:
+# list items (a) ...) and ordinals (1st person ...)
+LIST_ITEM_RE = re.compile(r'[a-f]\)')
+ORDINAL_RE = re.compile(r'\d+(st|nd|rd|th)')
+
+# Separators between the references of one cp. group
+REF_SEPARATOR_RE = re.compile(r'[,;]')
+
+# Leftovers of removed annotations: empty parentheses and runs of whitespace
+EMPTY_PARENS_RE = re.compile(r'\(\s*\)')
+WHITESPACE_RUN_RE = re.compile(r'\s{2,}')
+
+# Characters replaced by a hyphen in slugs
+SLUG_SEPARATOR_RE = re.compile(r'[^a-z0-9]+')
+
+
+# Shared value for every empty tuple field of the parse result classes
+EMPTY = ()
+
+
+class Record:
+    """
+    Base of the compact parse result classes. Fields live in __slots__, so
+    an instance has no per-object __dict__; equality and repr go by field.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class Example(Record):
+    """An inline example: an Ateso phrase and its English translation."""
+
+    __slots__ = ('ateso', 'english')
+
+    def __init__(self, ateso, english):
+        self.ateso = ateso
+        self.english = english
+
+    def to_dict(self):
+        """The example as written to the JSON output."""
+        return {'ateso': self.ateso, 'english': self.english}
+
+
+class Definition(Record):
+    """One sense of an entry with the cross-references attached to it."""
+
+    __slots__ = ('text', 'cp_refs')
+
+    def __init__(self, text, cp_refs=EMPTY):
+        self.text = text
+        self.cp_refs = cp_refs
+
+    def to_dict(self):
+        """The definition as written to the JSON output."""
+        return {'text': self.text, 'cp_refs': list(self.cp_refs)}
+
+
+class Entry(Record):
+    """
+    A parsed dictionary entry. Repeated short values (pos, pos_detail,
+    gender, dialect, letter) are interned and empty collections share EMPTY.
+    `line` is the source line number and is not part of the output.
+    """
+
+    __slots__ = (
+        'word', 'homonym_number', 'plural', 'pos', 'pos_detail', 'gender',
+        'dialect', 'verb_stem', 'usage_labels', 'letter', 'definitions',
+        'examples', 'sub_entries', 'slug', 'line',
+    )
+
+    def __init__(self, word, line=0):
+        self.word = word
+        self.homonym_number = None
+        self.plural = None
+        self.pos = ''
+        self.pos_detail = None
+        self.gender = None
+        self.dialect = None
+        self.verb_stem = None
+        self.usage_labels = EMPTY
+        self.letter = ''
+        self.definitions = EMPTY
+        self.examples = EMPTY
+        self.sub_entries = EMPTY
+        self.slug = None
+        self.line = line
+
+    def to_dict(self):
+        """
+        The entry as written to the JSON output, keys in output order. The
+        slug is left out until one has been assigned.
+        """
+        data = {
+            'word': self.word,
+            'homonym_number': self.homonym_number,
+            'plural': self.plural,
+            'pos': self.pos,
+            'pos_detail': self.pos_detail,
+            'gender': self.gender,
+            'dialect': self.dialect,
+            'verb_stem': self.verb_stem,
+            'usage_labels': list(self.usage_labels),
+            'letter': self.letter,
+            'definitions': [d.to_dict() for d in self.definitions],
+            'examples': [e.to_dict() for e in self.examples],
+            'sub_entries': list(self.sub_entries),
+        }
+        if self.slug is not None:
+            data['slug'] = self.slug
+        return data
+
+    @classmethod
+    def from_dict(cls, data, line=0):
+        """Rebuild an entry from its to_dict() form (cache rows, JSON output)."""
+        entry = cls(data['word'], line)
+        entry.homonym_number = data['homonym_number']
+        entry.plural = data['plural']
+        entry.pos = intern_value(data['pos'])
+        entry.pos_detail = intern_value(data['pos_detail'])
+        entry.gender = intern_value(data['gender'])
+        entry.dialect = intern_value(data['dialect'])
+        entry.verb_stem = data['verb_stem']
+        entry.usage_labels = tuple(data['usage_labels']) or EMPTY
+        entry.letter = intern_value(data['letter'])
+        entry.definitions = tuple(
+            Definition(d['text'], tuple(d['cp_refs']) or EMPTY) for d in data['definitions']
+        ) or EMPTY
+        entry.examples = tuple(
+            Example(e['ateso'], e['english']) for e in data['examples']
+        ) or EMPTY
+        entry.sub_entries = tuple(data['sub_entries']) or EMPTY
+        entry.slug = data.get('slug')
+        return entry
+
+
+def intern_value(value):
+    """sys.intern() for strings; None passes through."""
+    return sys.intern(value) if value else value
+
+
+def normalize_gender(raw):
+    """Normalize gender string to F, M, or N/A."""
+    if not raw:
+        return None
+    raw = raw.strip().upper()
+    if raw == 'F':
+        return 'F'
+    if raw == 'M':
+        return 'M'
+    if raw in ('NEUTER', 'N/A', 'DIMIN.', 'NEUTER/DIMIN.', 'M/DIMIN.', 'F/DIMIN.'):
+        return 'N/A'
+    return None
+
+
+def normalize_pos(raw):
+    """Normalize part of speech to a standard category."""
+    raw_lower = raw.strip().lower()
+    if 'noun' in raw_lower:
+        return 'noun'
+    # Check adverb BEFORE verb since 'adverb' contains 'verb'
+    if 'adverb' in raw_lower:
+        return 'adverb'
+    if 'verb' in raw_lower:
+        return 'verb'
+    if 'adjective' in raw_lower or 'adjectival' in raw_lower:
+        return 'adjective'
+    if 'preposition' in raw_lower:
+        return 'preposition'
+    if 'conjunction' in raw_lower:
+        return 'conjunction'
+    if 'interjection' in raw_lower:
+        return 'interjection'
+    if 'cardinal number' in raw_lower:
+        return 'cardinal number'
+    if 'prefix' in raw_lower or 'suffix' in raw_lower or 'infix' in raw_lower:
+        return 'affix'
+    if 'interrogation' in raw_lower:
+        return 'interrogation'
+    if 'imperative' in raw_lower:
+        return 'other'
+    return 'other'
+
+
+def extract_examples_from_text(text, headword):
+    """
+    Extract inline examples from definition text.
+    Examples are typically: ateso_phrase: english_translation
+    Returns (cleaned_text, list of Example).
+    """
+    examples = []
+
+    # Strategy: look for patterns where a known Ateso phrase (often starting with
+    # headword or a conjugated form) is followed by a colon and English translation.
+    # Common patterns:
+    #   headword phrase: english meaning
+    #   conjugated_form phrase: translation
+    # We need to be careful not to match parts of speech annotations or
+    # definition structures that use colons.
+
+    # Split by periods to find potential example sentences
+    # An example sentence typically contains a colon separating Ateso from English
+    parts = text.split('. ')
+    cleaned_parts = []
+
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+
+        # Check if this part looks like an example (contains : with Ateso words on left)
+        colon_idx = part.find(':')
+        if colon_idx > 0 and colon_idx < len(part) - 1:
+            left = part[:colon_idx].strip()
+            right = part[colon_idx + 1:].strip()
+
+            # Heuristic: the left side should contain at least 2 words and
+            # not be a pure metadata marker. It should look like an Ateso phrase.
+            left_words = left.split()
+
+            # Skip if left side is a single known metadata word
+            skip_markers = {
+                'cp', 'plural', 'noun', 'verb', 'adjective', 'adverb',
+                'literally', 'figurative', 'i.e', 'e.g', 'i.e.',
+                'Conjugation', 'Imperative', '1st', '2nd', '3rd',
+                'a)', 'b)', 'c)', 'd)', 'e)', 'f)',
+            }
+
+            is_example = (
+                len(left_words) >= 2
+                and left_words[0].lower() not in skip_markers
+                and not left.startswith('(')
+                and not LIST_ITEM_RE.match(left)
+                and not ORDINAL_RE.match(left)
+                # The right side should look like English (contains spaces, common words)
+                and len(right.split()) >= 1
+            )
+
+            if is_example:
+                # Clean up the example
+                ateso = left.strip().rstrip(',').strip()
+                english = right.strip().rstrip('.').strip()
+                if ateso and english:
+                    examples.append(Example(ateso, english))
+                continue
+
+        cleaned_parts.append(part)
+
+    cleaned_text = '. '.join(cleaned_parts)
+    if cleaned_text and not cleaned_text.endswith('.'):
+        cleaned_text += '.'
+
+    return cleaned_text, examples
+
+
+def drop_parentheticals(text):
+    """
+    Remove every (...) group from one line of text, with the whitespace
+    around it, in linear time. A group ends at the first ')' after its '(';
+    an unclosed '(' is kept.
+    """
+    pieces = []
+    pos = 0
+    while True:
+        open_at = text.find('(', pos)
+        close_at = text.find(')', open_at + 1) if open_at >= 0 else -1
+        if close_at < 0:
+            break
+        pieces.append(text[pos:open_at].rstrip())
+        pos = close_at + 1
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+    pieces.append(text[pos:])
+    return ''.join(pieces)
+
+
+def extract_cross_refs(text):
+    """Extract cross-references from text. Returns (cleaned_text, refs_list)."""
+    refs = []
+
+    def collect_ref(match):
+        ref_text = match.group(1).strip()
+        # Split by comma or semicolon for multiple refs
+        for ref in REF_SEPARATOR_RE.split(ref_text):
+            ref = ref.strip()
+            if ref:
+                # Clean: remove trailing periods, parentheses content
+                ref = drop_parentheticals(ref).strip().rstrip('.')
+                if ref and len(ref) < 100:  # sanity check
+                    refs.append(ref)
+        return ''
+
+    cleaned = CP_REF_RE.sub(collect_ref, text)
+    return cleaned.strip(), refs
+
+
+def parse_entry(raw_text, line_number=0):
+    """
+    Parse a single dictionary entry and extract all structured fields.
+    Returns an Entry or None if parsing fails.
+    """
+    text = raw_text.strip()
+    if not text:
+        return None
+
+    # --- Extract headword and homonym number ---
+    hw_match = HEADWORD_RE.match(text)
+    if not hw_match:
+        return None
+
+    entry = Entry(hw_match.group(1).strip(), line_number)
+    if hw_match.group(2):
+        entry.homonym_number = int(hw_match.group(2))
+
+    # Derive letter (first alphabetic character, uppercase)
+    first_alpha = ''
+    for ch in entry.word:
+        if ch.isalpha():
+            first_alpha = ch.upper()
+            break
+    entry.letter = sys.intern(first_alpha) if first_alpha else ''
+
+    # Remove headword + homonym from working text
+    working = text[hw_match.end():].strip()
+
+    # --- Extract plural form ---
+    plural_match = PLURAL_RE.search(working)
+    if plural_match:
+        entry.plural = plural_match.group(1).strip()
+        working = working[:plural_match.start()] + working[plural_match.end():]
+        working = working.strip()
+
+    # --- Extract part of speech ---
+    pos_found = False
+
+    # Check noun patterns (most specific first)
+    for pos_label, pattern in NOUN_PATTERNS:
+        m = pattern.search(working)
+        if m:
+            entry.pos = 'noun'
+            entry.pos_detail = pos_label
+            entry.gender = normalize_gender(m.group(1))
+            working = working[:m.start()] + working[m.end():]
+            working = working.strip()
+            pos_found = True
+            break
+
+    if not pos_found:
+        # Check verb patterns
+        verb_match = VERB_RE.search(working)
+        if verb_match:
+            verb_type = verb_match.group(1) or ''
+            pos_detail = (verb_type.lower() + ' verb').strip() if verb_type else 'verb'
+            working = working[:verb_match.start()] + working[verb_match.end():]
+            working = working.strip()
+            pos_found = True
+
+            # Check for a second verb type in the same entry
+            verb_match2 = VERB_RE.search(working)
+            if verb_match2:
+                verb_type2 = verb_match2.group(1) or ''
+                if verb_type2:
+                    pos_detail += ' / ' + verb_type2.lower() + ' verb'
+                working = working[:verb_match2.start()] + working[verb_match2.end():]
+                working = working.strip()
+            entry.pos = 'verb'
+            entry.pos_detail = sys.intern(pos_detail)
+
+    if not pos_found:
+        # Check other POS
+        other_match = OTHER_POS_RE.search(working)
+        if other_match:
+            raw_pos = other_match.group(1).strip()
+            entry.pos = normalize_pos(raw_pos)
+            entry.pos_detail = sys.intern(raw_pos.lower())
+            working = working[:other_match.start()] + working[other_match.end():]
+            working = working.strip()
+            pos_found = True
+
+    # --- Extract dialect ---
+    dialect_match = DIALECT_RE.search(working)
+    if dialect_match:
+        entry.dialect = sys.intern(dialect_match.group(1).strip())
+        working = working[:dialect_match.start()] + working[dialect_match.end():]
+        working = working.strip()
+
+    # --- Extract usage labels ---
+    usage_labels = [m.group(1).strip().lower() for m in USAGE_LABEL_RE.finditer(working)]
+    if usage_labels:
+        entry.usage_labels = tuple(usage_labels)
+    working = USAGE_LABEL_RE.sub('', working).strip()
+
+    # --- Extract verb stem ---
+    stem_match = VERB_STEM_RE.search(text[:80])  # Only check near the start
+    if stem_match:
+        entry.verb_stem = stem_match.group(1)
+        # Remove verb stem from working text (only first occurrence near start)
+        stem_pos = working.find(stem_match.group(1))
+        if stem_pos != -1 and stem_pos < 30:
+            working = working[:stem_pos] + working[stem_pos + len(stem_match.group(1)):]
+            working = working.strip()
+
+    # --- Extract cross-references ---
+    working, cp_refs_global = extract_cross_refs(working)
+
+    # --- Extract examples ---
+    working, examples = extract_examples_from_text(working, entry.word)
+    if examples:
+        entry.examples = tuple(examples)
+
+    # --- Clean up and extract definitions ---
+    # Remove leftover empty parentheses and extra whitespace
+    working = EMPTY_PARENS_RE.sub('', working)
+    working = WHITESPACE_RUN_RE.sub(' ', working).strip()
+    # Remove leading/trailing punctuation artifacts
+    working = working.strip('; .')
+    working = working.strip()
+
+    definitions = []
+    if working:
+        # Split by semicolons for multiple definitions
+        raw_defs = [d.strip() for d in working.split(';') if d.strip()]
+
+        for i, d in enumerate(raw_defs):
+            # Check each definition for its own cp refs
+            d_clean, d_refs = extract_cross_refs(d)
+            d_clean = d_clean.strip().rstrip('.').strip()
+
+            if not d_clean:
+                continue
+
+            definitions.append((d_clean, d_refs))
+
+        # Attach global cp_refs to the last definition (or first if only one)
+        if cp_refs_global and definitions:
+            definitions[-1][1].extend(cp_refs_global)
+        elif cp_refs_global and not definitions:
+            # No definitions but has cp_refs - create a placeholder
+            definitions.append(('', cp_refs_global))
+
+    # Deduplicate cp_refs
+    if definitions:
+        entry.definitions = tuple(
+            Definition(d_text, tuple(dict.fromkeys(d_refs)) if d_refs else EMPTY)
+            for d_text, d_refs in definitions
+        )
+
+    return entry
+
+
+def iter_raw_entries(filepath):
+    """
+    Read the dictionary file and aggregate multi-line entries lazily.
+    Yields (raw_text, line_number) tuples one entry at a time.
+    """
+    is_entry_start = ENTRY_START_RE.match
+    is_section_header = SECTION_HEADER_RE.match
+    # Stripped lines of the current entry, joined once it ends
+    pieces = []
+    current_line = 0
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line_num, line in enumerate(f, 1):
+            stripped = line.strip()
+
+            # Does this line look like a new entry start? Most lines do, so
+            # this is tested first; a section header never matches it
+            if stripped and is_entry_start(stripped):
+                # Save the previous entry if any
+                if pieces:
+                    yield (' '.join(pieces), current_line)
+                pieces = [stripped]
+                current_line = line_num
+
+            # Skip blank lines and section headers
+            elif not stripped or is_section_header(stripped):
+                if pieces:
+                    yield (' '.join(pieces), current_line)
+                    pieces = []
+
+            else:
+                # Continuation line, or an orphan one that starts a new entry
+                if not pieces:
+                    current_line = line_num
+                pieces.append(stripped)
+
+    # Don't forget the last entry
+    if pieces:
+        yield (' '.join(pieces), current_line)
+
+
+def aggregate_entries(filepath):
+    """
+    Read the dictionary file and aggregate multi-line entries.
+    Returns a list of (raw_text, line_number) tuples.
+    """
+    return list(iter_raw_entries(filepath))
+
+
+def generate_slug(word, homonym_number):
+    """Generate a URL-safe slug from a word and optional homonym number."""
+    # Replace non-alphanumeric with hyphens
+    slug = SLUG_SEPARATOR_RE.sub('-', word.lower())
+    slug = slug.strip('-')
+    if homonym_number:
+        slug += f'-{homonym_number}'
+    return slug
+
+
+def validate_entry(entry):
+    """Validate a parsed entry for completeness. Returns list of issues."""
+    issues = []
+    if not entry.word:
+        issues.append('Missing word')
+    if not entry.letter:
+        issues.append('Missing letter')
+    if not entry.pos and not entry.definitions:
+        issues.append('No POS and no definitions')
+    return issues
+
+
+def base_slug(slug, homonym_number):
+    """The headword part of a slug: without its -N homonym suffix."""
+    return slug[:-len(f'-{homonym_number}')] if homonym_number else slug
+
+
+def plan_slugs(keys):
+    """
+    Work out, in one grouped pass, how to tell apart entries that share a
+    slug. `keys` yields (key, word, homonym_number) in output order, `key`
+    being whatever identifies the entry to the caller. Returns (changes,
+    collisions): changes maps the key of every entry whose slug changes to
+    its new (homonym_number, slug); collisions is the number of shared slugs.
+
+    Entries sharing a slug of which none has a homonym number are numbered
+    1, 2, ... in output order, as the converter always did. A slug that is
+    still shared after that (a homonym number given twice, headwords that
+    differ only in punctuation like k, k- and -k-, or k numbered into the
+    k-1 of an existing homonym) stays with its first entry; the others get
+    the lowest free homonym number of their headword, so slug and homonym
+    number always agree.
+    """
+    # slug -> (position, key, homonym_number) of its entry, or a list of
+    # them once the slug is shared
+    by_slug = {}
+    for position, (key, word, homonym_number) in enumerate(keys):
+        slug = generate_slug(word, homonym_number)
+        entry = (position, key, homonym_number)
+        first = by_slug.get(slug)
+        if first is None:
+            by_slug[slug] = entry
+        elif isinstance(first, list):
+            first.append(entry)
+        else:
+            by_slug[slug] = [first, entry]
+
+    changes = {}
+    collisions = 0
+    # slug -> [(position, key, homonym_number), ...] of the entries still
+    # sharing it once the unnumbered ones are numbered
+    shared = defaultdict(list)
+    numbered = []
+    vacated = set()
+    for slug, group in by_slug.items():
+        if not isinstance(group, list):
+            continue
+        collisions += 1
+        if any(homonym_number is not None for _, _, homonym_number in group):
+            shared[slug].extend(group)
+            continue
+        vacated.add(slug)
+        for number, (position, key, _) in enumerate(group, 1):
+            changes[key] = (number, f'{slug}-{number}')
+            numbered.append((f'{slug}-{number}', (position, key, number)))
+
+    taken = set()
+    for new_slug, entry in numbered:
+        taken.add(new_slug)
+        holder = by_slug.get(new_slug)
+        if holder is None or new_slug in vacated:
+            continue
+        if not isinstance(holder, list):
+            shared[new_slug].append(holder)
+        shared[new_slug].append(entry)
+
+    # Headword slug -> last homonym number tried for it
+    last = Counter()
+    for slug, group in shared.items():
+        group.sort()
+        for position, key, homonym_number in group[1:]:
+            base = base_slug(slug, homonym_number)
+            new_slug = slug
+            while (new_slug in by_slug and new_slug not in vacated) or new_slug in taken:
+                last[base] += 1
+                new_slug = f'{base}-{last[base]}'
+            taken.add(new_slug)
+            changes[key] = (last[base], new_slug)
+    return changes, collisions
+
+
+def resolve_slug_collisions(parsed):
+    """
+    Give every entry a unique slug (see plan_slugs). Returns the number of
+    colliding slugs.
+    """
+    changes, collisions = plan_slugs((i, e.word, e.homonym_number) for i, e in enumerate(parsed))
+    for i, (homonym_number, slug) in changes.items():
+        parsed[i].homonym_number = homonym_number
+        parsed[i].slug = slug
+    return collisions
+
+
+def census_slugs(raw_entries):
+    """
+    Plan slugs from the headword of every raw entry, without fully parsing
+    it. Returns plan_slugs() keyed by line number.
+    """
+    def keys():
+        for raw_text, line_num in raw_entries:
+            hw_match = HEADWORD_RE.match(raw_text.strip())
+            if hw_match:
+                homonym_number = int(hw_match.group(2)) if hw_match.group(2) else None
+                yield line_num, hw_match.group(1).strip(), homonym_number
+    return plan_slugs(keys())
+
+
+def assign_slug(entry, slug_changes=None):
+    """
+    Give a parsed entry its slug: the one generated from its headword, or
+    the one census_slugs() planned for its line when that slug is shared.
+    """
+    entry.slug = generate_slug(entry.word, entry.homonym_number)
+    if slug_changes and entry.line in slug_changes:
+        entry.homonym_number, entry.slug = slug_changes[entry.line]
+
+
+def iter_entries(filepath):
+    """
+    Parse a dictionary file lazily. Yields every Entry that parses, in
+    source order, with its final slug; the file is read twice (census and
+    parse) so memory stays flat.
+    """
+    slug_changes, _ = census_slugs(iter_raw_entries(filepath))
+    for raw_text, line_num in iter_raw_entries(filepath):
+        entry = parse_entry(raw_text, line_num)
+        if entry:
+            assign_slug(entry, slug_changes)
+            yield entry
+
+
+def parse_size(text):
+    """Parse a byte size such as 500000, 512K or 2M."""
+    units = {'K': 1024, 'M': 1024 * 1024}
+    text = text.strip().upper()
+    try:
+        if text[-1:] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid size: {text!r}')
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Facet Tables
+Entry counts per letter, part of speech, dialect and letter x part of
+speech, counted at build time so the /letters endpoint and browse filters
+can read a table instead of running GROUP BY over dict_terms.
+
+Counts cover top-level entries only, as TermRepository::get_letter_counts()
+does (parent_id IS NULL); empty values are left out (letter != '').
+"""
+
+import json
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+
+FACETS_VERSION = 1
+
+
+class FacetBuilder:
+    """Counts facet values one output entry at a time."""
+
+    def __init__(self):
+        self.total = 0
+        self.letters = Counter()
+        self.pos = Counter()
+        self.dialects = Counter()
+        self.letter_pos = defaultdict(Counter)
+
+    def add(self, entry):
+        """Count a top-level Entry."""
+        self.total += 1
+        if entry.letter:
+            self.letters[entry.letter] += 1
+        if entry.pos:
+            self.pos[entry.pos] += 1
+            if entry.letter:
+                self.letter_pos[entry.letter][entry.pos] += 1
+        if entry.dialect:
+            self.dialects[entry.dialect] += 1
+
+    def as_dict(self):
+        """
+        The facets document. letters is the {letter: count} map the /letters
+        endpoint returns, in ORDER BY letter order; the others are by count.
+        """
+        return {
+            'version': FACETS_VERSION,
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'total_entries': self.total,
+            'letters': dict(sorted(self.letters.items())),
+            'pos': dict(self.pos.most_common()),
+            'dialects': dict(self.dialects.most_common()),
+            'letter_pos': {
+                letter: dict(self.letter_pos[letter].most_common()) for letter in sorted(self.letter_pos)
+            },
+        }
+
+
+def write_facets(builder, path):
+    """Write the facets document. Returns it."""
+    facets = builder.as_dict()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(facets, ensure_ascii=False, separators=(',', ':')))
+    return facets
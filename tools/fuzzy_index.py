@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Ateso Fuzzy Headword Index
+Typo-tolerant headword matching: a SymSpell-style deletion dictionary over
+normalized headwords and plural forms, returning the nearest words within
+an edit distance of 1-2.
+
+Normalization absorbs the spelling variation that is not a typo in Ateso
+text: case, doubled vowels (aabaat / abaat) and apostrophes (ng' / ng).
+Unless a distance is given, it follows the length of the normalized query
+like Lucene's AUTO fuzziness, so short words are not drowned in neighbours.
+"""
+
+import re
+from collections import defaultdict
+
+
+MAX_DISTANCE = 2
+
+# Deletes are generated from this many leading characters only (SymSpell's
+# prefix length); longer words are still compared in full
+PREFIX_LENGTH = 9
+
+APOSTROPHE_RE = re.compile(r"['’ʼ`]")
+REPEATED_VOWEL_RE = re.compile(r'([aeiou])\1+')
+
+# (longest normalized query length, allowed distance), for AUTO fuzziness
+AUTO_DISTANCE = ((2, 0), (6, 1))
+
+
+def normalize_word(word):
+    """Lowercase, drop apostrophes, spell ŋ as ng and collapse doubled vowels."""
+    word = APOSTROPHE_RE.sub('', word.lower().replace('ŋ', 'ng'))
+    return REPEATED_VOWEL_RE.sub(r'\1', word)
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions,
+    adjacent transpositions) between a and b, or max_distance + 1 when it
+    is larger. Only the diagonal band |i - j| <= max_distance is computed.
+    """
+    # Shared prefix and suffix never add to the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if not a or not b:
+        return max(len(a), len(b))
+
+    over = max_distance + 1
+    previous2 = None
+    previous = [j if j <= max_distance else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        lo = max(1, i - max_distance)
+        hi = min(len(b), i + max_distance)
+        current = [over] * (len(b) + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        for j in range(lo, hi + 1):
+            cb = b[j - 1]
+            d = previous[j - 1] + (ca != cb)
+            if previous[j] + 1 < d:
+                d = previous[j] + 1
+            if current[j - 1] + 1 < d:
+                d = current[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and previous2[j - 2] + 1 < d:
+                d = previous2[j - 2] + 1
+            current[j] = d
+            if d < row_min:
+                row_min = d
+        if row_min > max_distance:
+            return over
+        previous2, previous = previous, current
+    return min(previous[-1], over)
+
+
+def auto_distance(query, max_distance=MAX_DISTANCE):
+    """Edit distance allowed for a normalized query of this length."""
+    for length, distance in AUTO_DISTANCE:
+        if len(query) <= length:
+            return min(distance, max_distance)
+    return max_distance
+
+
+def deletes(word, max_distance):
+    """Every string reachable from `word` by removing up to max_distance characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+class FuzzyIndex:
+    """
+    Deletion dictionary over headword forms. `add(form, ordinal)` registers
+    a surface form (headword or plural) for an entry ordinal; `lookup`
+    returns the nearest forms.
+    """
+
+    def __init__(self, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        # normalized form -> [(ordinal, is_plural)]
+        self.forms = defaultdict(list)
+        # delete of a form's prefix -> normalized forms
+        self.deletes = defaultdict(list)
+
+    def add(self, form, ordinal, is_plural=False):
+        """Register a surface form of the entry at `ordinal`."""
+        key = normalize_word(form)
+        if not key:
+            return
+        if key not in self.forms:
+            for d in deletes(key[:self.prefix_length], self.max_distance):
+                self.deletes[d].append(key)
+        self.forms[key].append((ordinal, is_plural))
+
+    def lookup(self, word, max_distance=None):
+        """
+        Forms within max_distance of `word` after normalization, as
+        (distance, ordinal, is_plural) sorted by distance. The default
+        distance depends on the query length (auto_distance).
+        """
+        query = normalize_word(word)
+        if not query:
+            return []
+        if max_distance is None:
+            max_distance = auto_distance(query, self.max_distance)
+        max_distance = min(max_distance, self.max_distance)
+
+        query_prefix = query[:self.prefix_length]
+        candidates = set()
+        for d in deletes(query_prefix, max_distance):
+            keys = self.deletes.get(d, ())
+            if max_distance < self.max_distance:
+                # Keys that needed more deletes than allowed to reach d are too far
+                longest = len(d) + max_distance
+                keys = [k for k in keys if min(len(k), self.prefix_length) <= longest]
+            candidates.update(keys)
+
+        matches = []
+        for key in candidates:
+            if abs(len(key) - len(query)) > max_distance:
+                continue
+            distance = edit_distance(query, key, max_distance)
+            if distance <= max_distance:
+                matches.extend((distance, ordinal, is_plural) for ordinal, is_plural in self.forms[key])
+        matches.sort()
+        return matches
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Import Rows
+Rows of the plugin tables (core/Database/Schema.php) for each output entry,
+built as ImportPage::handle_import_chunk() builds them, but with every id
+assigned up front: term, definition, example and relation ids count from 1
+in output order, sub-entries become child terms with their parent_id, and
+relations get their related_term_id from the build-time resolution of
+cross_refs.py. Shared by the SQLite export and the SQL dump.
+"""
+
+from cross_refs import CrossRefResolver
+
+
+class ImportRows:
+    """
+    Assigns ids and builds row tuples one entry at a time. Relations are
+    kept until resolved_relations(), after every term has an id.
+    """
+
+    TERM_COLUMNS = (
+        'id', 'word', 'slug', 'homonym_number', 'plural', 'pos', 'pos_detail', 'gender',
+        'dialect', 'verb_stem', 'letter', 'usage_labels', 'parent_id', 'sort_order',
+    )
+    DEFINITION_COLUMNS = ('id', 'term_id', 'definition_text', 'sort_order')
+    EXAMPLE_COLUMNS = ('id', 'term_id', 'ateso_text', 'english_text', 'sort_order')
+    RELATION_COLUMNS = ('id', 'term_id', 'related_term_id', 'related_word', 'relation_type')
+
+    def __init__(self):
+        self.term_id = 0
+        self.definition_id = 0
+        self.example_id = 0
+        self.relations = []
+        self.resolver = CrossRefResolver()
+        # Slug -> term id; the first term keeps a slug shared by several
+        self.slug_ids = {}
+
+    def entry_rows(self, entry, parent_id=None, sort_order=0):
+        """
+        (terms, definitions, examples) rows of an entry in the JSON output
+        shape, sub-entries included.
+        """
+        terms, definitions, examples = [], [], []
+        self.add_term(entry, parent_id, sort_order, terms, definitions, examples)
+        return terms, definitions, examples
+
+    def add_term(self, entry, parent_id, sort_order, terms, definitions, examples):
+        """Append the rows of one term and its sub-entries."""
+        self.term_id += 1
+        term_id = self.term_id
+        word = entry.get('word') or ''
+        slug = entry.get('slug') or word
+        self.resolver.add(word, slug, entry.get('homonym_number'), entry.get('plural'))
+        self.slug_ids.setdefault(slug, term_id)
+        terms.append((
+            term_id, word, slug, entry.get('homonym_number'),
+            entry.get('plural') or None, entry.get('pos') or '', entry.get('pos_detail') or None,
+            entry.get('gender') or None, entry.get('dialect') or None,
+            entry.get('verb_stem') or None, entry.get('letter') or '',
+            ', '.join(entry.get('usage_labels') or ()), parent_id, sort_order,
+        ))
+        for i, d in enumerate(entry.get('definitions') or ()):
+            self.definition_id += 1
+            definitions.append((self.definition_id, term_id, d.get('text') or '', i))
+            for ref in d.get('cp_refs') or ():
+                if ref:
+                    self.relations.append((term_id, ref))
+        for i, example in enumerate(entry.get('examples') or ()):
+            self.example_id += 1
+            examples.append((
+                self.example_id, term_id, example.get('ateso') or '', example.get('english') or '', i,
+            ))
+        for i, sub_entry in enumerate(entry.get('sub_entries') or ()):
+            self.add_term(sub_entry, term_id, i, terms, definitions, examples)
+
+    def resolved_relations(self):
+        """All relation rows, with related_term_id set where the reference resolves."""
+        rows = []
+        for relation_id, (term_id, ref) in enumerate(self.relations, 1):
+            target, _ = self.resolver.resolve(ref)
+            rows.append((relation_id, term_id, self.slug_ids.get(target), ref, 'cp'))
+        return rows
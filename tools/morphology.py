@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Morphology Index
+Build-time inverted index from the surface forms a reader is likely to type
+to the ordinals of the entries they belong to, so a plural, a prefixed verb
+form or a gender variant resolves with one hash probe instead of a chain of
+fallback LIKE queries. Forms come from what parse_entry() extracts and the
+prefixes the dictionary's own affix entries describe:
+
+    headword        akai
+    plural          akais, from the plural field
+    stem            duk, the verb headword aiduk without its infinitive
+                    prefix (ai-: "prefix forming infinitive of ko and ki verbs")
+    verb_prefix     the stem with the person and imperative prefixes of its
+                    class (verb_stem ko-a, ki-o, ...): a-, e-, ko-, ki- for
+                    ko-verbs, e-, i-, ki- for ki-verbs
+    gender_prefix   a noun with its gender prefix swapped among a- (feminine),
+                    e- (masculine) and i- (neuter, diminutive)
+
+Ordinals are positions in the converter output, as in search_index.py, and
+the document lists the slug at each ordinal so a reader can tell whether it
+was built from the output it is loaded with. Each form lists its entries
+best first: by kind in the order above, then in output order.
+"""
+
+import json
+from datetime import datetime, timezone
+
+from autocomplete import plural_forms
+
+
+MORPHOLOGY_VERSION = 2
+
+FORM_KINDS = ('headword', 'plural', 'stem', 'verb_prefix', 'gender_prefix')
+
+# Infinitive prefixes of verb headwords, longest first (aiduk, aanyit)
+INFINITIVE_PREFIXES = ('ai', 'a')
+
+# Person and imperative prefixes per verb class, from the a-, e-, i-, ko- and ki- entries
+VERB_PREFIXES = {
+    'ko': ('a', 'e', 'ko', 'ki'),
+    'ki': ('e', 'i', 'ki'),
+}
+
+# Noun gender prefixes, from the a-, e- and i- entries
+GENDER_PREFIXES = ('a', 'e', 'i')
+
+# Shortest stem or prefixed-noun remainder that still names a word
+MIN_STEM_LENGTH = 2
+
+
+def is_affix(word):
+    """Whether a headword is an affix entry (a-, -an, -ce-) rather than a word."""
+    return word.startswith('-') or word.endswith('-')
+
+
+def verb_stem(entry):
+    """The stem of a verb headword with a verb_stem class, without its infinitive prefix, or None."""
+    if not entry.verb_stem:
+        return None
+    word = entry.word.lower()
+    for prefix in INFINITIVE_PREFIXES:
+        if word.startswith(prefix) and len(word) - len(prefix) >= MIN_STEM_LENGTH:
+            return word[len(prefix):]
+    return None
+
+
+def surface_forms(entry):
+    """(kind, form) pairs an Entry can be looked up by, lowercased."""
+    word = entry.word.lower()
+    yield 'headword', word
+    if is_affix(word):
+        return
+    for form in plural_forms(entry.plural):
+        yield 'plural', form
+    stem = verb_stem(entry)
+    if stem:
+        yield 'stem', stem
+        for prefix in VERB_PREFIXES[entry.verb_stem[:2]]:
+            yield 'verb_prefix', prefix + stem
+    if (entry.pos == 'noun' and entry.gender and word[:1] in GENDER_PREFIXES
+            and len(word) - 1 >= MIN_STEM_LENGTH):
+        for prefix in GENDER_PREFIXES:
+            if prefix != word[0]:
+                yield 'gender_prefix', prefix + word[1:]
+
+
+class MorphologyBuilder:
+    """Accumulates the form index one output entry at a time."""
+
+    def __init__(self):
+        self.count = 0
+        self.slugs = []
+        self.forms = {}
+
+    def add(self, entry):
+        """Index the forms of an Entry as the next ordinal. Call in output order, after slugs are final."""
+        ordinal = self.count
+        self.count += 1
+        self.slugs.append(entry.slug)
+        for kind, form in surface_forms(entry):
+            postings = self.forms.setdefault(form, {})
+            kind_index = FORM_KINDS.index(kind)
+            if kind_index < postings.get(ordinal, len(FORM_KINDS)):
+                postings[ordinal] = kind_index
+
+    def as_dict(self):
+        """
+        The morphology document. forms maps a form to flat [ordinal, kind,
+        ordinal, kind, ...] pairs, kind indexing `kinds`.
+        """
+        forms = {}
+        by_kind = [0] * len(FORM_KINDS)
+        for form in sorted(self.forms):
+            postings = sorted(self.forms[form].items(), key=lambda p: (p[1], p[0]))
+            forms[form] = [value for posting in postings for value in posting]
+            for _, kind_index in postings:
+                by_kind[kind_index] += 1
+        return {
+            'version': MORPHOLOGY_VERSION,
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'entries': self.count,
+            'slugs': self.slugs,
+            'kinds': list(FORM_KINDS),
+            'by_kind': dict(zip(FORM_KINDS, by_kind)),
+            'forms': forms,
+        }
+
+
+def write_morphology(builder, path):
+    """Write the morphology document. Returns it."""
+    morphology = builder.as_dict()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(morphology, ensure_ascii=False, separators=(',', ':')))
+    return morphology
+
+
+def load_morphology(path):
+    """Read a morphology file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        morphology = json.load(f)
+    if morphology.get('version') != MORPHOLOGY_VERSION:
+        raise ValueError(f'{path}: unsupported morphology version {morphology.get("version")!r}')
+    return morphology
+
+
+class MorphologyIndex:
+    """Form lookups over a morphology document."""
+
+    def __init__(self, morphology):
+        self.entries = morphology['entries']
+        self.kinds = morphology['kinds']
+        self.forms = morphology['forms']
+
+    def lookup(self, form):
+        """(ordinal, kind) pairs of the entries a form belongs to, best first."""
+        postings = self.forms.get(form.strip().lower())
+        if not postings:
+            return []
+        return [(postings[i], self.kinds[postings[i + 1]]) for i in range(0, len(postings), 2)]
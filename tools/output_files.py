@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Output Files
+Where the converter puts its output files and how to read the entries back,
+shared by convert_dictionary.py and the read-side tools such as
+dictionary_index.py without pulling in the converter and its backends.
+"""
+
+import os
+import json
+
+
+def sidecar_path(output_file, suffix):
+    """Path of a file written next to the output, e.g. data.json -> data.delta.json."""
+    return os.path.splitext(output_file)[0] + suffix
+
+
+def part_path(output_file, index):
+    """Path of one split part, e.g. data.json -> data.part001.json."""
+    base, ext = os.path.splitext(output_file)
+    return f'{base}.part{index:03d}.json'
+
+
+def iter_ndjson_entries(path):
+    """Read entries back from an NDJSON output, skipping the metadata line."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if 'metadata' not in record:
+                yield record
+
+
+def iter_part_entries(output_file):
+    """Read entries back from the parts listed in a split output's manifest."""
+    manifest_file = sidecar_path(output_file, '.manifest.json')
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    directory = os.path.dirname(manifest_file)
+    for part in manifest['parts']:
+        with open(os.path.join(directory, part['file']), 'r', encoding='utf-8') as f:
+            yield from json.load(f)['entries']
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Converter Profiling Helpers
+Per-step wall/CPU/peak-RSS timing, per-regex hit counting and per-function
+timing used by the --profile flag of convert_dictionary.py.
+"""
+
+import re
+import sys
+import time
+import functools
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process and its children in KB, or None."""
+    if resource is None:
+        return None
+    peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        peak //= 1024
+    return peak
+
+
+class StepProfiler:
+    """Records wall time, CPU time and peak RSS for named steps."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.steps = []
+
+    @contextmanager
+    def step(self, name):
+        """Context manager timing one step. Does nothing when disabled."""
+        if not self.enabled:
+            yield
+            return
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.steps.append({
+                'step': name,
+                'wall': time.perf_counter() - wall_start,
+                'cpu': time.process_time() - cpu_start,
+                'peak_rss_kb': peak_rss_kb(),
+            })
+
+    def report(self):
+        """Print the per-step table."""
+        print('\n--- Profile: steps ---')
+        print(f'  {"step":34s} {"wall":>9s} {"cpu":>9s} {"peak RSS":>12s}')
+        for s in self.steps:
+            rss = f'{s["peak_rss_kb"]:,} KB' if s['peak_rss_kb'] is not None else 'n/a'
+            print(f'  {s["step"]:34s} {s["wall"]:8.3f}s {s["cpu"]:8.3f}s {rss:>12s}')
+
+
+class ProfiledPattern:
+    """
+    Stand-in for a compiled pattern that counts calls, matches and the time
+    spent inside the regex engine. Everything else is delegated.
+    """
+
+    def __init__(self, name, pattern):
+        self.name = name
+        self.compiled = pattern
+        self.calls = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+    def __getattr__(self, attr):
+        return getattr(self.compiled, attr)
+
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        self.seconds += time.perf_counter() - start
+        self.calls += 1
+        return result
+
+    def search(self, *args, **kwargs):
+        m = self._timed(self.compiled.search, *args, **kwargs)
+        self.hits += m is not None
+        return m
+
+    def match(self, *args, **kwargs):
+        m = self._timed(self.compiled.match, *args, **kwargs)
+        self.hits += m is not None
+        return m
+
+    def fullmatch(self, *args, **kwargs):
+        m = self._timed(self.compiled.fullmatch, *args, **kwargs)
+        self.hits += m is not None
+        return m
+
+    def findall(self, *args, **kwargs):
+        found = self._timed(self.compiled.findall, *args, **kwargs)
+        self.hits += len(found)
+        return found
+
+    def finditer(self, *args, **kwargs):
+        self.calls += 1
+        iterator = self.compiled.finditer(*args, **kwargs)
+        while True:
+            start = time.perf_counter()
+            m = next(iterator, None)
+            self.seconds += time.perf_counter() - start
+            if m is None:
+                return
+            self.hits += 1
+            yield m
+
+    def subn(self, *args, **kwargs):
+        result, count = self._timed(self.compiled.subn, *args, **kwargs)
+        self.hits += count
+        return result, count
+
+    def sub(self, *args, **kwargs):
+        return self.subn(*args, **kwargs)[0]
+
+    def split(self, *args, **kwargs):
+        parts = self._timed(self.compiled.split, *args, **kwargs)
+        self.hits += len(parts) - 1
+        return parts
+
+
+def instrument_patterns(module):
+    """
+    Replace the module-level compiled patterns (NAME_RE globals, and the
+    (label, pattern) tables that hold them) with ProfiledPattern proxies.
+    Returns the proxies.
+    """
+    proxies = {}
+    for name, value in list(vars(module).items()):
+        if name.endswith('_RE') and isinstance(value, re.Pattern):
+            proxies[id(value)] = ProfiledPattern(name, value)
+            setattr(module, name, proxies[id(value)])
+
+    for name, value in list(vars(module).items()):
+        if (isinstance(value, tuple) and value
+                and all(isinstance(item, tuple) and len(item) == 2
+                        and id(item[1]) in proxies for item in value)):
+            setattr(module, name, tuple((label, proxies[id(p)]) for label, p in value))
+
+    return list(proxies.values())
+
+
+def report_patterns(proxies):
+    """Print per-pattern calls, hits and cumulative regex time, slowest first."""
+    print('\n--- Profile: regex patterns ---')
+    print(f'  {"pattern":22s} {"calls":>10s} {"hits":>10s} {"time":>9s}')
+    for p in sorted(proxies, key=lambda p: p.seconds, reverse=True):
+        print(f'  {p.name:22s} {p.calls:>10,} {p.hits:>10,} {p.seconds:8.3f}s')
+
+
+class ProfiledFunction:
+    """Wrapper counting calls and cumulative time of a module-level function."""
+
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+        self.calls = 0
+        self.seconds = 0.0
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.calls += 1
+
+
+def instrument_functions(module, names):
+    """Wrap the named module-level functions in ProfiledFunction. Returns the wrappers."""
+    wrappers = []
+    for name in names:
+        wrapper = ProfiledFunction(name, getattr(module, name))
+        setattr(module, name, wrapper)
+        wrappers.append(wrapper)
+    return wrappers
+
+
+def report_functions(wrappers):
+    """Print per-function calls and cumulative time (nested calls included)."""
+    print('\n--- Profile: functions ---')
+    print(f'  {"function":28s} {"calls":>10s} {"time":>9s}')
+    for w in wrappers:
+        print(f'  {w.name:28s} {w.calls:>10,} {w.seconds:8.3f}s')
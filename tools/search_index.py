@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Search Index
+Compact lookup index written next to the converter output: a sorted headword
+array for prefix binary search, inverted indexes from English definition and
+example tokens to entry ordinals, and trigram postings over definition text
+for infix (LIKE '%q%') matching.
+
+Entry ordinals are positions in the converter output (the entries array, the
+NDJSON lines, or the parts of a split build in manifest order). Posting lists
+are sorted and delta-encoded.
+"""
+
+import re
+import json
+from itertools import accumulate
+from collections import defaultdict
+from datetime import datetime, timezone
+
+
+INDEX_VERSION = 1
+
+# English word token: letters/digits with optional apostrophe parts (don't, o'clock)
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)*")
+
+
+def tokenize(text):
+    """Lowercased English tokens of a text, in order."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def trigrams(text):
+    """Set of lowercased 3-character substrings of a text."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def delta_encode(ordinals):
+    """Encode a sorted list of ordinals as gaps."""
+    return [b - a for a, b in zip([0] + ordinals, ordinals)]
+
+
+def delta_decode(gaps):
+    """Decode a delta-encoded posting list back to ordinals."""
+    return list(accumulate(gaps))
+
+
+class SearchIndexBuilder:
+    """Accumulates the search index one output entry at a time."""
+
+    def __init__(self):
+        self.count = 0
+        self.headwords = []
+        self.slugs = []
+        self.tokens = defaultdict(list)
+        self.example_tokens = defaultdict(list)
+        self.trigrams = defaultdict(list)
+
+    def add(self, entry):
+        """Index an Entry as the next ordinal. Call in output order, after slugs are final."""
+        ordinal = self.count
+        self.count += 1
+        self.headwords.append((entry.word.lower(), entry.homonym_number or 0, ordinal))
+        self.slugs.append(entry.slug)
+
+        definition_tokens = set()
+        definition_trigrams = set()
+        for d in entry.definitions:
+            definition_tokens.update(tokenize(d.text))
+            definition_trigrams.update(trigrams(d.text))
+        for token in definition_tokens:
+            self.tokens[token].append(ordinal)
+        for gram in definition_trigrams:
+            self.trigrams[gram].append(ordinal)
+
+        example_tokens = set()
+        for example in entry.examples:
+            example_tokens.update(tokenize(example.english))
+        for token in example_tokens:
+            self.example_tokens[token].append(ordinal)
+
+    def as_dict(self):
+        """The index document. Ordinals are appended in order, so postings are already sorted."""
+        headwords = sorted(self.headwords)
+        return {
+            'version': INDEX_VERSION,
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'entries': self.count,
+            'postings': 'delta',
+            'slugs': self.slugs,
+            'headwords': [word for word, _, _ in headwords],
+            'headword_ordinals': [ordinal for _, _, ordinal in headwords],
+            'tokens': {t: delta_encode(o) for t, o in sorted(self.tokens.items())},
+            'example_tokens': {t: delta_encode(o) for t, o in sorted(self.example_tokens.items())},
+            'trigrams': {g: delta_encode(o) for g, o in sorted(self.trigrams.items())},
+        }
+
+
+def write_search_index(builder, path):
+    """Write the index as compact JSON. Returns the index document."""
+    index = builder.as_dict()
+    # json.dumps() uses the C encoder; json.dump() to a file does not
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(index, ensure_ascii=False, separators=(',', ':')))
+    return index
+
+
+def load_search_index(path):
+    """Read an index file, decoding every posting list to sorted ordinals."""
+    with open(path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if index.get('version') != INDEX_VERSION:
+        raise ValueError(f'{path}: unsupported search index version {index.get("version")!r}')
+    for key in ('tokens', 'example_tokens', 'trigrams'):
+        index[key] = {k: delta_decode(v) for k, v in index[key].items()}
+    return index
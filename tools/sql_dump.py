@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary SQL Dump
+A MySQL/MariaDB script that reloads the plugin tables in one go, instead of
+posting the JSON through the admin importer chunk by chunk:
+
+    mysql wordpress < ateso-dictionary-data.sql
+
+It empties the four tables and refills them with multi-row INSERTs in a
+single transaction. The tables are emptied with DELETE rather than TRUNCATE,
+which would commit implicitly and leave them empty if the load failed. Every id is precomputed (see import_rows.py), including
+parent_id and related_term_id, so no resolve step is needed afterwards.
+
+String literals only double their quotes: the script turns on
+NO_BACKSLASH_ESCAPES for its session, which also keeps the INSERTs valid
+SQLite.
+"""
+
+from datetime import datetime, timezone
+
+from import_rows import ImportRows
+
+
+DEFAULT_TABLE_PREFIX = 'wp_'
+
+# Upper bound for one INSERT statement in characters (about bytes for this
+# mostly ASCII text); max_allowed_packet defaults to 4 MB or more
+MAX_INSERT_BYTES = 1024 * 1024
+
+TABLE_COLUMNS = (
+    ('dict_terms', ImportRows.TERM_COLUMNS),
+    ('dict_definitions', ImportRows.DEFINITION_COLUMNS),
+    ('dict_examples', ImportRows.EXAMPLE_COLUMNS),
+    ('dict_relations', ImportRows.RELATION_COLUMNS),
+)
+
+DUMP_HEADER = """-- Ateso dictionary bulk load, generated {generated_at}
+-- Replaces the contents of the {prefix}dict_* tables.
+SET NAMES utf8mb4;
+SET SESSION sql_mode = CONCAT_WS(',', NULLIF(@@SESSION.sql_mode, ''), 'NO_BACKSLASH_ESCAPES');
+SET foreign_key_checks = 0;
+SET unique_checks = 0;
+START TRANSACTION;
+DELETE FROM `{prefix}dict_relations`;
+DELETE FROM `{prefix}dict_examples`;
+DELETE FROM `{prefix}dict_definitions`;
+DELETE FROM `{prefix}dict_terms`;
+"""
+
+DUMP_FOOTER = """COMMIT;
+SET unique_checks = 1;
+SET foreign_key_checks = 1;
+"""
+
+
+def sql_value(value):
+    """A Python value as a SQL literal (NO_BACKSLASH_ESCAPES quoting)."""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, int):
+        return str(value)
+    return "'" + value.replace("'", "''") + "'"
+
+
+class InsertBuffer:
+    """Collects the rows of one table into multi-row INSERT statements of bounded size."""
+
+    def __init__(self, out, table, columns):
+        self.out = out
+        self.head = f'INSERT INTO `{table}` ({", ".join(f"`{c}`" for c in columns)}) VALUES\n'
+        self.values = []
+        self.size = len(self.head)
+        self.rows = 0
+
+    def add(self, row):
+        """Queue one row, writing the statement first if it would grow too large."""
+        text = '(' + ','.join(sql_value(v) for v in row) + ')'
+        if self.values and self.size + len(text) + 2 > MAX_INSERT_BYTES:
+            self.flush()
+        self.values.append(text)
+        self.size += len(text) + 2
+        self.rows += 1
+
+    def flush(self):
+        """Write the queued rows as one statement."""
+        if self.values:
+            self.out.write(self.head)
+            self.out.write(',\n'.join(self.values))
+            self.out.write(';\n')
+        self.values = []
+        self.size = len(self.head)
+
+
+class SqlDumpWriter:
+    """Writes the SQL dump one Entry at a time, in output order. Call close() to finish."""
+
+    def __init__(self, path, prefix=DEFAULT_TABLE_PREFIX):
+        self.path = path
+        self.out = open(path, 'w', encoding='utf-8')
+        self.out.write(DUMP_HEADER.format(
+            generated_at=datetime.now(timezone.utc).isoformat(), prefix=prefix,
+        ))
+        self.rows = ImportRows()
+        self.buffers = [InsertBuffer(self.out, prefix + table, columns) for table, columns in TABLE_COLUMNS]
+
+    def add(self, entry):
+        """Queue the rows of one Entry."""
+        terms, definitions, examples, _ = self.buffers
+        term_rows, definition_rows, example_rows = self.rows.entry_rows(entry.to_dict())
+        for row in term_rows:
+            terms.add(row)
+        for row in definition_rows:
+            definitions.add(row)
+        for row in example_rows:
+            examples.add(row)
+
+    def close(self):
+        """Write the remaining rows and the resolved relations. Returns {table: rows}."""
+        relations = self.buffers[-1]
+        for row in self.rows.resolved_relations():
+            relations.add(row)
+        for buffer in self.buffers:
+            buffer.flush()
+        self.out.write(DUMP_FOOTER)
+        self.out.close()
+        return {table: buffer.rows for (table, _), buffer in zip(TABLE_COLUMNS, self.buffers)}
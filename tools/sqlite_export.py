@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary SQLite Export
+A ready-to-query SQLite database with the tables and indexes of
+core/Database/Schema.php (without the WordPress table prefix), filled the
+way the plugin's importer fills them, plus FTS5 indexes over definitions and
+examples in place of the MySQL FULLTEXT key.
+
+Text columns MySQL compares case-insensitively (utf8mb4 collations) are
+declared COLLATE NOCASE, so LIKE, = and ORDER BY behave as on the site for
+ASCII headwords. updated_at has no ON UPDATE in SQLite; the export is
+read-only.
+"""
+
+import os
+import sqlite3
+
+from import_rows import ImportRows
+
+
+TABLES = (
+    '''CREATE TABLE dict_terms (
+        id INTEGER PRIMARY KEY,
+        word TEXT NOT NULL COLLATE NOCASE,
+        slug TEXT NOT NULL COLLATE NOCASE,
+        homonym_number INTEGER DEFAULT NULL,
+        plural TEXT DEFAULT NULL,
+        pos TEXT NOT NULL DEFAULT '',
+        pos_detail TEXT DEFAULT NULL,
+        gender TEXT DEFAULT NULL,
+        dialect TEXT DEFAULT NULL,
+        verb_stem TEXT DEFAULT NULL,
+        letter TEXT NOT NULL DEFAULT '',
+        usage_labels TEXT DEFAULT NULL,
+        parent_id INTEGER DEFAULT NULL,
+        sort_order INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )''',
+    '''CREATE TABLE dict_definitions (
+        id INTEGER PRIMARY KEY,
+        term_id INTEGER NOT NULL,
+        definition_text TEXT NOT NULL,
+        sort_order INTEGER NOT NULL DEFAULT 0
+    )''',
+    '''CREATE TABLE dict_examples (
+        id INTEGER PRIMARY KEY,
+        term_id INTEGER NOT NULL,
+        definition_id INTEGER DEFAULT NULL,
+        ateso_text TEXT NOT NULL,
+        english_text TEXT NOT NULL,
+        sort_order INTEGER NOT NULL DEFAULT 0
+    )''',
+    '''CREATE TABLE dict_relations (
+        id INTEGER PRIMARY KEY,
+        term_id INTEGER NOT NULL,
+        related_term_id INTEGER DEFAULT NULL,
+        related_word TEXT NOT NULL COLLATE NOCASE,
+        relation_type TEXT NOT NULL DEFAULT 'cp'
+    )''',
+)
+
+# Created after the bulk load, which is faster than maintaining them row by row
+INDEXES = (
+    'CREATE INDEX idx_word ON dict_terms (word)',
+    'CREATE INDEX idx_slug ON dict_terms (slug)',
+    'CREATE INDEX idx_letter ON dict_terms (letter)',
+    'CREATE INDEX idx_pos ON dict_terms (pos)',
+    'CREATE INDEX idx_parent_id ON dict_terms (parent_id)',
+    'CREATE INDEX idx_definitions_term_id ON dict_definitions (term_id)',
+    'CREATE INDEX idx_examples_term_id ON dict_examples (term_id)',
+    'CREATE INDEX idx_examples_definition_id ON dict_examples (definition_id)',
+    'CREATE INDEX idx_relations_term_id ON dict_relations (term_id)',
+    'CREATE INDEX idx_related_term_id ON dict_relations (related_term_id)',
+    'CREATE INDEX idx_relation_type ON dict_relations (relation_type)',
+)
+
+# External-content FTS5 tables: the text lives only in the base tables.
+# prefix='2 3' keeps short prefix queries (wat*) off a full term scan.
+FTS_TABLES = (
+    '''CREATE VIRTUAL TABLE dict_definitions_fts USING fts5(
+        definition_text, content='dict_definitions', content_rowid='id', prefix='2 3'
+    )''',
+    '''CREATE VIRTUAL TABLE dict_examples_fts USING fts5(
+        ateso_text, english_text, content='dict_examples', content_rowid='id', prefix='2 3'
+    )''',
+)
+
+# Journal and fsync are pointless for a file that is rebuilt from scratch
+BULK_LOAD_PRAGMAS = (
+    'PRAGMA journal_mode = OFF',
+    'PRAGMA synchronous = OFF',
+    'PRAGMA locking_mode = EXCLUSIVE',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -65536',
+)
+
+# Entries buffered between executemany() calls
+SQLITE_BATCH_SIZE = 1000
+
+
+def fts_query(text):
+    """
+    FTS5 MATCH expression for free text: every word quoted (so user input
+    cannot inject FTS syntax) and OR-ed together, like FULLTEXT natural
+    language mode.
+    """
+    words = text.split()
+    return ' OR '.join('"' + w.replace('"', '""') + '"' for w in words)
+
+
+def insert_sql(table, columns):
+    """INSERT statement with one placeholder per column."""
+    return f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})'
+
+
+class SqliteExporter:
+    """
+    Writes the SQLite export one Entry at a time, in output order. Rows come
+    from ImportRows with their ids assigned and go in with executemany() in
+    a single transaction. Call close() to add the resolved relations and
+    build the indexes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path):
+            os.remove(path)
+        self.db = sqlite3.connect(path, isolation_level=None)
+        for pragma in BULK_LOAD_PRAGMAS:
+            self.db.execute(pragma)
+        self.db.execute('BEGIN')
+        for sql in TABLES + FTS_TABLES:
+            self.db.execute(sql)
+        self.rows = ImportRows()
+        self.pending = 0
+        self.terms = []
+        self.definitions = []
+        self.examples = []
+
+    def add(self, entry):
+        """Queue the rows of one Entry."""
+        terms, definitions, examples = self.rows.entry_rows(entry.to_dict())
+        self.terms.extend(terms)
+        self.definitions.extend(definitions)
+        self.examples.extend(examples)
+        self.pending += 1
+        if self.pending >= SQLITE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Insert the queued rows."""
+        self.db.executemany(insert_sql('dict_terms', ImportRows.TERM_COLUMNS), self.terms)
+        self.db.executemany(insert_sql('dict_definitions', ImportRows.DEFINITION_COLUMNS), self.definitions)
+        self.db.executemany(insert_sql('dict_examples', ImportRows.EXAMPLE_COLUMNS), self.examples)
+        self.pending = 0
+        self.terms = []
+        self.definitions = []
+        self.examples = []
+
+    def close(self):
+        """
+        Insert what is left and the relations, build indexes and full-text
+        indexes and commit. Returns {table: row count}.
+        """
+        self.flush()
+        self.db.executemany(
+            insert_sql('dict_relations', ImportRows.RELATION_COLUMNS), self.rows.resolved_relations()
+        )
+        for sql in INDEXES:
+            self.db.execute(sql)
+        self.db.execute("INSERT INTO dict_definitions_fts (dict_definitions_fts) VALUES ('rebuild')")
+        self.db.execute("INSERT INTO dict_examples_fts (dict_examples_fts) VALUES ('rebuild')")
+        self.db.execute('COMMIT')
+        self.db.execute('ANALYZE')
+        counts = {
+            table: self.db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('dict_terms', 'dict_definitions', 'dict_examples', 'dict_relations')
+        }
+        counts['resolved_relations'] = self.db.execute(
+            'SELECT COUNT(*) FROM dict_relations WHERE related_term_id IS NOT NULL'
+        ).fetchone()[0]
+        self.db.close()
+        return counts
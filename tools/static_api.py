@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Static API
+Pre-rendered responses of the dictionary/v1 REST routes
+(core/Api/RestController.php) as a tree of static JSON files, so a CDN or an
+offline copy can serve lookups without PHP or MySQL:
+
+    word/<slug>.json                   GET /word/<slug>
+    search/<letter>/<page>.json        GET /search?letter=<letter>&page=<page>
+    letters.json                       GET /letters
+    word-of-the-day/<YYYY-MM-DD>.json  GET /word-of-the-day on that date
+    autocomplete/<prefix>.json         headwords starting with a 1-2 character prefix
+    manifest.json                      counts and layout of this tree
+
+Response shapes and ids are those of a fresh import (see import_rows.py);
+browse pages follow SearchQuery::execute() in browse mode. Letters are
+written as /letters lists them and autocomplete prefixes lowercased; path
+parts are percent-encoded. Every file gets a .gz next to it, and a .br when
+the brotli module is installed, unless compressing does not make it
+smaller, so gzip_static / brotli_static style serving can pick them up.
+"""
+
+import os
+import json
+import gzip
+from collections import defaultdict
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from import_rows import ImportRows
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+
+STATIC_API_VERSION = 1
+
+# Default page size of the /search route
+DEFAULT_PER_PAGE = 20
+
+# Characters of a headword that name its autocomplete shard
+PREFIX_LENGTH = 2
+
+# SUBSTRING(definition_text, 1, 150) of SearchQuery
+PREVIEW_LENGTH = 150
+
+
+def path_part(text):
+    """A path segment for arbitrary text: percent-encoded, as a URL would carry it."""
+    return quote(text, safe='')
+
+
+def compressed_variants(data):
+    """(suffix, bytes) of the precompressed variants of some bytes."""
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data)))
+    return variants
+
+
+class StaticApiWriter:
+    """
+    Writes the static API one Entry at a time, in output order. Word files
+    without cp. references are written as their entry passes; the others,
+    the browse pages and the autocomplete shards wait for close(), when
+    every term id is known.
+    """
+
+    def __init__(self, directory, per_page=DEFAULT_PER_PAGE, site_url=''):
+        self.path = directory
+        self.per_page = per_page
+        self.site_url = site_url.rstrip('/')
+        self.rows = ImportRows()
+        self.terms = {}
+        self.pending = {}
+        self.summaries = defaultdict(list)
+        self.files = 0
+        self.bytes = 0
+        self.compressed = 0
+
+    def url(self, slug):
+        """home_url('/dictionary/<slug>/') relative to site_url."""
+        return f'{self.site_url}/dictionary/{slug}/'
+
+    def write(self, parts, document):
+        """Write one response document and its compressed variants."""
+        path = os.path.join(self.path, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        self.files += 1
+        self.bytes += len(data)
+        for suffix, packed in compressed_variants(data):
+            if len(packed) < len(data):
+                with open(path + suffix, 'wb') as f:
+                    f.write(packed)
+                self.compressed += 1
+
+    def add(self, entry):
+        """Render the rows of one Entry. Call after slugs are final."""
+        relations = len(self.rows.relations)
+        terms, definitions, examples = self.rows.entry_rows(entry.to_dict())
+        for term_id, word, slug, *_ in terms:
+            self.terms[term_id] = (word, slug)
+        term = dict(zip(ImportRows.TERM_COLUMNS, terms[0]))
+        term_id = term['id']
+        texts = [text for _, owner, text, _ in definitions if owner == term_id]
+
+        document = {
+            'id': term_id,
+            'word': term['word'],
+            'slug': term['slug'],
+            'homonym_number': term['homonym_number'] or None,
+            'plural': term['plural'],
+            'pos': term['pos'],
+            'pos_detail': term['pos_detail'],
+            'gender': term['gender'],
+            'dialect': term['dialect'],
+            'verb_stem': term['verb_stem'],
+            'usage_labels': term['usage_labels'],
+            'letter': term['letter'],
+            'definitions': [
+                {'id': definition_id, 'text': text}
+                for definition_id, owner, text, _ in definitions if owner == term_id
+            ],
+            'examples': [
+                {'ateso': ateso, 'english': english}
+                for _, owner, ateso, english, _ in examples if owner == term_id
+            ],
+            'relations': [],
+            'url': self.url(term['slug']),
+        }
+        if any(owner == term_id for owner, _ in self.rows.relations[relations:]):
+            self.pending[term_id] = document
+        else:
+            self.write(('word', path_part(term['slug']) + '.json'), document)
+
+        summary = {
+            'id': term_id,
+            'word': term['word'],
+            'slug': term['slug'],
+            'homonym_number': term['homonym_number'] or None,
+            'pos': term['pos'],
+            'pos_detail': term['pos_detail'],
+            'gender': term['gender'],
+            'plural': term['plural'],
+            'dialect': term['dialect'],
+            'verb_stem': term['verb_stem'],
+            'definition_preview': texts[0][:PREVIEW_LENGTH] if texts else '',
+            'url': self.url(term['slug']),
+        }
+        key = (term['word'].lower(), term['homonym_number'] or 0, term_id)
+        self.summaries[term['letter']].append((key, summary))
+
+    def write_words(self):
+        """Write the word files that wait for resolved relations."""
+        relations = defaultdict(list)
+        for _, term_id, related_id, ref, kind in self.rows.resolved_relations():
+            if term_id in self.pending:
+                word, slug = self.terms.get(related_id, (None, None))
+                relations[term_id].append({'word': ref, 'type': kind, 'slug': slug, 'resolved_word': word})
+        for term_id, document in self.pending.items():
+            document['relations'] = relations[term_id]
+            self.write(('word', path_part(document['slug']) + '.json'), document)
+        self.pending = {}
+
+    def write_browse(self):
+        """Write the letter browse pages and the letter counts. Returns {letter: count}."""
+        counts = {}
+        for letter in sorted(filter(None, self.summaries)):
+            items = [summary for _, summary in sorted(self.summaries[letter], key=lambda s: s[0])]
+            counts[letter] = len(items)
+            pages = -(-len(items) // self.per_page)
+            for page in range(1, pages + 1):
+                self.write(('search', path_part(letter), f'{page}.json'), {
+                    'results': items[(page - 1) * self.per_page:page * self.per_page],
+                    'total': len(items),
+                    'pages': pages,
+                    'current_page': page,
+                })
+        self.write(('letters.json',), counts)
+        return counts
+
+    def write_autocomplete(self):
+        """Write one shard per headword prefix, sorted like the browse pages. Returns the shard count."""
+        shards = defaultdict(list)
+        for letter_summaries in self.summaries.values():
+            for key, summary in letter_summaries:
+                prefix = key[0][:PREFIX_LENGTH]
+                if prefix.strip():
+                    shards[prefix].append((key, {
+                        'word': summary['word'],
+                        'slug': summary['slug'],
+                        'homonym_number': summary['homonym_number'],
+                        'pos': summary['pos'],
+                        'definition_preview': summary['definition_preview'],
+                    }))
+        for prefix, items in shards.items():
+            self.write(('autocomplete', path_part(prefix) + '.json'),
+                       [item for _, item in sorted(items, key=lambda s: s[0])])
+        return len(shards)
+
+    def write_word_of_the_day(self, wotd):
+        """Write one format_wotd() response per scheduled date of a word_of_the_day document."""
+        for record in wotd['schedule']:
+            self.write(('word-of-the-day', record['date'] + '.json'), {
+                'id': self.rows.slug_ids.get(record['slug']),
+                'word': record['word'],
+                'slug': record['slug'],
+                'homonym_number': record['homonym_number'],
+                'pos': record['pos'],
+                'pos_detail': record['pos_detail'],
+                'plural': record['plural'],
+                'gender': record['gender'],
+                'definition_preview': record['definition_preview'],
+                'url': self.url(record['slug']),
+            })
+        return len(wotd['schedule'])
+
+    def close(self, wotd=None):
+        """
+        Write everything that waited for the last entry, the Word of the Day
+        files for a schedule document if given, and the manifest. Returns the
+        manifest.
+        """
+        self.write_words()
+        counts = self.write_browse()
+        shards = self.write_autocomplete()
+        days = self.write_word_of_the_day(wotd) if wotd else 0
+        manifest = {
+            'version': STATIC_API_VERSION,
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'per_page': self.per_page,
+            'prefix_length': PREFIX_LENGTH,
+            'words': sum(len(summaries) for summaries in self.summaries.values()),
+            'letters': len(counts),
+            'autocomplete_shards': shards,
+            'word_of_the_day_days': days,
+            'encodings': ['gzip'] + (['br'] if brotli is not None else []),
+        }
+        self.write(('manifest.json',), manifest)
+        manifest['files'] = self.files
+        manifest['bytes'] = self.bytes
+        manifest['compressed_files'] = self.compressed
+        return manifest
@@ -0,0 +1,71 @@
+"""
+Ateso Dictionary Binary Export Test
+Round trip of the .bin export: every entry, headword and slug lookup of the
+binary file written by `convert_dictionary.py --binary` has to match the
+JSON output of the same run.
+
+Run from the repository root:
+    python -m unittest discover -s tools/tests
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+import contextlib
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOLS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, TOOLS_DIR)
+
+import convert_dictionary
+from binary_dictionary import BinaryDictionary
+from output_files import sidecar_path
+
+SOURCE = os.path.join(os.path.dirname(TOOLS_DIR), 'ateso_dict.txt')
+
+
+class BinaryRoundTripTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        json_path = os.path.join(cls.tmp.name, 'out.json')
+        with contextlib.redirect_stdout(None):
+            convert_dictionary.main([SOURCE, json_path, '--binary'])
+        with open(json_path, 'r', encoding='utf-8') as f:
+            cls.entries = json.load(f)['entries']
+        cls.binary = BinaryDictionary(sidecar_path(json_path, '.bin'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.binary.close()
+        cls.tmp.cleanup()
+
+    def test_every_entry(self):
+        self.assertEqual(len(self.binary), len(self.entries))
+        self.assertEqual(sorted(self.binary.ordinal(p) for p in range(len(self.binary))),
+                         list(range(len(self.entries))))
+        for position in range(len(self.binary)):
+            expected = self.entries[self.binary.ordinal(position)]
+            self.assertEqual(self.binary.entry_at(position), expected)
+            with self.binary.headword(position) as headword:
+                self.assertEqual(bytes(headword).decode('utf-8'), expected['word'])
+
+    def test_sorted_by_slug(self):
+        slugs = [self.binary.slug_bytes(p) for p in range(len(self.binary))]
+        self.assertEqual(slugs, sorted(slugs))
+
+    def test_get_by_slug(self):
+        # Slug lookups return the first entry in output order with that slug
+        first = {}
+        for entry in self.entries:
+            first.setdefault(entry['slug'], entry)
+        for slug, entry in first.items():
+            self.assertEqual(self.binary.get(slug), entry, slug)
+        self.assertIsNone(self.binary.get('no-such-slug'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Ateso Dictionary Parser Golden Test
+data/ateso_dict.golden.ndjson.gz holds, for every aggregated raw entry of
+ateso_dict.txt, its source line and the fields the converter's parse_entry
+returned before the parser was reworked (null if it did not parse). Every
+field of every entry parse_entry returns now has to match it.
+
+Run from the repository root:
+    python -m unittest discover -s tools/tests
+"""
+
+import os
+import sys
+import gzip
+import json
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOLS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, TOOLS_DIR)
+
+import dictionary_parser as dp
+from wxr_export import wxr_pos
+
+SOURCE = os.path.join(os.path.dirname(TOOLS_DIR), 'ateso_dict.txt')
+GOLDEN_PARSE = os.path.join(TESTS_DIR, 'data', 'ateso_dict.golden.ndjson.gz')
+
+# Differences listed in a failure message before the rest are only counted
+SHOWN_DIFFERENCES = 20
+
+# Indefinite and personal pronouns: the JSON output files them under noun,
+# as it always has, and only the WXR export gives them the pronoun term
+PRONOUN_HEADWORDS = (
+    'ekasilon', 'icebore', 'icetunganan', 'idiobore', 'idiotunganan',
+    'iyo', 'kesi', 'kijokis', 'obe',
+)
+
+
+def parsed_records():
+    """{'line', 'entry'} of every aggregated raw entry; entry is None if it does not parse."""
+    for raw_text, line_num in dp.iter_raw_entries(SOURCE):
+        entry = dp.parse_entry(raw_text, line_num)
+        yield {'line': line_num, 'entry': entry.to_dict() if entry else None}
+
+
+def field_differences(expected, actual, path):
+    """Yield (path, expected, actual) for every field where two parsed values differ."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in list(expected) + [k for k in actual if k not in expected]:
+            yield from field_differences(expected.get(key), actual.get(key), f'{path}.{key}')
+    elif isinstance(expected, list) and isinstance(actual, list) and len(expected) == len(actual):
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            yield from field_differences(a, b, f'{path}[{i}]')
+    elif expected != actual:
+        yield path, expected, actual
+
+
+class GoldenParseTest(unittest.TestCase):
+
+    def test_every_field_of_every_entry(self):
+        with gzip.open(GOLDEN_PARSE, 'rt', encoding='utf-8') as f:
+            golden = [json.loads(line) for line in f]
+        parsed = list(parsed_records())
+        self.assertEqual(len(parsed), len(golden), 'number of aggregated raw entries')
+
+        differences = []
+        for expected, actual in zip(golden, parsed):
+            differences.extend(field_differences(expected, actual, f'line {expected["line"]}'))
+        shown = '\n'.join(f'{path}: {old!r} -> {new!r}'
+                          for path, old, new in differences[:SHOWN_DIFFERENCES])
+        self.assertFalse(differences, f'{len(differences)} fields differ from the golden parse:\n{shown}')
+
+    def test_pronouns_are_nouns_except_in_wxr(self):
+        entries = {e.word: e for e in dp.iter_entries(SOURCE) if e.word in PRONOUN_HEADWORDS}
+        self.assertEqual(sorted(entries), sorted(PRONOUN_HEADWORDS))
+        for word, entry in entries.items():
+            with self.subTest(word=word):
+                self.assertEqual(entry.pos, 'noun')
+                self.assertIn('pronoun', entry.pos_detail)
+                self.assertEqual(wxr_pos(entry), 'pronoun')
+
+
+if __name__ == '__main__':
+    unittest.main()
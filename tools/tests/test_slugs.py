@@ -0,0 +1,94 @@
+"""
+Ateso Dictionary Slug Test
+Every entry the converter used to give a unique slug keeps it; entries that
+used to share a slug are told apart with a homonym number that matches the
+slug suffix. The old slugs are rebuilt from the golden parse with the old
+collision rule.
+
+Run from the repository root:
+    python -m unittest discover -s tools/tests
+"""
+
+import os
+import sys
+import gzip
+import json
+import unittest
+from collections import defaultdict
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOLS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, TOOLS_DIR)
+
+import dictionary_parser as dp
+
+SOURCE = os.path.join(os.path.dirname(TOOLS_DIR), 'ateso_dict.txt')
+GOLDEN_PARSE = os.path.join(TESTS_DIR, 'data', 'ateso_dict.golden.ndjson.gz')
+
+# Slugs the converter used to give to more than one entry: the first entry
+# with each keeps it, the others move to the lowest free homonym number
+RENUMBERED = (
+    ('arereng', 'arereng-1', 'arereng-2'),
+    ('-k-', 'k-1', 'k-4'), ('k-', 'k-1', 'k-5'), ('-k-', 'k-2', 'k-6'), ('k-', 'k-2', 'k-7'),
+    ('-n', 'n-1', 'n-3'), ('n', 'n-2', 'n-4'),
+    ('o-', 'o-1', 'o-4'), ('-o', 'o-1', 'o-5'), ('-o', 'o-2', 'o-6'), ('-o', 'o-3', 'o-8'),
+    ('o', 'o-2', 'o-7'),
+    ('pii', 'pii-1', 'pii-2'),
+)
+
+
+def old_slugs(headwords):
+    """
+    Slugs of (word, homonym_number) pairs as the converter gave them before
+    plan_slugs(): a shared slug was numbered 1, 2, ... only if none of its
+    entries had a homonym number, and otherwise left shared.
+    """
+    slugs = [dp.generate_slug(word, homonym_number) for word, homonym_number in headwords]
+    groups = defaultdict(list)
+    for i, slug in enumerate(slugs):
+        groups[slug].append(i)
+    for members in groups.values():
+        if len(members) > 1 and all(headwords[i][1] is None for i in members):
+            for number, i in enumerate(members, 1):
+                slugs[i] = dp.generate_slug(headwords[i][0], number)
+    return slugs
+
+
+class DictionarySlugTest(unittest.TestCase):
+
+    def test_old_slugs_kept(self):
+        with gzip.open(GOLDEN_PARSE, 'rt', encoding='utf-8') as f:
+            golden = [record['entry'] for record in map(json.loads, f) if record['entry']]
+        before = old_slugs([(e['word'], e['homonym_number']) for e in golden])
+        entries = list(dp.iter_entries(SOURCE))
+        self.assertEqual([e.word for e in entries], [e['word'] for e in golden])
+
+        renumbered = []
+        for old, entry in zip(before, entries):
+            self.assertEqual(entry.slug, dp.generate_slug(entry.word, entry.homonym_number))
+            if entry.slug != old:
+                self.assertGreater(before.count(old), 1, f'{old} was unique')
+                renumbered.append((entry.word, old, entry.slug))
+        self.assertEqual(renumbered, list(RENUMBERED))
+        self.assertEqual(len({e.slug for e in entries}), len(entries))
+
+    def test_unique_slugs_untouched(self):
+        keys = [(0, 'akan', None), (1, 'akan', 2), (2, 'ekan', None)]
+        self.assertEqual(dp.plan_slugs(keys), ({}, 0))
+
+    def test_shared_slugs_renumbered(self):
+        # k and k are numbered 1 and 2; the first k-1 stays, the explicit
+        # homonym 1 of k and -k- take the lowest free numbers
+        keys = [(0, 'k', None), (1, 'k', None), (2, 'k', 1), (3, '-k-', 1), (4, 'k', 3)]
+        changes, collisions = dp.plan_slugs(keys)
+        self.assertEqual(changes, {0: (1, 'k-1'), 1: (2, 'k-2'), 2: (4, 'k-4'), 3: (5, 'k-5')})
+        self.assertEqual(collisions, 2)
+
+    def test_unnumbered_punctuation_variant(self):
+        # 'k-1' shares k-1 with homonym 1 of k; it is numbered on its own headword
+        changes, _ = dp.plan_slugs([(0, 'k', 1), (1, 'k-1', None)])
+        self.assertEqual(changes, {1: (1, 'k-1-1')})
+
+
+if __name__ == '__main__':
+    unittest.main()
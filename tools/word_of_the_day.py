@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary Word of the Day
+A seeded Word of the Day schedule for the next N days, picked at build time
+from entries that have both a definition and an example, so the
+/word-of-the-day endpoint can look up today's date instead of running
+ORDER BY RAND() over dict_terms.
+
+Eligible entries are ordered by a hash of the seed and their slug, and a
+date picks the entry at its day number modulo the number of eligible
+entries. The schedule is therefore deterministic, no word repeats before
+every eligible word has been shown, and a given date keeps its word across
+rebuilds of the same dictionary, whatever their start date.
+"""
+
+import json
+import hashlib
+from datetime import date, datetime, timedelta, timezone
+
+
+WOTD_VERSION = 1
+
+DEFAULT_WOTD_DAYS = 366
+DEFAULT_WOTD_SEED = 'ateso'
+
+
+def eligible(entry):
+    """Whether an Entry can be a Word of the Day: a non-empty definition and an example."""
+    return bool(entry.examples) and any(d.text for d in entry.definitions)
+
+
+def wotd_record(entry):
+    """The format_wotd() fields of an Entry known at build time, plus an example."""
+    example = entry.examples[0]
+    return {
+        'word': entry.word,
+        'slug': entry.slug,
+        'homonym_number': entry.homonym_number,
+        'pos': entry.pos,
+        'pos_detail': entry.pos_detail,
+        'plural': entry.plural,
+        'gender': entry.gender,
+        'definition_preview': next(d.text for d in entry.definitions if d.text),
+        'example': {'ateso': example.ateso, 'english': example.english},
+    }
+
+
+class WordOfTheDayBuilder:
+    """Collects eligible entries one output entry at a time and schedules them."""
+
+    def __init__(self, seed=DEFAULT_WOTD_SEED):
+        self.seed = str(seed)
+        self.candidates = []
+
+    def rank(self, slug):
+        """Position key of a slug in the seeded order."""
+        return hashlib.sha1(f'{self.seed}:{slug}'.encode('utf-8')).digest()
+
+    def add(self, entry):
+        """Keep an Entry if it is eligible. Call after slugs are final."""
+        if eligible(entry):
+            self.candidates.append((self.rank(entry.slug), wotd_record(entry)))
+
+    def as_dict(self, days=DEFAULT_WOTD_DAYS, start=None):
+        """
+        The schedule document: one record per date from start (today, UTC,
+        by default) for the given number of days.
+        """
+        start = start or datetime.now(timezone.utc).date()
+        order = [record for _, record in sorted(self.candidates, key=lambda c: c[0])]
+        schedule = []
+        if order:
+            for offset in range(days):
+                day = start + timedelta(days=offset)
+                schedule.append({'date': day.isoformat(), **order[day.toordinal() % len(order)]})
+        return {
+            'version': WOTD_VERSION,
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'seed': self.seed,
+            'start': start.isoformat(),
+            'days': len(schedule),
+            'eligible_entries': len(order),
+            'schedule': schedule,
+        }
+
+
+def parse_date(text):
+    """A YYYY-MM-DD date argument."""
+    return date.fromisoformat(text)
+
+
+def write_wotd(builder, path, days=DEFAULT_WOTD_DAYS, start=None):
+    """Write the schedule document. Returns it."""
+    wotd = builder.as_dict(days, start)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(wotd, ensure_ascii=False, separators=(',', ':')))
+    return wotd
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Ateso Dictionary WXR Export
+WordPress eXtended RSS (WXR) output for the WordPress importer: one
+ateso-words post per entry, with the custom fields of
+core/MetaFields/FieldRegistry.php and part_of_speech / dialect taxonomy
+terms. Another output backend for the Entry objects of dictionary_parser.py,
+used by generate-wordpress-import.py and by convert_dictionary.py --wxr.
+"""
+
+import os
+import re
+import json
+import operator
+from datetime import datetime
+from functools import lru_cache
+
+
+# Output buffer size for the streaming WXR writer
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Bytes kept free in each --split-bytes part for the channel header and terms
+PART_OVERHEAD_BYTES = 8192
+
+# Parser POS values filed under another part_of_speech term
+WXR_POS = {
+    'cardinal number': 'other',
+    'interrogation': 'other',
+}
+
+# pos_detail word filed under its own part_of_speech term, although the
+# parser counts these entries as nouns
+WXR_PRONOUN = 'pronoun'
+
+# usage_context values the plugin accepts (FieldSanitizer::sanitize_usage_context)
+USAGE_CONTEXTS = frozenset(('transitive verb', 'intransitive verb', 'reflexive verb'))
+
+# Channel header; the taxonomy terms follow the items (see WxrWriter)
+HEADER_TEMPLATE = """\
+<?xml version="1.0" encoding="UTF-8" ?>
+<!-- This is a WordPress eXtended RSS (WXR) file -->
+<!-- Generated by Ateso Dictionary Converter -->
+<rss version="2.0"
+\txmlns:excerpt="http://wordpress.org/export/1.2/excerpt/"
+\txmlns:content="http://purl.org/rss/1.0/modules/content/"
+\txmlns:wfw="http://wellformedweb.org/CommentAPI/"
+\txmlns:dc="http://purl.org/dc/elements/1.1/"
+\txmlns:wp="http://wordpress.org/export/1.2/">
+
+<channel>
+\t<title>Ateso-English Dictionary</title>
+\t<link>http://localhost</link>
+\t<description>Bilingual Dictionary</description>
+\t<pubDate>%(pub_date)s</pubDate>
+\t<language>en</language>
+\t<wp:wxr_version>1.2</wp:wxr_version>
+\t<wp:base_site_url>http://localhost</wp:base_site_url>
+\t<wp:base_blog_url>http://localhost</wp:base_blog_url>
+
+"""
+
+TERM_TEMPLATE = """\
+\t<wp:term>
+\t\t<wp:term_id>%(term_id)s</wp:term_id>
+\t\t<wp:term_taxonomy>%(taxonomy)s</wp:term_taxonomy>
+\t\t<wp:term_slug>%(slug)s</wp:term_slug>
+\t\t<wp:term_name><![CDATA[%(name)s]]></wp:term_name>
+\t</wp:term>
+"""
+
+ITEM_HEAD_TEMPLATE = """\
+\t<item>
+\t\t<title><![CDATA[%(word)s]]></title>
+\t\t<link></link>
+\t\t<pubDate>%(pub_date)s</pubDate>
+\t\t<dc:creator><![CDATA[admin]]></dc:creator>
+\t\t<guid isPermaLink="false"></guid>
+\t\t<description></description>
+\t\t<content:encoded><![CDATA[]]></content:encoded>
+\t\t<excerpt:encoded><![CDATA[]]></excerpt:encoded>
+\t\t<wp:post_id>%(post_id)s</wp:post_id>
+\t\t<wp:post_date><![CDATA[%(item_date)s]]></wp:post_date>
+\t\t<wp:post_date_gmt><![CDATA[%(item_date)s]]></wp:post_date_gmt>
+\t\t<wp:post_modified><![CDATA[0000-00-00 00:00:00]]></wp:post_modified>
+\t\t<wp:post_modified_gmt><![CDATA[0000-00-00 00:00:00]]></wp:post_modified_gmt>
+\t\t<wp:comment_status><![CDATA[closed]]></wp:comment_status>
+\t\t<wp:ping_status><![CDATA[closed]]></wp:ping_status>
+\t\t<wp:post_name><![CDATA[%(post_name)s]]></wp:post_name>
+\t\t<wp:status><![CDATA[publish]]></wp:status>
+\t\t<wp:post_parent>0</wp:post_parent>
+\t\t<wp:menu_order>0</wp:menu_order>
+\t\t<wp:post_type><![CDATA[ateso-words]]></wp:post_type>
+\t\t<wp:post_password><![CDATA[]]></wp:post_password>
+\t\t<wp:is_sticky>0</wp:is_sticky>
+"""
+
+CATEGORY_TEMPLATES = (
+    '\t\t<category domain="part_of_speech" nicename="%(pos_slug)s"><![CDATA[%(pos_name)s]]></category>\n',
+    '\t\t<category domain="dialect" nicename="%(dialect_slug)s"><![CDATA[%(dialect_name)s]]></category>\n',
+)
+
+META_TEMPLATE = """\
+\t\t<wp:postmeta>
+\t\t\t<wp:meta_key><![CDATA[%(key)s]]></wp:meta_key>
+\t\t\t<wp:meta_value><![CDATA[%(value)s]]></wp:meta_value>
+\t\t</wp:postmeta>
+"""
+
+# (meta_key, field) for each custom field written when the field is set
+META_FIELDS = (
+    ('plural_form', 'plural_form'),
+    ('verb_stem', 'verb_stem'),
+    ('part_of_speech_select', 'part_of_speech'),
+    ('gender', 'gender'),
+    ('primary_definition', 'primary_definition'),
+    ('secondary_definitions', 'secondary_definitions'),
+    ('dialect_marker', 'dialect_marker'),
+    ('usage_context', 'usage_context'),
+    ('example_sentences', 'example_sentences'),
+    ('cross_references', 'cross_references'),
+)
+
+META_ENTRY_FIELDS = tuple(field for _, field in META_FIELDS)
+
+# Always written last; frequency has no source data yet
+ITEM_TAIL = META_TEMPLATE % {'key': 'frequency', 'value': 'common'} + '\t</item>\n\n'
+
+# %(field)s placeholders of a compiled item template
+TEMPLATE_FIELD_RE = re.compile(r'%\((\w+)\)s')
+
+
+def php_string(value):
+    """A PHP serialize() string: the length counts UTF-8 bytes."""
+    return f's:{len(value.encode("utf-8"))}:"{value}";'
+
+
+def serialize_examples(examples):
+    """
+    Examples as the serialized array of {ateso, english} pairs the
+    example_sentences field stores (RepeaterField, sanitize_example_sentences).
+    """
+    items = ''.join(
+        f'i:{i};a:2:{{{php_string("ateso")}{php_string(e.ateso)}{php_string("english")}{php_string(e.english)}}}'
+        for i, e in enumerate(examples)
+    )
+    return f'a:{len(examples)}:{{{items}}}'
+
+
+def wxr_pos(entry):
+    """The part_of_speech term of an Entry; pronouns get their own."""
+    if entry.pos_detail and WXR_PRONOUN in entry.pos_detail:
+        return WXR_PRONOUN
+    return WXR_POS.get(entry.pos, entry.pos)
+
+
+def wxr_fields(entry):
+    """The title, post name, taxonomy values and custom fields of an Entry."""
+    definitions = [d.text for d in entry.definitions if d.text]
+    usage_context = (entry.pos_detail or '').split(' / ')[0]
+    return {
+        'word': entry.word,
+        'post_name': entry.slug,
+        'part_of_speech': wxr_pos(entry),
+        'plural_form': entry.plural or '',
+        'verb_stem': entry.verb_stem or '',
+        'gender': entry.gender or 'N/A',
+        'primary_definition': definitions[0] if definitions else '',
+        'secondary_definitions': '; '.join(definitions[1:]),
+        'dialect_marker': entry.dialect or '',
+        'usage_context': usage_context if usage_context in USAGE_CONTEXTS else '',
+        'example_sentences': serialize_examples(entry.examples) if entry.examples else '',
+        'cross_references': ', '.join(ref for d in entry.definitions for ref in d.cp_refs),
+    }
+
+
+@lru_cache(maxsize=None)
+def item_template(has_pos, has_dialect, meta_present):
+    """
+    Compile the <item> template for one combination of present categories and
+    custom fields. Returns its literal pieces and a getter for the values that
+    go between them, so each entry is rendered with a single join.
+    """
+    parts = [ITEM_HEAD_TEMPLATE]
+    if has_pos:
+        parts.append(CATEGORY_TEMPLATES[0])
+    if has_dialect:
+        parts.append(CATEGORY_TEMPLATES[1])
+    for (key, field), present in zip(META_FIELDS, meta_present):
+        if present:
+            parts.append(META_TEMPLATE % {'key': key, 'value': '%(' + field + ')s'})
+    parts.append(ITEM_TAIL)
+    pieces = TEMPLATE_FIELD_RE.split(''.join(parts))
+    return pieces[0::2], operator.itemgetter(*pieces[1::2])
+
+
+@lru_cache(maxsize=None)
+def term_for(taxonomy, value):
+    """The (slug, name) of the taxonomy term for a value."""
+    if taxonomy == 'dialect':
+        return value.lower().replace(' ', '-'), value[0].upper() + value[1:]
+    return value, value.title()
+
+
+def wxr_term_lines(terms):
+    """The <wp:term> elements for the collected terms, with generated ids."""
+    lines = []
+    term_id = 1
+    for taxonomy in ('part_of_speech', 'dialect'):
+        for slug, name in sorted(terms[taxonomy].items()):
+            lines.append(TERM_TEMPLATE % {'term_id': term_id, 'taxonomy': taxonomy, 'slug': slug, 'name': name})
+            term_id += 1
+    return lines
+
+
+def wxr_item(fields, post_id, pub_date, item_date):
+    """
+    Render one <item> element from wxr_fields(), followed by a blank line.
+    Returns the text and the (taxonomy, slug, name) terms it is filed under.
+    """
+    pos_term = term_for('part_of_speech', fields['part_of_speech']) if fields['part_of_speech'] else None
+    dialect_term = term_for('dialect', fields['dialect_marker']) if fields['dialect_marker'] else None
+
+    values = {}
+    item_terms = []
+    if pos_term:
+        item_terms.append(('part_of_speech',) + pos_term)
+        values['pos_slug'], values['pos_name'] = pos_term
+    if dialect_term:
+        item_terms.append(('dialect',) + dialect_term)
+        values['dialect_slug'], values['dialect_name'] = dialect_term
+
+    literals, getter = item_template(
+        pos_term is not None,
+        dialect_term is not None,
+        tuple(map(bool, map(fields.get, META_ENTRY_FIELDS))),
+    )
+    values.update(fields)
+    values['post_id'] = post_id
+    values['pub_date'] = pub_date
+    values['item_date'] = item_date
+    out = [literals[0]]
+    for value, literal in zip(getter(values), literals[1:]):
+        out.append(str(value))
+        out.append(literal)
+    return ''.join(out), item_terms
+
+
+def wxr_part_path(output_file, index):
+    """Path of one split part, e.g. import.xml -> import.part001.xml."""
+    base, ext = os.path.splitext(output_file)
+    return f'{base}.part{index:03d}{ext}'
+
+
+def write_wxr_manifest(output_file, parts, max_entries, max_bytes):
+    """Write the .manifest.json listing the parts of a split WXR export. Returns its path."""
+    manifest_file = os.path.splitext(output_file)[0] + '.manifest.json'
+    manifest = {
+        'generated_at': datetime.now().isoformat(),
+        'total_entries': sum(part['entries'] for part in parts),
+        'split': {'max_entries': max_entries, 'max_bytes': max_bytes},
+        'parts': [
+            {
+                'index': index,
+                'file': os.path.basename(part['file']),
+                'entries': part['entries'],
+                'bytes': os.path.getsize(part['file']),
+                'first_post_id': part['first_post_id'],
+                'last_post_id': part['first_post_id'] + part['entries'] - 1,
+            }
+            for index, part in enumerate(parts, 1)
+        ],
+    }
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_file
+
+
+class WxrWriter:
+    """
+    Writes the WXR export one Entry at a time, in output order; each <item>
+    goes to a buffered file as it arrives. Taxonomy terms are built from the
+    POS and dialect values actually seen and written after the items; the
+    WordPress importer reads every <wp:term> in the channel before it
+    creates any post.
+
+    With max_entries or max_bytes the output is split into numbered part
+    files, each a complete WXR document with its own header and terms, plus
+    a .manifest.json listing them. Post ids run on across parts. Call
+    close() to finish.
+    """
+
+    def __init__(self, path, max_entries=None, max_bytes=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.split = bool(max_entries or max_bytes)
+        self.budget = max_bytes - PART_OVERHEAD_BYTES if max_bytes else None
+        now = datetime.now()
+        self.pub_date = now.strftime('%a, %d %b %Y %H:%M:%S +0000')
+        self.item_date = now.strftime('%Y-%m-%d %H:%M:%S')
+        self.post_id = 1
+        self.parts = []
+        self.manifest_file = None
+        self.start_part()
+
+    def start_part(self):
+        """Open the next output file and write its channel header."""
+        path = wxr_part_path(self.path, len(self.parts) + 1) if self.split else self.path
+        self.parts.append({'file': path, 'entries': 0, 'first_post_id': self.post_id})
+        self.out = open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        self.out.write(HEADER_TEMPLATE % {'pub_date': self.pub_date})
+        self.terms = {'part_of_speech': {}, 'dialect': {}}
+        self.part_bytes = 0
+
+    def close_part(self):
+        """Write the taxonomy terms used in this file, close the channel and the file."""
+        self.out.write('\t<!-- Taxonomy Terms -->\n')
+        self.out.writelines(wxr_term_lines(self.terms))
+        self.out.write('\n')
+        self.out.write('</channel>\n')
+        self.out.write('</rss>')
+        self.out.close()
+
+    def add(self, entry):
+        """Write the <item> of one Entry. Slugs must be final."""
+        item, item_terms = wxr_item(wxr_fields(entry), self.post_id, self.pub_date, self.item_date)
+        item_bytes = len(item.encode('utf-8')) if self.budget else 0
+        part = self.parts[-1]
+        if self.split and part['entries'] and (
+                (self.max_entries and part['entries'] >= self.max_entries)
+                or (self.budget and self.part_bytes + item_bytes > self.budget)):
+            self.close_part()
+            self.start_part()
+            part = self.parts[-1]
+
+        for taxonomy, slug, name in item_terms:
+            self.terms[taxonomy][slug] = name
+        self.out.write(item)
+        part['entries'] += 1
+        self.part_bytes += item_bytes
+        self.post_id += 1
+
+    def close(self):
+        """
+        Finish the last file and, when split, write the manifest. Returns the
+        parts: {'file', 'entries', 'first_post_id'} each.
+        """
+        self.close_part()
+        if self.split:
+            self.manifest_file = write_wxr_manifest(self.path, self.parts, self.max_entries, self.max_bytes)
+        return self.parts